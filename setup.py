@@ -30,11 +30,13 @@ setup(
     packages=[
         'xlseries', 'xlseries.strategies', 'xlseries.strategies.clean',
         'xlseries.strategies.discover', 'xlseries.strategies.get',
-        'xlseries.utils'
+        'xlseries.utils', 'xlseries.benchmarks'
     ],
     package_dir={'xlseries': 'xlseries'},
     include_package_data=True,
     install_requires=requirements,
+    extras_require={'arrow': ['pyarrow'], 'xls': ['xlwt']},
+    entry_points={'console_scripts': ['xlseries=xlseries.cli:main']},
     license="GPLv3+",
     zip_safe=False,
     keywords="xlseries excel time series data opendata scraper",
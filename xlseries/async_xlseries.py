@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+async_xlseries
+
+Scrape excel files from asyncio code (eg. a web service) without blocking the
+event loop: runs are done by a thread or process executor and awaited.
+
+Awaiting a run can be cancelled, or timed out, at any moment. The run itself
+stops when its next stage starts (loading the file, copying it, discovering
+parameters, each attempt, cleaning each time index...), freeing its worker.
+
+Concurrency limits keep a few big workbooks from taking every worker: runs
+over the limit wait their turn, and runs sharing a key (eg. a client or a
+file) can be limited on their own.
+
+Example:
+    async with AsyncXlSeries(max_concurrency=4, max_per_key=2) as scraper:
+        dfs = await scraper.get_data_frames("bulletin.xlsx", params,
+                                            key=client_id, timeout=30)
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import multiprocessing
+
+from .utils import instrumentation
+
+EXECUTORS = ("thread", "process")
+
+# seconds between checks of the cancel token by runs in worker processes
+PROCESS_POLL_INTERVAL = 0.05
+
+
+class AsyncXlSeries(object):
+    """Awaitable version of XlSeries, running scrapes in an executor.
+
+    Args:
+        executor (str or Executor): "thread" (default) or "process" to create
+            a pool of that kind, or a concurrent.futures executor already
+            created (that is not shut down by close()). Threads share the
+            GIL with the event loop, processes need the files and parameters
+            to be picklable (paths are better than Workbook objects).
+        max_workers (int): Workers of the pool created, as in
+            concurrent.futures.
+        max_concurrency (int): Runs done at the same time at most, the other
+            ones wait for a free slot (without limit by default).
+        max_per_key (int): Runs with the same key done at the same time at
+            most (without limit by default).
+        timeout (float): Default seconds a run can take, waiting for a slot
+            included. Runs taking longer are cancelled and raise
+            asyncio.TimeoutError.
+    """
+
+    def __init__(self, executor="thread", max_workers=None,
+                 max_concurrency=None, max_per_key=None, timeout=None):
+        if isinstance(executor, concurrent.futures.Executor):
+            self.executor = executor
+            self._owns_executor = False
+        elif executor == "thread":
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+            self._owns_executor = True
+        elif executor == "process":
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers)
+            self._owns_executor = True
+        else:
+            raise ValueError("executor must be one of {} or an Executor, "
+                             "not {}".format(EXECUTORS, repr(executor)))
+
+        for name, limit in [("max_concurrency", max_concurrency),
+                            ("max_per_key", max_per_key)]:
+            if limit is not None and limit < 1:
+                raise ValueError("{} must be at least 1".format(name))
+
+        self.max_concurrency = max_concurrency
+        self.max_per_key = max_per_key
+        self.timeout = timeout
+
+        self._semaphore = None
+        self._key_semaphores = {}
+        self._key_runs = collections.Counter()
+        self._manager = None
+        self._running = 0
+
+    def __repr__(self):
+        return "AsyncXlSeries({}, running={})".format(
+            self.executor.__class__.__name__, self._running)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # PUBLIC
+    async def get_data_frames(self, xl_path_or_wb, params_path_or_obj,
+                              key=None, timeout=None, **kwargs):
+        """Scrape time series from an excel file, like
+        XlSeries.get_data_frames.
+
+        Args:
+            xl_path_or_wb (str or Workbook): Path to an excel file or a
+                Workbook object.
+            params_path_or_obj (str, dict or Parameters): Scraping parameters.
+            key: Runs with the same key are limited by max_per_key.
+            timeout (float): Seconds the run can take, overriding the default.
+            kwargs: Other arguments of XlSeries.get_data_frames (ws_name,
+                safe_mode, plan_cache, sink, output, select...).
+
+        Returns:
+            Like XlSeries.get_data_frames.
+
+        Raises:
+            asyncio.TimeoutError: If the run took longer than the timeout.
+        """
+
+        return await self._run(xl_path_or_wb, "get_data_frames",
+                               (params_path_or_obj,), kwargs, key, timeout)
+
+    async def update_data_frames(self, xl_path_or_wb, previous_dfs,
+                                 previous_params, key=None, timeout=None,
+                                 **kwargs):
+        """Scrape only the observations appended since a previous scraping,
+        like XlSeries.update_data_frames."""
+
+        return await self._run(xl_path_or_wb, "update_data_frames",
+                               (previous_dfs, previous_params), kwargs, key,
+                               timeout)
+
+    def close(self):
+        """Shut down the executor (if it was created here), cancelling the
+        runs that didn't start."""
+
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager:
+            self._manager.shutdown()
+            self._manager = None
+
+    # PRIVATE
+    async def _run(self, xl_path_or_wb, method, args, kwargs, key, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return await self._run_in_slot(xl_path_or_wb, method, args,
+                                           kwargs, key)
+
+        return await asyncio.wait_for(
+            self._run_in_slot(xl_path_or_wb, method, args, kwargs, key),
+            timeout)
+
+    async def _run_in_slot(self, xl_path_or_wb, method, args, kwargs, key):
+        """Wait for a free slot and run a scrape in the executor.
+
+        The slot is released when the worker is done (not when the caller
+        stops waiting), so cancelled runs still count until they stop.
+        """
+
+        await self._acquire(key)
+        try:
+            cancel_token = self._new_cancel_token()
+            future = self.executor.submit(_scrape, xl_path_or_wb, method,
+                                          args, kwargs, cancel_token)
+        except BaseException:
+            self._release(key)
+            raise
+
+        self._running += 1
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(
+            lambda _: _call_soon_threadsafe(loop, self._finished, key))
+
+        wrapped_future = asyncio.wrap_future(future)
+        wrapped_future.add_done_callback(_retrieve_exception)
+        try:
+            return await asyncio.shield(wrapped_future)
+
+        except asyncio.CancelledError:
+            # drop the run if it didn't start, stop it at its next stage if
+            # it did
+            if not future.cancel():
+                cancel_token.cancel()
+            raise
+
+    async def _acquire(self, key):
+        # a key over its limit waits without taking a global slot
+        if self.max_per_key and key is not None:
+            if key not in self._key_semaphores:
+                self._key_semaphores[key] = asyncio.Semaphore(
+                    self.max_per_key)
+            self._key_runs[key] += 1
+            try:
+                await self._key_semaphores[key].acquire()
+            except BaseException:
+                self._forget_key(key)
+                raise
+
+        try:
+            if self.max_concurrency:
+                if self._semaphore is None:
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                await self._semaphore.acquire()
+        except BaseException:
+            self._release_key(key)
+            raise
+
+    def _release(self, key):
+        if self.max_concurrency:
+            self._semaphore.release()
+        self._release_key(key)
+
+    def _release_key(self, key):
+        if self.max_per_key and key is not None:
+            self._key_semaphores[key].release()
+            self._forget_key(key)
+
+    def _forget_key(self, key):
+        self._key_runs[key] -= 1
+        if not self._key_runs[key]:
+            del self._key_runs[key]
+            del self._key_semaphores[key]
+
+    def _finished(self, key):
+        self._running -= 1
+        self._release(key)
+
+    def _new_cancel_token(self):
+        if not isinstance(self.executor,
+                          concurrent.futures.ProcessPoolExecutor):
+            return instrumentation.CancelToken()
+
+        # worker processes see the token through a manager
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return instrumentation.CancelToken(
+            self._manager.Event(), poll_interval=PROCESS_POLL_INTERVAL)
+
+
+def _call_soon_threadsafe(loop, callback, *args):
+    # the loop may be closed if nobody waited for the run to stop
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
+
+
+def _retrieve_exception(future):
+    """Mark the exception of a run nobody waits for any more as retrieved,
+    so asyncio doesn't log it."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _scrape(xl_path_or_wb, method, args, kwargs, cancel_token):
+    """Run an XlSeries method in a worker, stopping at the start of a stage
+    if the token was cancelled."""
+
+    from .xlseries_class import XlSeries
+
+    with instrumentation.cancelling(cancel_token):
+        xl = XlSeries(xl_path_or_wb)
+        return getattr(xl, method)(*args, **kwargs)
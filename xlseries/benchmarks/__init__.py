@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks
+
+Benchmarks of the scraping pipeline, end to end and stage by stage, run over
+a matrix of synthetic workbooks of different sizes.
+
+Results are written as JSON files that can be kept as baselines, and later
+runs are compared against a baseline reporting the benchmarks that got slower
+than a threshold.
+
+Example:
+    # store a baseline
+    python -m xlseries.benchmarks run --output baseline.json
+
+    # run again and report regressions of more than 10%
+    python -m xlseries.benchmarks run --baseline baseline.json \\
+        --threshold 0.1
+
+    # compare two results already stored
+    python -m xlseries.benchmarks compare baseline.json results.json
+
+    # strings accepted and parsed per second by each parse_time strategy
+    python -m xlseries.benchmarks.parse_time_strategies
+
+    # time taken to import xlseries in a new process
+    python -m xlseries.benchmarks.import_time
+"""
+
+__author__ = 'Agustin Benassi'
+__email__ = 'agusbenassi@gmail.com'
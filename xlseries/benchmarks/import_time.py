@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+import_time
+
+Time taken by a new python process to import xlseries, and the heavy
+dependencies it pulls in, as paid by every command line or worker process
+started.
+
+Each statement is run in a new interpreter, timing only the statement (not
+the interpreter startup) and listing the modules it imported that took more
+time, as reported by "python -X importtime".
+
+Example:
+    python -m xlseries.benchmarks.import_time --output import_time.json
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+import collections
+
+from xlseries.benchmarks import runner
+
+STATEMENTS = collections.OrderedDict([
+    ("import_xlseries", "import xlseries"),
+    ("import_xlseries_class", "from xlseries import XlSeries"),
+    ("params_template",
+     "from xlseries import XlSeries; XlSeries.critical_params_template()"),
+    ("import_strategies", "import xlseries.strategies.strategies"),
+])
+
+# dependencies that should only be imported when they are used
+HEAVY_MODULES = ["openpyxl", "pandas", "numpy", "xlrd", "parsley", "arrow",
+                 "unidecode", "imp", "xlseries.strategies.strategies",
+                 "xlseries.strategies.clean.time_index",
+                 "xlseries.strategies.clean.parse_time",
+                 "xlseries.strategies.get.data",
+                 "xlseries.strategies.get.period_range"]
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOP = 5
+
+# run in the new process, the statement is timed after the marker
+SCRIPT = """
+import sys, json, time
+sys.stderr.write("{marker}\\n")
+sys.stderr.flush()
+wall_start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - wall_start
+print(json.dumps({{"seconds": seconds, "modules": [
+    name for name in {heavy_modules!r} if name in sys.modules]}}))
+"""
+MARKER = "-- xlseries import time --"
+
+
+def measure_statement(statement, heavy_modules=HEAVY_MODULES):
+    """Run a statement in a new interpreter and time it.
+
+    Returns:
+        dict: With the "seconds" the statement took, the "heavy_modules" it
+            imported and the "imports" done by the statement, as
+            [(module_name, cumulative_seconds)] for the top level ones.
+    """
+
+    script = SCRIPT.format(marker=MARKER, statement=statement,
+                           heavy_modules=list(heavy_modules))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True)
+
+    if process.returncode != 0:
+        raise RuntimeError("{!r} failed:\n{}".format(statement,
+                                                     process.stderr))
+
+    output = json.loads(process.stdout.strip().splitlines()[-1])
+    return {"seconds": output["seconds"],
+            "heavy_modules": output["modules"],
+            "imports": parse_importtime(process.stderr)}
+
+
+def parse_importtime(stderr):
+    """Return the top level imports after the marker in the output of
+    "python -X importtime", as [(module_name, cumulative_seconds)]."""
+
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        # nested imports are indented under the module importing them
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+
+        imports.append((name.strip(), int(cumulative) / 1e6))
+
+    return imports
+
+
+def run(names=None, repeat=DEFAULT_REPEAT, top=DEFAULT_TOP, callback=None):
+    """Time the import statements, each one in new processes.
+
+    Args:
+        names (list): Statements to time (keys of STATEMENTS), all of them
+            by default.
+        repeat (int): Number of processes started for each statement.
+        top (int): Number of imports that took more time reported for each
+            statement.
+        callback (function): Called with (key, result, reason) after each
+            statement, as in runner.run.
+
+    Returns:
+        dict: Like the results of runner.run, by key ("import/<name>"), with
+            the "heavy_modules" imported by the statement and its "top"
+            imports as [(module_name, seconds)] in the fastest run.
+    """
+
+    for name in names or []:
+        if name not in STATEMENTS:
+            raise ValueError("There is no import statement " + repr(name))
+
+    results = {"environment": runner.get_environment(), "repeat": repeat,
+               "results": collections.OrderedDict(), "skipped": {}}
+
+    for name, statement in STATEMENTS.items():
+        if names and name not in names:
+            continue
+
+        measures = [measure_statement(statement) for _ in range(repeat)]
+        fastest = min(measures, key=lambda measure: measure["seconds"])
+
+        key = "import/" + name
+        result = runner.summarize([measure["seconds"]
+                                   for measure in measures])
+        result["statement"] = statement
+        result["heavy_modules"] = fastest["heavy_modules"]
+        result["top"] = sorted(fastest["imports"],
+                               key=lambda item: -item[1])[:top]
+        results["results"][key] = result
+
+        if callback:
+            callback(key, result, None)
+
+    return results
+
+
+def format_results(results):
+    lines = []
+    for key, result in results["results"].items():
+        lines.append("{:<30} min {:.4f}s  median {:.4f}s  ({})".format(
+            key, result["min"], result["median"], result["statement"]))
+        lines.append("    heavy modules: " +
+                     (", ".join(result["heavy_modules"]) or "none"))
+        for module_name, seconds in result["top"]:
+            lines.append("    {:<40} {:.4f}s".format(module_name, seconds))
+
+    return "\n".join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Time the import of xlseries in new processes.")
+    parser.add_argument("--statements", default=None,
+                        help="Statements separated by commas, from {}.".format(
+                            ", ".join(STATEMENTS)))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--output", default=None,
+                        help="JSON file where results are written.")
+    args = parser.parse_args(args)
+
+    results = run(
+        names=args.statements.split(",") if args.statements else None,
+        repeat=args.repeat, top=args.top)
+    print(format_results(results))
+
+    if args.output:
+        runner.save_results(results, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
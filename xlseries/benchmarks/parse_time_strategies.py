@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+parse_time_strategies
+
+Throughput of each parse_time strategy, accepting and parsing time strings
+separately, to find out which time formats make scraping slow.
+
+Every strategy is fed a corpus of the time strings it parses: the examples of
+its docstring and the time strings found in the integration cases, scaled up
+repeating them. Each string is passed with the time value parsed before it,
+as the time index cleaners do.
+
+Example:
+    python -m xlseries.benchmarks.parse_time_strategies --size 10000 \\
+        --output parse_time.json
+
+Results have the same format as the ones of the runner, with the seconds per
+string as the times of a benchmark, so they can be compared with a baseline:
+    python -m xlseries.benchmarks compare baseline.json parse_time.json
+"""
+
+import ast
+import sys
+import time
+import doctest
+import argparse
+import collections
+
+from xlseries.benchmarks import runner
+from xlseries.strategies.clean import parse_time
+from xlseries.strategies.clean import time_index
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.case_loaders import load_parameters_case
+
+# parameters the strategies of the docstring examples accept
+STRATEGIES_PARAMS = {
+    "ParseSimpleTime": {"time_composed": False, "frequency": "M"},
+    "ParseComposedQuarter1": {"time_composed": True, "frequency": "Q"},
+    "ParseComposedQuarter2": {"time_composed": True, "frequency": "Q"},
+    "ParseComposedQuarter3": {"time_composed": True, "frequency": "Q"},
+    "ParseComposedYearQuarter1": {"time_composed": True,
+                                  "frequency": "AQQQQ"},
+    "ParseComposedQuarterYear1": {"time_composed": True,
+                                  "frequency": "QQQQA"},
+    "ParseComposedSemester": {"time_composed": True, "frequency": "S"},
+    "ParseComposedMonth1": {"time_composed": True, "frequency": "M"},
+    "ParseComposedMonth2": {"time_composed": True, "frequency": "M"},
+    "ParseComposedYear1": {"time_composed": True, "frequency": "A"},
+    "ParseComposedYear2": {"time_composed": True, "frequency": "A"},
+}
+
+INTEGRATION_CASES = list(range(1, 8))
+SOURCES = ("doctest", "integration")
+OPERATIONS = ("accept", "parse")
+
+DEFAULT_SIZE = 10000
+DEFAULT_REPEAT = 3
+# time spent in each repetition, strings of the corpus not reached are left
+DEFAULT_MIN_TIME = 0.2
+
+
+def doctest_strings(strategy):
+    """Return the time strings of the example in a strategy docstring.
+
+    Examples assign a list of time strings to orig, like:
+        >>> orig = ["1986    1º trim.", "            2º trim."]
+    """
+
+    parser = doctest.DocTestParser()
+    for example in parser.get_examples(strategy.__doc__ or ""):
+        target, _, value = example.source.partition("=")
+        if target.strip() == "orig":
+            return ast.literal_eval(value.strip())
+
+    return []
+
+
+def sequence_corpus(strategy, params, time_values):
+    """Parse time values in order, returning the ones to be parsed with the
+    time value parsed before each one.
+
+    Values that are already dates are only used as the last time of the next
+    value. Values the strategy can't parse are left out, without checking if
+    it accepts them (accepting composed strings is much slower than parsing
+    them).
+
+    Returns:
+        list: Tuples (params, time_value, last_time).
+    """
+
+    corpus = []
+    parser = strategy()
+    last_time = None
+    for time_value in time_values:
+        try:
+            parsed_time = parser.parse_time(params, time_value, last_time)
+        except Exception:
+            continue
+
+        if _to_be_parsed(time_value):
+            corpus.append((params, time_value, last_time))
+        last_time = parsed_time
+
+    return corpus
+
+
+def integration_time_values(case_num):
+    """Yield the parameters of each time index of an integration case with
+    the time values in it, if some of them are not dates already (strings or
+    numbers like 1940.01).
+    """
+
+    ws = load_original_case(case_num).active
+    params = load_parameters_case(case_num)
+
+    time_header_coords = set()
+    for i_series in range(len(params.time_header_coord)):
+        params_series = params[i_series]
+        time_header_coord = params_series["time_header_coord"]
+        if str(time_header_coord) in time_header_coords:
+            continue
+        time_header_coords.add(str(time_header_coord))
+
+        if params_series["time_multicolumn"]:
+            get_time_value = time_index.BaseMultipleColumns._get_time_value
+        else:
+            get_time_value = time_index.BaseSingleColumn._get_time_value
+
+        time_values = []
+        for i_period in range(params_series["data_starts"],
+                              params_series["data_ends"] + 1):
+            if params_series["alignment"] == "vertical":
+                time_value = get_time_value(ws, time_header_coord,
+                                            f_row=i_period)
+            else:
+                time_value = get_time_value(ws, time_header_coord,
+                                            f_col=i_period)
+            if time_value is not None:
+                time_values.append(time_value)
+
+        if any(_to_be_parsed(time_value) for time_value in time_values):
+            yield params_series, time_values
+
+
+def get_corpora(sources=SOURCES):
+    """Return the corpus of time strings of each strategy.
+
+    Integration cases strings are assigned to the first strategy accepting
+    them, as the time index cleaners do.
+
+    Returns:
+        dict: {strategy_name: [(params, time_value, last_time)]}
+    """
+
+    strategies = parse_time.get_strategies()
+    corpora = collections.OrderedDict(
+        (strategy.__name__, []) for strategy in strategies)
+
+    if "doctest" in sources:
+        for strategy in strategies:
+            params = STRATEGIES_PARAMS.get(strategy.__name__)
+            if params:
+                corpora[strategy.__name__].extend(sequence_corpus(
+                    strategy, params, doctest_strings(strategy)))
+
+    if "integration" in sources:
+        for case_num in INTEGRATION_CASES:
+            for params, time_values in integration_time_values(case_num):
+                strategy = _first_accepting(strategies, params, time_values)
+                if strategy:
+                    corpora[strategy.__name__].extend(sequence_corpus(
+                        strategy, params, time_values))
+
+    return corpora
+
+
+def scale_corpus(corpus, size):
+    """Repeat the strings of a corpus until it has size strings."""
+
+    if not corpus:
+        return []
+
+    return [corpus[i % len(corpus)] for i in range(size)]
+
+
+def time_operation(strategy, operation, corpus, min_time=DEFAULT_MIN_TIME):
+    """Accept or parse strings of a corpus, in order, until min_time passes
+    or the corpus ends.
+
+    Returns:
+        tuple: (seconds, number of strings processed)
+    """
+
+    parser = strategy()
+    num_strings = 0
+    wall_start = time.perf_counter()
+    for params, time_value, last_time in corpus:
+        if operation == "accept":
+            strategy.accepts(params, time_value, last_time)
+        else:
+            parser.parse_time(params, time_value, last_time)
+        num_strings += 1
+
+        if time.perf_counter() - wall_start >= min_time:
+            break
+
+    return time.perf_counter() - wall_start, num_strings
+
+
+def run(names=None, sources=SOURCES, size=DEFAULT_SIZE, repeat=DEFAULT_REPEAT,
+        min_time=DEFAULT_MIN_TIME, callback=None):
+    """Measure the throughput of the parse_time strategies.
+
+    Args:
+        names (list): Strategies to measure, all of them by default.
+        sources (list): Where the time strings come from ("doctest" and/or
+            "integration").
+        size (int): Number of strings the corpora are scaled to.
+        repeat (int): Times each operation is timed.
+        min_time (float): Seconds spent in each repetition at most (plus the
+            time of the last string processed).
+        callback (function): Called with (key, result, reason) after each
+            benchmark, as in runner.run.
+
+    Returns:
+        dict: Like the results of runner.run, by key
+            ("parse_time.<operation>/<strategy>"). The "times" are seconds
+            per string, and results also have the strings processed per
+            second ("rate") in the fastest repetition and the size of the
+            corpus ("corpus_size", before being scaled).
+    """
+
+    strategies = {strategy.__name__: strategy
+                  for strategy in parse_time.get_strategies()}
+    for name in names or []:
+        if name not in strategies:
+            raise ValueError("There is no parse_time strategy " + repr(name))
+
+    corpora = get_corpora(sources)
+    results = {"environment": runner.get_environment(), "repeat": repeat,
+               "results": collections.OrderedDict(), "skipped": {}}
+
+    for name, corpus in corpora.items():
+        if names and name not in names:
+            continue
+
+        for operation in OPERATIONS:
+            key = "parse_time.{}/{}".format(operation, name)
+            if not corpus:
+                reason = "No time strings for the strategy"
+                results["skipped"][key] = reason
+                if callback:
+                    callback(key, None, reason)
+                continue
+
+            scaled_corpus = scale_corpus(corpus, size)
+            times = []
+            for _ in range(repeat):
+                seconds, num_strings = time_operation(
+                    strategies[name], operation, scaled_corpus, min_time)
+                times.append(seconds / num_strings)
+
+            result = runner.summarize(times)
+            result["rate"] = 1.0 / result["min"]
+            result["corpus_size"] = len(corpus)
+            results["results"][key] = result
+
+            if callback:
+                callback(key, result, None)
+
+    return results
+
+
+def format_results(results):
+    """Return a table with the strategies, the slowest first."""
+
+    rows = sorted(results["results"].items(),
+                  key=lambda item: item[1]["rate"])
+
+    lines = ["{:<45}  {:>12}  {:>7}".format("benchmark", "strings/sec",
+                                            "corpus")]
+    for key, result in rows:
+        lines.append("{:<45}  {:>12.1f}  {:>7}".format(
+            key, result["rate"], result["corpus_size"]))
+
+    return "\n".join(lines)
+
+
+def _to_be_parsed(time_value):
+    return type(time_value) in (str, int, float)
+
+
+def _first_accepting(strategies, params, time_values):
+    """Return the first strategy accepting the first value to be parsed."""
+
+    first_value = next(time_value for time_value in time_values
+                       if _to_be_parsed(time_value))
+    for strategy in strategies:
+        try:
+            if strategy.accepts(params, first_value):
+                return strategy
+        except Exception:
+            continue
+
+    return None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Measure the strings accepted and parsed per second " +
+        "by each parse_time strategy.")
+    parser.add_argument("--strategies", default=None,
+                        help="Strategies separated by commas, all of them " +
+                        "by default.")
+    parser.add_argument("--sources", default=",".join(SOURCES))
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument("--output", default=None,
+                        help="JSON file where results are written.")
+    args = parser.parse_args(args)
+
+    results = run(
+        names=args.strategies.split(",") if args.strategies else None,
+        sources=args.sources.split(","), size=args.size, repeat=args.repeat,
+        min_time=args.min_time)
+
+    print(format_results(results))
+    for key, reason in sorted(results["skipped"].items()):
+        print("{:<45}  skipped: {}".format(key, reason))
+
+    if args.output:
+        runner.save_results(results, args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+pipeline
+
+Benchmarks of the scraping pipeline: the end to end XlSeries.get_data_frames
+and each of its stages in isolation (loading xls files, copying the workbook,
+cleaning the time index, parsing time strings, getting the values and the
+period ranges of the series).
+"""
+
+import arrow
+
+from xlseries import XlSeries
+from xlseries.benchmarks.runner import benchmark, SkipBenchmark
+from xlseries.strategies.strategies import ParameterDiscovery
+from xlseries.strategies.clean import parse_time
+from xlseries.utils.xl_methods import make_wb_copy, open_xls_as_xlsx
+
+
+@benchmark("get_data_frames")
+def bench_get_data_frames(fixture):
+    xl = XlSeries(fixture.workbook)
+    params = fixture.get_params()
+    return lambda: xl.get_data_frames(params)
+
+
+@benchmark("open_xls_as_xlsx")
+def bench_open_xls_as_xlsx(fixture):
+    xls_path = fixture.get_xls_path()
+    return lambda: open_xls_as_xlsx(xls_path)
+
+
+@benchmark("make_wb_copy")
+def bench_make_wb_copy(fixture):
+    wb = fixture.workbook
+    return lambda: make_wb_copy(wb)
+
+
+@benchmark("clean_time_index")
+def bench_clean_time_index(fixture):
+    ws = fixture.get_worksheet()
+    params = fixture.get_params()
+
+    # each time index is cleaned once, even if many series share it
+    time_indexes = {}
+    for i_series, time_header_coord in enumerate(params.time_header_coord):
+        time_indexes.setdefault(str(time_header_coord), i_series)
+
+    def clean_time_indexes():
+        for i_series in time_indexes.values():
+            ParameterDiscovery._clean_time_index(ws, params[i_series])
+
+    return clean_time_indexes
+
+
+@benchmark("parse_time")
+def bench_parse_time(fixture):
+    """Parse the dates of the first table written as strings, with the first
+    strategy accepting them (as the time index cleaners do)."""
+
+    params = fixture.get_params()[0]
+    index = fixture.case.get_expected_data_frames()[0].index
+    time_strings = [period.strftime("%d-%m-%Y") for period in index]
+
+    for strategy in parse_time.get_strategies():
+        if strategy.accepts(params, time_strings[0]):
+            break
+    else:
+        raise SkipBenchmark("No parse_time strategy accepts " +
+                            repr(time_strings[0]))
+
+    def parse_time_strings():
+        parser = strategy()
+        last_time = arrow.get(index[0].to_pydatetime()).shift(days=-1)
+        for time_string in time_strings:
+            last_time = parser.parse_time(params, time_string, last_time)
+
+    return parse_time_strings
+
+
+@benchmark("get_values")
+def bench_get_values(fixture):
+    ws, params = fixture.get_clean_worksheet()
+
+    series = []
+    for i_series, params_series in enumerate(params.get_series_records()):
+        strategy = ParameterDiscovery._get_data_strategy(ws, params_series,
+                                                         i_series)
+        series.append((strategy(), params_series))
+
+    def get_values():
+        for strategy_obj, params_series in series:
+            strategy_obj._get_values(ws, params_series)
+
+    return get_values
+
+
+@benchmark("get_period_ranges")
+def bench_get_period_ranges(fixture):
+    ws, params = fixture.get_clean_worksheet()
+    return lambda: list(ParameterDiscovery._get_period_ranges(ws, params))
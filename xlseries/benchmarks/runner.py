@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+runner
+
+Run the registered benchmarks over a matrix of synthetic workbooks, store the
+results as JSON and compare them against a baseline.
+
+A benchmark is a function registered with `benchmark(name)` that receives a
+Fixture (a synthetic case of some size and alignment) and returns a function
+without arguments to be timed. Everything done before returning is setup, and
+it is repeated before every timing, so benchmarks of stages that modify the
+worksheet (eg. cleaning the time index) always start from the same state.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import platform
+import argparse
+import datetime
+import tempfile
+import importlib
+import collections
+
+import numpy as np
+import pandas as pd
+import openpyxl
+
+import xlseries
+from xlseries.strategies.discover.parameters import Parameters
+from xlseries.strategies.strategies import ParameterDiscovery
+from xlseries.utils.xl_methods import make_wb_copy
+from xlseries.utils.coordinates import MAX_COLUMN
+from xlseries.utils.synthetic_cases import SyntheticCase
+
+# modules with benchmarks, imported to register them
+BENCHMARK_MODULES = ["xlseries.benchmarks.pipeline"]
+
+# sizes of the synthetic cases, daily series with some dates as strings
+SIZES = collections.OrderedDict([
+    ("tiny", {"num_periods": 30, "num_series": 2}),
+    ("small", {"num_periods": 1000, "num_series": 5}),
+    ("medium", {"num_periods": 10000, "num_series": 5}),
+    ("large", {"num_periods": 50000, "num_series": 10}),
+])
+CASE_OPTIONS = {"frequency": "D", "typos_density": 0.1}
+
+DEFAULT_SIZES = ["small", "medium"]
+ALIGNMENTS = ["vertical", "horizontal"]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+STATS = ("min", "median", "mean")
+
+BENCHMARKS = collections.OrderedDict()
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark that can't run with a fixture."""
+    pass
+
+
+def benchmark(name):
+    """Register a benchmark function with a name.
+
+    >>> @benchmark("make_wb_copy")
+    ... def bench_make_wb_copy(fixture):
+    ...     return lambda: make_wb_copy(fixture.workbook)
+    """
+
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+class Fixture(object):
+    """A synthetic case of some size and alignment, with the workbook and
+    files built from it cached for the benchmarks using them.
+
+    Args:
+        size (str): Name of the size of the case, a key of SIZES.
+        alignment (str): "vertical" or "horizontal" series.
+    """
+
+    def __init__(self, size, alignment):
+        self.size = size
+        self.alignment = alignment
+        self.case = SyntheticCase(alignment=alignment,
+                                  **dict(SIZES[size], **CASE_OPTIONS))
+
+        self._workbook = None
+        self._clean_workbook = None
+        self._clean_params = None
+        self._xls_path = None
+        self._temp_dir = None
+
+    def __repr__(self):
+        return "<{} {}>".format(self.__class__.__name__, self.name)
+
+    # PUBLIC
+    @property
+    def name(self):
+        return "{}-{}".format(self.size, self.alignment)
+
+    @property
+    def workbook(self):
+        """Workbook of the case, as loaded by XlSeries."""
+
+        if self._workbook is None:
+            if self.case.max_column > MAX_COLUMN:
+                raise SkipBenchmark(
+                    "{} columns don't fit in a worksheet".format(
+                        self.case.max_column))
+            self._workbook = self.case.get_workbook()
+
+        return self._workbook
+
+    def get_worksheet(self):
+        """Return a new copy of the worksheet of the case."""
+        return make_wb_copy(self.workbook).active
+
+    def get_params(self):
+        """Return new parameters of the case, with the missing ones
+        discovered (the first attempt)."""
+
+        params = Parameters(copy.deepcopy(self.case.params))
+        return ParameterDiscovery._discover_parameters(
+            self.workbook.active, params)[0]
+
+    def get_clean_worksheet(self):
+        """Return a worksheet with its time indexes already cleaned and the
+        parameters used to clean it. The same worksheet is returned every
+        time, so it must not be modified."""
+
+        if self._clean_workbook is None:
+            self._clean_workbook = make_wb_copy(self.workbook)
+            self._clean_params = self.get_params()
+            ParameterDiscovery._clean_data(self._clean_workbook.active,
+                                           self._clean_params)
+
+        return self._clean_workbook.active, self._clean_params
+
+    def get_xls_path(self):
+        """Return the path of the case written as an xls file."""
+
+        if self._xls_path is None:
+            self._temp_dir = tempfile.mkdtemp()
+            try:
+                paths = self.case.save(self._temp_dir, self.name, "xls")
+            except (ImportError, ValueError) as inst:
+                raise SkipBenchmark(str(inst))
+            self._xls_path = paths["workbook"]
+
+        return self._xls_path
+
+    def cleanup(self):
+        """Remove the files written for the benchmarks."""
+
+        if self._temp_dir:
+            for file_name in os.listdir(self._temp_dir):
+                os.remove(os.path.join(self._temp_dir, file_name))
+            os.rmdir(self._temp_dir)
+            self._temp_dir = None
+            self._xls_path = None
+
+
+def load_benchmarks(modules=None):
+    """Import the modules with benchmarks, so they are registered."""
+
+    for module_name in modules or BENCHMARK_MODULES:
+        importlib.import_module(module_name)
+
+    return BENCHMARKS
+
+
+def time_benchmark(function, fixture, repeat=DEFAULT_REPEAT):
+    """Time a benchmark some times, doing its setup before each timing.
+
+    Returns:
+        list: Wall time in seconds of each repetition.
+    """
+
+    times = []
+    for _ in range(repeat):
+        run = function(fixture)
+        wall_start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - wall_start)
+
+    return times
+
+
+def run(names=None, sizes=None, alignments=None, repeat=DEFAULT_REPEAT,
+        callback=None):
+    """Run benchmarks over a matrix of sizes and alignments.
+
+    Args:
+        names (list): Benchmarks to run, all the registered ones by default.
+        sizes (list): Sizes of the synthetic cases, keys of SIZES.
+        alignments (list): Alignments of the synthetic cases.
+        repeat (int): Times each benchmark is timed.
+        callback (function): Called with (key, result, reason) after each
+            benchmark, the result being None and the reason why if it was
+            skipped.
+
+    Returns:
+        dict: With the "environment" where benchmarks ran, the number of
+            times they were repeated, the "results" of each benchmark by
+            key ("name/size-alignment") with its "times" and statistics, and
+            the benchmarks "skipped" with the reason.
+    """
+
+    benchmarks = load_benchmarks()
+    names = names or list(benchmarks)
+    for name in names:
+        if name not in benchmarks:
+            raise ValueError("There is no benchmark " + repr(name))
+    for size in sizes or DEFAULT_SIZES:
+        if size not in SIZES:
+            raise ValueError("Size must be one of {}, not {}".format(
+                list(SIZES), repr(size)))
+
+    results = {"environment": get_environment(), "repeat": repeat,
+               "results": collections.OrderedDict(), "skipped": {}}
+
+    for size in sizes or DEFAULT_SIZES:
+        for alignment in alignments or ALIGNMENTS:
+            fixture = Fixture(size, alignment)
+            try:
+                for name in names:
+                    key = "{}/{}".format(name, fixture.name)
+                    try:
+                        times = time_benchmark(benchmarks[name], fixture,
+                                               repeat)
+                    except SkipBenchmark as inst:
+                        results["skipped"][key] = str(inst)
+                        result, reason = None, str(inst)
+                    else:
+                        result, reason = summarize(times), None
+                        results["results"][key] = result
+
+                    if callback:
+                        callback(key, result, reason)
+            finally:
+                fixture.cleanup()
+
+    return results
+
+
+def summarize(times):
+    return {"times": times, "min": min(times),
+            "median": float(np.median(times)), "mean": float(np.mean(times))}
+
+
+def get_environment():
+    """Return where benchmarks run, to tell apart baselines that are not
+    comparable."""
+
+    return {
+        "date": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "xlseries": xlseries.__version__,
+        "openpyxl": openpyxl.__version__,
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, stat="min"):
+    """Compare the results of the benchmarks run in both.
+
+    Args:
+        results (dict): Results returned by run (or loaded from JSON).
+        baseline (dict): Results to compare with.
+        threshold (float): Relative slow down tolerated, 0.2 reports a
+            regression if a benchmark takes 20% more than in the baseline.
+        stat (str): Statistic of the times compared ("min", "median" or
+            "mean").
+
+    Returns:
+        list: A dict for each benchmark in both with its "key", the
+            "baseline" and "current" time, their "ratio" and if it is a
+            "regression".
+    """
+
+    if stat not in STATS:
+        raise ValueError("Statistic must be one of {}, not {}".format(
+            STATS, repr(stat)))
+
+    comparisons = []
+    for key, result in results["results"].items():
+        if key in baseline["results"]:
+            baseline_time = baseline["results"][key][stat]
+            ratio = result[stat] / baseline_time if baseline_time else 1.0
+            comparisons.append({
+                "key": key,
+                "baseline": baseline_time,
+                "current": result[stat],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold
+            })
+
+    return comparisons
+
+
+def format_comparisons(comparisons):
+    """Return a table with the comparisons, one line for each benchmark."""
+
+    width = max([len(comparison["key"]) for comparison in comparisons] +
+                [len("benchmark")])
+
+    lines = ["{}  {:>10}  {:>10}  {:>7}".format(
+        "benchmark".ljust(width), "baseline", "current", "ratio")]
+    for comparison in comparisons:
+        lines.append("{}  {:>10.4f}  {:>10.4f}  {:>7.2f}{}".format(
+            comparison["key"].ljust(width), comparison["baseline"],
+            comparison["current"], comparison["ratio"],
+            "  REGRESSION" if comparison["regression"] else ""))
+
+    return "\n".join(lines)
+
+
+def save_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _print_result(key, result, reason=None):
+    if result is None:
+        print("{:<50} skipped: {}".format(key, reason))
+    else:
+        print("{:<50} min {:.4f}s  median {:.4f}s".format(
+            key, result["min"], result["median"]))
+    sys.stdout.flush()
+
+
+def _report(results, baseline, threshold, stat):
+    """Print the comparison and return the exit status (1 if there are
+    regressions)."""
+
+    comparisons = compare(results, baseline, threshold, stat)
+    print(format_comparisons(comparisons))
+
+    regressions = [comparison for comparison in comparisons
+                   if comparison["regression"]]
+    print("{} regressions above {:.0%} in {} benchmarks compared.".format(
+        len(regressions), threshold, len(comparisons)))
+
+    return 1 if regressions else 0
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scraping pipeline over synthetic " +
+        "workbooks and compare results with a baseline.")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "--benchmarks", default=None,
+        help="Benchmarks separated by commas, all of them by default.")
+    run_parser.add_argument(
+        "--sizes", default=",".join(DEFAULT_SIZES),
+        help="Sizes separated by commas, from {}.".format(", ".join(SIZES)))
+    run_parser.add_argument("--alignments", default=",".join(ALIGNMENTS))
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--output", default=None,
+                            help="JSON file where results are written.")
+    run_parser.add_argument("--baseline", default=None,
+                            help="JSON file with results to compare with.")
+    run_parser.add_argument("--list", action="store_true",
+                            help="List the benchmarks and exit.")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare results already stored.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--threshold", type=float,
+                               default=DEFAULT_THRESHOLD)
+        subparser.add_argument("--stat", default="min", choices=STATS)
+
+    args = parser.parse_args(args)
+
+    if args.command == "compare":
+        return _report(load_results(args.results),
+                       load_results(args.baseline), args.threshold,
+                       args.stat)
+
+    if args.list:
+        print("\n".join(load_benchmarks()))
+        return 0
+
+    results = run(
+        names=args.benchmarks.split(",") if args.benchmarks else None,
+        sizes=args.sizes.split(","), alignments=args.alignments.split(","),
+        repeat=args.repeat, callback=_print_result)
+
+    if args.output:
+        save_results(results, args.output)
+
+    if args.baseline:
+        return _report(results, load_results(args.baseline), args.threshold,
+                       args.stat)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
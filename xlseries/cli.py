@@ -0,0 +1,416 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+cli
+
+Command line batch converter: scrape many excel files with worker processes
+and write their series to a CSV, Parquet or JSON lines file as each file
+finishes.
+
+Series are written in long format, a record for each observed value with the
+columns source_file, worksheet, series_name, frequency, period and value, so
+files with different series and frequencies share the same output.
+
+The files to scrape come from a manifest, a CSV or JSON lines file with the
+path, sheet and params of each one (params is the path of a JSON file, or the
+parameters themselves as JSON), or from glob patterns scraped with the same
+parameters file.
+
+Example:
+    xlseries --manifest nightly.csv --output series.parquet --workers 4
+    xlseries "reports/*.xlsx" --params params.json --output series.csv
+
+Exit codes:
+    0: Every file was scraped.
+    1: Some files failed (the others were written).
+    2: Wrong arguments or manifest.
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+import concurrent.futures
+
+EXIT_OK = 0
+EXIT_FAILED_JOBS = 1
+EXIT_USAGE = 2
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".jsonl": "jsonl",
+           ".json": "jsonl"}
+COLUMNS = ["source_file", "worksheet", "series_name", "frequency", "period",
+           "value"]
+
+
+class ManifestError(ValueError):
+    """Raised if a manifest can't be read or a job in it is not valid."""
+    pass
+
+
+# JOBS
+def read_manifest(path):
+    """Read the jobs of a CSV or JSON lines manifest.
+
+    Every job has a "path", an optional "sheet" and "params", the path of a
+    JSON file or the parameters themselves (a JSON object in CSV manifests).
+    Relative paths are relative to the directory of the manifest.
+
+    Returns:
+        list: A dict for each job with its "path", "sheet" and "params".
+    """
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    try:
+        with open(path) as f:
+            if path.endswith(".csv"):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+    except (IOError, ValueError) as inst:
+        raise ManifestError("Manifest {} can't be read: {}".format(path,
+                                                                   inst))
+
+    return [_manifest_job(row, i_row + 1, base_dir)
+            for i_row, row in enumerate(rows)]
+
+
+def glob_jobs(patterns, params, sheet=None):
+    """Return a job for each file matching the glob patterns."""
+
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern),
+                                   recursive=True))
+        if not matches:
+            raise ManifestError("No file matches " + repr(pattern))
+        paths.extend(matches)
+
+    return [{"path": os.path.abspath(path), "sheet": sheet,
+             "params": os.path.abspath(params)} for path in paths]
+
+
+def scrape_job(job):
+    """Scrape the series of a job in long format.
+
+    Runs in the worker processes, so it never raises: failures are returned
+    with the error.
+
+    Returns:
+        dict: The "job", its "status" ("ok" or "failed"), the wall "seconds"
+            it took and the "frame" with the records and their number (if
+            ok) or the "error".
+    """
+
+    from xlseries import XlSeries
+
+    wall_start = time.perf_counter()
+    try:
+        xl = XlSeries(job["path"])
+        df = xl.get_data_frames(job["params"], ws_name=job["sheet"],
+                                output="long")
+        worksheet = df.attrs.get("worksheet", job["sheet"])
+
+        df.insert(0, "worksheet", worksheet)
+        df.insert(0, "source_file", job["path"])
+        for column in ["series_name", "frequency"]:
+            df[column] = df[column].astype(str)
+
+        return {"job": job, "status": "ok", "frame": df[COLUMNS],
+                "records": len(df),
+                "seconds": time.perf_counter() - wall_start}
+
+    except Exception as inst:
+        return {"job": job, "status": "failed",
+                "error": "{}: {}".format(inst.__class__.__name__,
+                                         str(inst).strip()),
+                "seconds": time.perf_counter() - wall_start}
+
+
+def run_jobs(jobs, workers=1):
+    """Scrape jobs and yield their results as they finish.
+
+    Args:
+        workers (int): Number of worker processes. With 1, jobs are scraped
+            in this process, one after the other.
+    """
+
+    if workers <= 1:
+        for job in jobs:
+            yield scrape_job(job)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scrape_job, job) for job in jobs]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+        finally:
+            # jobs not started yet are dropped if the caller stops early
+            for future in futures:
+                future.cancel()
+
+
+# OUTPUT
+class CsvWriter(object):
+    """Append records to a CSV file, writing the header once."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = sys.stdout if path == "-" else open(path, "w")
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class JsonLinesWriter(CsvWriter):
+    """Append records to a JSON lines file."""
+
+    def write(self, df):
+        if len(df):
+            self.file.write(df.to_json(orient="records", lines=True,
+                                       date_format="iso").rstrip("\n") + "\n")
+            self.file.flush()
+
+
+class ParquetWriter(object):
+    """Append records to a Parquet file, a row group for each file."""
+
+    def __init__(self, path):
+        from xlseries.utils.sinks import _import_pyarrow
+        self.pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.schema = self.pa.schema([
+            ("source_file", self.pa.string()),
+            ("worksheet", self.pa.string()),
+            ("series_name", self.pa.string()),
+            ("frequency", self.pa.string()),
+            ("period", self.pa.timestamp("ns")),
+            ("value", self.pa.float64())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, df):
+        self.writer.write_table(self.pa.Table.from_pandas(
+            df, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonLinesWriter,
+           "parquet": ParquetWriter}
+
+
+def output_format(path, output_format=None):
+    """Return the format of the output, from its extension if not passed
+    (CSV for stdout)."""
+
+    if output_format:
+        return output_format
+
+    if path == "-":
+        return "csv"
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ManifestError(
+            "Output format can't be guessed from {}, use --format.".format(
+                repr(path)))
+
+    return FORMATS[extension]
+
+
+# SUMMARY
+def summarize(results, wall_time):
+    """Return the number of files scraped and failed, the records written and
+    the timings of the files."""
+
+    seconds = sorted(result["seconds"] for result in results)
+    ok = [result for result in results if result["status"] == "ok"]
+
+    return {
+        "files": len(results),
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "records": sum(result["records"] for result in ok),
+        "wall_time": wall_time,
+        "file_time": {
+            "total": sum(seconds),
+            "min": seconds[0] if seconds else None,
+            "median": seconds[len(seconds) // 2] if seconds else None,
+            "max": seconds[-1] if seconds else None
+        },
+        "slowest": [
+            (result["job"]["path"], result["seconds"])
+            for result in sorted(results, key=lambda result:
+                                 -result["seconds"])[:5]
+        ],
+        "failures": [(result["job"]["path"], result["error"])
+                     for result in results if result["status"] == "failed"]
+    }
+
+
+def format_summary(summary):
+    lines = ["{files} files: {ok} ok, {failed} failed, {records} records "
+             "written in {wall_time:.2f}s".format(**summary)]
+
+    if summary["files"]:
+        lines.append("time per file: min {min:.2f}s, median {median:.2f}s, "
+                     "max {max:.2f}s, total {total:.2f}s".format(
+                         **summary["file_time"]))
+        lines.append("slowest files:")
+        lines.extend("    {:.2f}s  {}".format(seconds, path)
+                     for path, seconds in summary["slowest"])
+
+    if summary["failures"]:
+        lines.append("failed files:")
+        lines.extend("    {}  {}".format(path, error)
+                     for path, error in summary["failures"])
+
+    return "\n".join(lines)
+
+
+# COMMAND LINE
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="xlseries",
+        description="Scrape time series from many excel files into a CSV, " +
+        "Parquet or JSON lines file.")
+    parser.add_argument("files", nargs="*",
+                        help="Glob patterns of the files to scrape with " +
+                        "--params (eg. 'reports/**/*.xlsx').")
+    parser.add_argument("--manifest",
+                        help="CSV or JSON lines file with the path, sheet " +
+                        "and params of each file to scrape.")
+    parser.add_argument("--params",
+                        help="JSON file with the parameters of the files " +
+                        "matching the glob patterns.")
+    parser.add_argument("--sheet", default=None,
+                        help="Worksheet of the files matching the glob " +
+                        "patterns (the first one by default).")
+    parser.add_argument("--output", "-o", required=True,
+                        help="File where records are written, '-' writes " +
+                        "CSV or JSON lines to stdout.")
+    parser.add_argument("--format", choices=sorted(WRITERS), default=None,
+                        help="Format of the output (guessed from its " +
+                        "extension by default).")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                        help="Number of worker processes.")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop at the first file that fails.")
+    parser.add_argument("--summary",
+                        help="JSON file where the summary is written.")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Only print the summary.")
+
+    return parser
+
+
+def main(args=None):
+    parser = get_parser()
+    args = parser.parse_args(args)
+
+    try:
+        jobs = _get_jobs(args)
+        fmt = output_format(args.output, args.format)
+        if args.output == "-" and fmt == "parquet":
+            raise ManifestError("Parquet can't be written to stdout.")
+        writer = WRITERS[fmt](args.output)
+    except (ManifestError, ImportError, IOError) as inst:
+        sys.stderr.write("xlseries: error: {}\n".format(inst))
+        return EXIT_USAGE
+
+    results = []
+    wall_start = time.perf_counter()
+    try:
+        for result in run_jobs(jobs, args.workers):
+            if result["status"] == "ok":
+                writer.write(result.pop("frame"))
+            results.append(_finished(result, args.quiet))
+
+            if args.fail_fast and result["status"] == "failed":
+                break
+    finally:
+        writer.close()
+
+    summary = summarize(results, time.perf_counter() - wall_start)
+    sys.stderr.write(format_summary(summary) + "\n")
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=4)
+
+    return EXIT_FAILED_JOBS if summary["failed"] else EXIT_OK
+
+
+def _get_jobs(args):
+    if args.manifest and args.files:
+        raise ManifestError("Pass a manifest or glob patterns, not both.")
+
+    if args.manifest:
+        return read_manifest(args.manifest)
+
+    if not args.files:
+        raise ManifestError("Pass a manifest or glob patterns to scrape.")
+    if not args.params:
+        raise ManifestError("Glob patterns need a --params file.")
+
+    return glob_jobs(args.files, args.params, args.sheet)
+
+
+def _finished(result, quiet=False):
+    """Report a finished job on stderr."""
+
+    if not quiet:
+        job = result["job"]
+        source = job["path"] + (" [{}]".format(job["sheet"])
+                                if job["sheet"] else "")
+        if result["status"] == "ok":
+            sys.stderr.write("ok      {:.2f}s  {}  {} records\n".format(
+                result["seconds"], source, result["records"]))
+        else:
+            sys.stderr.write("failed  {:.2f}s  {}  {}\n".format(
+                result["seconds"], source, result["error"]))
+        sys.stderr.flush()
+
+    return result
+
+
+def _manifest_job(row, line, base_dir):
+    if not row.get("path"):
+        raise ManifestError("Job {} of the manifest has no path.".format(
+            line))
+
+    params = row.get("params")
+    if not params:
+        raise ManifestError("Job {} of the manifest has no params.".format(
+            line))
+
+    # params may be inline, a JSON object in a CSV manifest
+    if isinstance(params, str) and params.strip().startswith("{"):
+        try:
+            params = json.loads(params)
+        except ValueError as inst:
+            raise ManifestError("Params of job {} are not valid JSON: "
+                                "{}".format(line, inst))
+    elif isinstance(params, str):
+        params = os.path.join(base_dir, os.path.expanduser(params))
+
+    return {"path": os.path.join(base_dir, os.path.expanduser(row["path"])),
+            "sheet": row.get("sheet") or None,
+            "params": params}
+
+
+if __name__ == '__main__':
+    sys.exit(main())
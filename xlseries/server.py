@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+server
+
+Local scraping service: an HTTP server (standard library only) that scrapes
+files of the machine it runs on with a pool of warm worker processes.
+
+Workers import the strategies and compile the time parsing grammars when they
+start, before getting any request, and keep the workbooks they load in a LRU
+cache by path and modification time, so requests only pay for the scraping
+itself. Each worker has its own cache.
+
+Endpoints:
+    POST /scrape: Scrape a file, with a JSON body like
+        {"path": "/data/bulletin.xlsx", "params": {...} or "params.json",
+         "sheet": "Sheet1", "output": "wide" or "long", "select": [...]}
+        Returns the "worksheet" scraped and its "frames" (in pandas "split"
+        JSON format), or the "error" with status 422 if it failed.
+    GET /health: Workers and requests served.
+
+Example:
+    python -m xlseries.server --port 8765 --workers 4
+    curl -d '{"path": "/data/bulletin.xlsx", "params": "/data/params.json"}' \\
+        http://127.0.0.1:8765/scrape
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import multiprocessing
+import concurrent.futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from xlseries import __version__
+from xlseries.utils import workbook_cache
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 8
+
+OUTPUTS = ("wide", "long")
+
+
+class BadRequest(ValueError):
+    """Raised if the body of a request is not a valid scraping request."""
+    pass
+
+
+# WORKERS
+def warm_worker(cache_size=DEFAULT_CACHE_SIZE, ready_queue=None):
+    """Prepare a worker process to scrape: import the strategies (and the
+    libraries they use) and compile the time parsing grammars.
+
+    Args:
+        cache_size (int): Workbooks kept by the worker.
+        ready_queue (multiprocessing.Queue): Where the pid of the worker is
+            put when it is warm, if passed.
+    """
+
+    workbook_cache.configure(max_entries=cache_size)
+
+    from xlseries.strategies import strategies
+    from xlseries.strategies.clean import parse_time
+    from xlseries.strategies.clean import time_index
+    from xlseries.strategies.get import data
+    from xlseries.strategies.get import period_range
+
+    for module in [strategies, time_index, data, period_range]:
+        module.get_strategies()
+    parse_time.load_grammars()
+
+    if ready_queue is not None:
+        ready_queue.put(os.getpid())
+
+
+def scrape_request(request):
+    """Scrape the file of a request, in a worker process.
+
+    Failures are returned instead of raised, as exceptions of the strategies
+    may not be rebuilt in the server process.
+
+    Returns:
+        dict: The "worksheet" scraped and its "frames", or the "error", with
+            the "seconds" it took and if the workbook was "cached".
+    """
+
+    from xlseries import XlSeries
+
+    wall_start = time.perf_counter()
+    hits = workbook_cache.get_cache().hits
+    try:
+        xl = XlSeries(request["path"])
+        dfs = xl.get_data_frames(request["params"],
+                                 ws_name=request.get("sheet"),
+                                 output=request.get("output", "wide"),
+                                 select=request.get("select"))
+        if type(dfs) != list:
+            dfs = [dfs]
+
+        response = {
+            "status": "ok",
+            "worksheet": xl.last_ws_name,
+            "frames": [json.loads(df.to_json(orient="split",
+                                             date_format="iso"))
+                       for df in dfs]
+        }
+
+    except Exception as inst:
+        response = {"status": "failed",
+                    "error": "{}: {}".format(inst.__class__.__name__,
+                                             str(inst).strip())}
+
+    response["cached"] = workbook_cache.get_cache().hits > hits
+    response["seconds"] = time.perf_counter() - wall_start
+    return response
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+# SERVER
+class ScrapingServer(ThreadingHTTPServer):
+    """HTTP server handing scraping requests to a pool of warm workers.
+
+    Args:
+        address (tuple): (host, port) where the server listens.
+        workers (int): Number of worker processes.
+        cache_size (int): Workbooks kept by each worker.
+        quiet (bool): If True, requests are not logged.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), workers=None,
+                 cache_size=DEFAULT_CACHE_SIZE, quiet=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.quiet = quiet
+        self._ready_queue = multiprocessing.Queue()
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            self.workers, initializer=warm_worker,
+            initargs=(cache_size, self._ready_queue))
+
+        self.requests = {"ok": 0, "failed": 0}
+        self._requests_lock = threading.Lock()
+
+        super(ScrapingServer, self).__init__(address, RequestHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def warm_up(self, timeout=None):
+        """Start every worker and wait until they are warm.
+
+        Returns:
+            list: The pids of the workers.
+        """
+
+        # workers are started as jobs are submitted, while none is idle
+        for _ in range(self.workers):
+            self.pool.submit(_worker_ready)
+
+        return sorted(self._ready_queue.get(timeout=timeout)
+                      for _ in range(self.workers))
+
+    def scrape(self, request):
+        try:
+            response = self.pool.submit(scrape_request, request).result()
+        # eg. a worker died
+        except Exception as inst:
+            response = {"status": "failed",
+                        "error": "{}: {}".format(inst.__class__.__name__,
+                                                 str(inst).strip())}
+
+        with self._requests_lock:
+            self.requests[response["status"]] += 1
+        return response
+
+    def server_close(self):
+        super(ScrapingServer, self).server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server_version = "xlseries/" + __version__
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "Not found: " + self.path})
+
+        self._send_json(200, {"status": "ok",
+                              "workers": self.server.workers,
+                              "requests": dict(self.server.requests)})
+
+    def do_POST(self):
+        if self.path != "/scrape":
+            return self._send_json(404, {"error": "Not found: " + self.path})
+
+        try:
+            request = self._read_request()
+        except BadRequest as inst:
+            return self._send_json(400, {"status": "failed",
+                                         "error": str(inst)})
+
+        response = self.server.scrape(request)
+        self._send_json(200 if response["status"] == "ok" else 422,
+                        response)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super(RequestHandler, self).log_message(format, *args)
+
+    # PRIVATE
+    def _read_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError as inst:
+            raise BadRequest("Body is not valid JSON: {}".format(inst))
+
+        if not isinstance(request, dict):
+            raise BadRequest("Body must be a JSON object.")
+        for field in ["path", "params"]:
+            if not request.get(field):
+                raise BadRequest("Request has no {}.".format(field))
+        if request.get("output", "wide") not in OUTPUTS:
+            raise BadRequest("output must be one of {}.".format(OUTPUTS))
+
+        return request
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Serve scraping requests of local files with warm " +
+        "worker processes.")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="Address to listen on (only this machine by " +
+                        "default).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help="Number of worker processes (one per cpu by " +
+                        "default).")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Workbooks kept by each worker.")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Don't log every request.")
+    args = parser.parse_args(args)
+
+    server = ScrapingServer((args.host, args.port), args.workers,
+                            args.cache_size, args.quiet)
+    try:
+        server.warm_up()
+        sys.stderr.write("Serving on {} with {} warm workers\n".format(
+            server.url, server.workers))
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -415,7 +415,7 @@ class BasePEG(BaseParseTimeStrategy):
 
         # create grammar only if not already created
         if not self.grammar:
-            self.grammar = self.make_parsley_grammar()
+            self.grammar = get_grammar(self.__class__)
 
         return self.grammar(curr_time).date()
 
@@ -429,7 +429,7 @@ class BaseComposedQuarter():
 
         if params["time_composed"] and params["frequency"] == "Q":
             try:
-                cls.make_parsley_grammar()(curr_time).date()
+                get_grammar(cls)(curr_time).date()
             except:
                 return False
             return True
@@ -619,7 +619,7 @@ class ParseComposedYearQuarter1(BasePEG, BaseComposedQuarter):
             return False
 
         try:
-            cls.make_parsley_grammar()(curr_time).date()
+            get_grammar(cls)(curr_time).date()
             return True
         except:
             return False
@@ -669,7 +669,7 @@ class ParseComposedQuarterYear1(ParseComposedYearQuarter1):
             return False
 
         try:
-            cls.make_parsley_grammar()(curr_time).date()
+            get_grammar(cls)(curr_time).date()
             return True
         except:
             return False
@@ -717,7 +717,7 @@ class BaseComposedSemester():
 
         if params["time_composed"] and params["frequency"] == "S":
             try:
-                cls.make_parsley_grammar()(curr_time).date()
+                get_grammar(cls)(curr_time).date()
             except:
                 return False
             return True
@@ -802,7 +802,7 @@ class BaseComposedMonth():
             return False
 
         try:
-            cls.make_parsley_grammar()(curr_time).date()
+            get_grammar(cls)(curr_time).date()
             return True
         except:
             return False
@@ -940,7 +940,7 @@ class BaseComposedYear():
             return False
 
         try:
-            cls.make_parsley_grammar()(curr_time).date()
+            get_grammar(cls)(curr_time).date()
             return True
         except:
             return False
@@ -1020,6 +1020,34 @@ class ParseComposedYear2(BasePEG, BaseComposedYear):
                 """, {})
 
 
+# compiled grammars of the strategies, by strategy class
+_GRAMMARS = {}
+
+
+def get_grammar(strategy):
+    """Return the parsley grammar of a strategy, compiled the first time.
+
+    Compiling a grammar takes much longer than parsing a string with it, and
+    accepting strings needs it too.
+    """
+
+    grammar = _GRAMMARS.get(strategy)
+    if grammar is None:
+        grammar = strategy.make_parsley_grammar()
+        _GRAMMARS[strategy] = grammar
+
+    return grammar
+
+
+def load_grammars():
+    """Compile the grammars of every strategy that has one (eg. in a worker
+    process before it gets any job)."""
+
+    for strategy in get_strategies():
+        if hasattr(strategy, "make_parsley_grammar"):
+            get_grammar(strategy)
+
+
 def get_strategies():
     """Return all the concrete strategies available in this module.
 
@@ -16,7 +16,7 @@ automatically taken by "get_strategies" and exposed to the user.
 import arrow
 from pprint import pprint
 from pprint import pformat
-from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils import column_index_from_string
 import datetime
 
 from xlseries.strategies.clean.parse_time import DayOutOfRange, MonthOutOfRange
@@ -24,7 +24,9 @@ from xlseries.strategies.clean.parse_time import NoTimeValue
 from xlseries.strategies.clean.parse_time import NoPossibleTimeValue
 import xlseries.utils.strategies_helpers
 from xlseries.utils.time_manipulation import increment_time
+from xlseries.utils.coordinates import parse_coord, get_row, get_column
 import xlseries.strategies.clean.parse_time as parse_time_strategies
+import xlseries.strategies.discover.parameters as parameters
 
 
 # CUSTOM EXCEPTIONS
@@ -100,16 +102,25 @@ class BaseCleanTiStrategy(object):
 
     NO_TIME_VALUE_LIMIT = 40
 
-    def __init__(self, time_parser=None):
+    def __init__(self, time_parser=None, initial_last_time=None):
+        """Args:
+            time_parser (BaseParseTimeStrategy): Parse time strategy object to
+                try first, before searching for one that accepts the values.
+            initial_last_time (arrow.Arrow): Time value preceding the first
+                one of the time index, if the time index is being cleaned from
+                the middle (its first values give context to parse the next).
+        """
         self.time_parser = time_parser
+        self.initial_last_time = initial_last_time
 
     # PUBLIC INTERFACE
     @classmethod
     def accepts(cls, ws, params):
-        return cls._accepts(ws, params)
+        return cls._accepts(ws, parameters.SeriesParameters.coerce(params))
 
     def clean_time_index(self, ws, params):
-        return self._clean_time_index(ws, params)
+        return self._clean_time_index(
+            ws, parameters.SeriesParameters.coerce(params))
 
     # PRIVATE main methods
     @classmethod
@@ -125,10 +136,10 @@ class BaseCleanTiStrategy(object):
         p = params
         # create iterator of time index values
         iter_time_index = self._time_index_iterator(
-            ws, p["alignment"], p["time_header_coord"], p["data_starts"],
-            p["data_ends"])
+            ws, p.alignment, p.time_header_coord, p.data_starts,
+            p.data_ends)
 
-        last_time = None
+        last_time = self.initial_last_time
         no_time_value_count = 0
         for curr_time, next_time, write_time_cell in iter_time_index:
 
@@ -142,13 +153,13 @@ class BaseCleanTiStrategy(object):
 
                     # correct typos checking for a healthy time progression
                     curr_time = self._correct_progression(
-                        last_time, curr_time, p["frequency"], p["missings"],
-                        p["missing_value"])
+                        last_time, curr_time, p.frequency, p.missings,
+                        p.missing_value)
 
                     # avoid writing the same time value again, except in the
                     # multifrequency case, where year could be equal to the
                     # first quarter... TODO: better treatment for multifreq
-                    if curr_time == last_time and len(p["frequency"]) == 1:
+                    if curr_time == last_time and len(p.frequency) == 1:
                         raise SameTimeValue(curr_time, last_time)
 
                     # write the clean value to the spreadsheet
@@ -164,10 +175,10 @@ class BaseCleanTiStrategy(object):
                 except (ParseTimeImplementationError, NoPossibleTimeValue,
                         NoTimeValue, SameTimeValue, AssertionError):
 
-                    if not p["data_ends"]:
+                    if not p.data_ends:
                         return self._estimate_end(
-                            p["alignment"], write_time_cell, p["data_starts"],
-                            p["time_alignment"])
+                            p.alignment, write_time_cell, p.data_starts,
+                            p.time_alignment)
                     else:
                         raise
 
@@ -175,14 +186,14 @@ class BaseCleanTiStrategy(object):
                     raise
 
             elif (no_time_value_count < self.NO_TIME_VALUE_LIMIT
-                  and (not p["continuity"] or p["blank_rows"])):
+                  and (not p.continuity or p.blank_rows)):
                 no_time_value_count += 1
 
             else:
                 break
 
-        return self._estimate_end(p["alignment"], write_time_cell,
-                                  p["data_starts"], p["time_alignment"])
+        return self._estimate_end(p.alignment, write_time_cell,
+                                  p.data_starts, p.time_alignment)
 
     @classmethod
     def _must_be_time_value(cls, value, next_time, last_time):
@@ -227,24 +238,24 @@ class BaseCleanTiStrategy(object):
 
         if alignment == "vertical":
             end = end or cls._get_row_boundary(ws, time_header_coord, ini)
+            col = get_column(cls._time_header_coord(time_header_coord))
             for row in range(ini, end + 1):
                 curr_time = cls._get_time_value(
                     ws, time_header_coord, f_row=row)
                 next_time = cls._get_time_value(
                     ws, time_header_coord, f_row=row + 1)
-                col = cls._time_header_cell(ws, time_header_coord).column
-                write_time_cell = ws[col + str(row)]
+                write_time_cell = ws.cell(row=row, column=col)
 
                 yield (curr_time, next_time, write_time_cell)
 
         elif alignment == "horizontal":
             end = end or cls._get_column_boundary(ws, time_header_coord, ini)
+            row = get_row(cls._time_header_coord(time_header_coord))
             for col in range(ini, end + 1):
                 curr_time = cls._get_time_value(
-                    ws, time_header_coord, f_col=get_column_letter(col))
+                    ws, time_header_coord, f_col=col)
                 next_time = cls._get_time_value(
-                    ws, time_header_coord, f_col=get_column_letter(col + 1))
-                row = cls._time_header_cell(ws, time_header_coord).row
+                    ws, time_header_coord, f_col=col + 1)
                 write_time_cell = ws.cell(column=col, row=row)
 
                 yield (curr_time, next_time, write_time_cell)
@@ -261,17 +272,22 @@ class BaseCleanTiStrategy(object):
 
     @classmethod
     def _get_time_value(cls, ws, time_header_coord, f_row=None, f_col=None):
-        """Returns the time value corresponding a certain series and row."""
+        """Returns the time value corresponding a certain series and row.
+
+        Args:
+            f_row (int): Row index of the value, if the series is vertical.
+            f_col (int): Column index of the value, if it is horizontal.
+        """
         raise NotImplementedError(
             "Getting the time value must be " + "implemented in a subclass.")
 
     @classmethod
-    def _time_header_cell(cls, ws, time_header_coord):
-        """Returns the column where clean time index shouls be written."""
-        if type(time_header_coord) == list:
-            return ws[time_header_coord[0]]
+    def _time_header_coord(cls, time_header_coord):
+        """Returns the coordinate where clean time index should be written."""
+        if isinstance(time_header_coord, (list, tuple)):
+            return time_header_coord[0]
         else:
-            return ws[time_header_coord]
+            return time_header_coord
 
     # PRIVATE methods to parse time values
     def _parse_time(self, params, curr_time, last_time=None, next_time=None):
@@ -450,7 +466,7 @@ class BaseAccepts():
     def _base_cond(cls, ws, params):
         """Check that all base classes accept the input."""
         for base in cls.__bases__:
-            if (base is not BaseCleanTiStrategy and base is not cls
+            if (base is not BaseCleanTiStrategy and base is not BaseAccepts
                     and not base._accepts(ws, params)):
                 return False
         return True
@@ -514,10 +530,9 @@ class BaseSingleColumn():
         """Returns the time value corresponding a certain series and row."""
         assert type(time_header_coord) != list, "Time header should be a str."
 
-        col = str(f_col or ws[time_header_coord].column)
-        row = str(f_row or ws[time_header_coord].row)
+        row, col = parse_coord(time_header_coord)
 
-        return ws[col + row].value
+        return ws.cell(row=f_row or row, column=f_col or col).value
 
 
 class BaseMultipleColumns():
@@ -534,14 +549,14 @@ class BaseMultipleColumns():
 
         Concatenate all the values of the time header columns in a unique
         string."""
-        assert type(time_header_coord) == list, "Time header should be a list."
+        assert isinstance(time_header_coord, (list, tuple)), \
+            "Time header should be a list."
 
         time_value_list = []
 
         for coord in time_header_coord:
-            col = str(f_col or ws[coord].column)
-            row = str(f_row or ws[coord].row)
-            value = ws[col + row].value
+            row, col = parse_coord(coord)
+            value = ws.cell(row=f_row or row, column=f_col or col).value
 
             msg = "there shouldn't be time values in multicolumn!"
             assert type(value) != datetime.datetime, msg
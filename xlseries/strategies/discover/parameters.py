@@ -2,12 +2,11 @@
 # -*- coding: utf-8 -*-
 import json
 import pprint
-from openpyxl import Workbook
-from openpyxl.utils import column_index_from_string
 from copy import deepcopy
 
 from xlseries.utils.xl_methods import xl_coordinates_range, consecutive_cells
 from xlseries.utils.xl_methods import common_row_or_column, coord_in_scope
+from xlseries.utils.coordinates import parse_coord
 """
 parameters
 
@@ -142,7 +141,11 @@ class Parameters(object):
 
     FREQ_TRANSLATION = {"Y": "A", "YQQQQ": "AQQQQ", "QQQQY": "QQQQA"}
 
+    # parameters are kept in __dict__, the records of the series apart
+    __slots__ = ("__dict__", "_series_records")
+
     def __init__(self, params_input=None):
+        self._series_records = None
 
         # general
         self.alignment = None
@@ -169,8 +172,7 @@ class Parameters(object):
         self.frequency = None
 
         if params_input:
-            built_params = self._build(
-                self._get_params_dict(deepcopy(params_input)))
+            built_params = self._build(self._get_params_dict(params_input))
 
             for param_name in self.VALID_VALUES:
                 if param_name in built_params:
@@ -180,14 +182,15 @@ class Parameters(object):
 
     @classmethod
     def _get_params_dict(cls, params_input):
-        """Return the user input parameters as a dictionary, if possible."""
+        """Return a copy of the user input parameters as a dictionary, if
+        possible. The copy can be modified without affecting the input."""
 
         if type(params_input) == dict:
             return deepcopy(params_input)
 
         elif (type(params_input) == Parameters
               or str(type(params_input)) == cls.TYPE_PARAMETERS):
-            return params_input.__dict__
+            return deepcopy(params_input.__dict__)
 
         elif ((type(params_input) == str or type(params_input) == str)
               and params_input[-5:] == ".json"):
@@ -283,7 +286,18 @@ class Parameters(object):
             return self.__getattribute__(item)
 
     def __setitem__(self, param_name, param_value):
-        num_series = self._get_num_series(self.__dict__)
+        self._set_param(param_name, param_value,
+                        self._get_num_series(self.__dict__))
+
+    def __setattr__(self, param_name, param_value):
+        object.__setattr__(self, param_name, param_value)
+        if param_name in self.VALID_VALUES:
+            self._series_records = None
+
+    def _set_param(self, param_name, param_value, num_series):
+        """Validate a parameter value and set it for all the series."""
+
+        self._series_records = None
 
         if param_name == "context" and param_value:
             self.__dict__[param_name] = self._process_context(
@@ -308,8 +322,8 @@ class Parameters(object):
                                        self.VALID_VALUES[param_name])
 
             self.__dict__[param_name] = self._apply_to_all(
-                param_name, param_value, self._get_num_series(self.__dict__),
-                self, self.VALID_VALUES[param_name])
+                param_name, param_value, num_series, self,
+                self.VALID_VALUES[param_name])
 
     def __iter__(self):
         for param in self.__dict__:
@@ -332,19 +346,35 @@ class Parameters(object):
     # PUBLIC
     def get_series_params(self, i_series):
         """Returns parameters for only one series."""
+        return self._get_series_records()[i_series]
 
-        series_params = Parameters().__dict__
+    def derive(self, changes):
+        """Return new parameters with some values changed.
 
-        for param_name in list(series_params.keys()):
-            if self[param_name] is not None:
-                series_params[param_name] = self[param_name][i_series]
+        The new parameters share the values that are not changed with these
+        ones instead of copying them, so many attempts can be derived cheaply
+        from the same base. Parameters must not be modified in place (eg.
+        params["data_ends"][0] = 10): set a new value for all the series.
 
-            # missing parameters have to be deleted from slicing so they are
-            # not confused with possible valid None values
-            else:
-                del series_params[param_name]
+        Args:
+            changes (dict): {param_name: new_value} to be validated and set.
+        """
+
+        derived = Parameters()
+        derived.__dict__.update(self.__dict__)
 
-        return series_params
+        num_series = self._get_num_series(self.__dict__)
+        for param_name, param_value in changes.items():
+            derived._set_param(param_name, param_value, num_series)
+
+        return derived
+
+    def get_series_records(self):
+        """Returns a list with the parameters of each series.
+
+        Records are built once and reused until a parameter is set again, so
+        parameters must not be modified in place (see derive)."""
+        return list(self._get_series_records())
 
     def is_complete(self):
         """Check if all the parameters have values (ie. no misssing params)."""
@@ -406,6 +436,7 @@ class Parameters(object):
     def remove(self, param):
         """Remove a parameters setting it to 'missing'."""
         self.__dict__[param] = None
+        self._series_records = None
 
     def remove_blank_headers(self, ws):
         """Remove series whose headers are None values in the worksheet."""
@@ -426,11 +457,33 @@ class Parameters(object):
     def remove_series(self, index):
         """Remove all the parameters of a series, by its index."""
         num_series = len(self)
+        self._series_records = None
+
+        # build new lists, values may be shared with derived parameters
+        for param_name in self:
+            if (type(self[param_name]) == list
+                    and len(self[param_name]) == num_series):
+                self.__dict__[param_name] = (self[param_name][:index] +
+                                             self[param_name][index + 1:])
+
+    def select_series(self, indexes):
+        """Return new parameters with only some series, by their indexes.
+
+        Args:
+            indexes (list): Indexes of the series to keep, in order.
+        """
+
+        num_series = len(self)
+        selected = self.derive({})
 
         for param_name in self:
             if (type(self[param_name]) == list
                     and len(self[param_name]) == num_series):
-                del self[param_name][index]
+                selected.__dict__[param_name] = [
+                    self[param_name][index] for index in indexes
+                ]
+
+        return selected
 
     @classmethod
     def get_critical_params_template(cls):
@@ -699,18 +752,16 @@ class Parameters(object):
     def _check_consistency(cls, params_def):
 
         # check data starts is consistent with headers coordinates
-        ws = Workbook().active
         if type(params_def["data_starts"]) == list:
             data_starts = params_def["data_starts"][0]
         else:
             data_starts = params_def["data_starts"]
 
         if type(params_def["headers_coord"]) == list:
-            rows = [ws[coord].row for coord in params_def["headers_coord"]]
-            cols = [
-                column_index_from_string(ws[coord].column)
-                for coord in params_def["headers_coord"]
-            ]
+            rows = [parse_coord(coord)[0]
+                    for coord in params_def["headers_coord"]]
+            cols = [parse_coord(coord)[1]
+                    for coord in params_def["headers_coord"]]
 
             probably_vertical, probably_horizontal = None, None
             if "alignment" in params_def:
@@ -769,17 +820,13 @@ class Parameters(object):
         to be able to use this guessing. With > 4 non consecutive ones are
         allowed."""
         # import pdb; pdb.set_trace()
-        ws = Workbook().active
         if type(headers_coord) != list or len(headers_coord) <= 1:
             return None
 
         if ((len(headers_coord) < 4 and consecutive_cells(headers_coord))
                 or len(headers_coord) >= 4):
-            rows = [ws[coord].row for coord in headers_coord]
-            cols = [
-                column_index_from_string(ws[coord].column)
-                for coord in headers_coord
-            ]
+            rows = [parse_coord(coord)[0] for coord in headers_coord]
+            cols = [parse_coord(coord)[1] for coord in headers_coord]
 
             if len(set(rows)) == 1 and len(set(cols)) == len(cols):
                 return "vertical"
@@ -926,3 +973,128 @@ class Parameters(object):
     def _is_missing(self, param):
         valid_values = self.VALID_VALUES[param]
         return (self[param] is None and None not in valid_values)
+
+    def _get_series_records(self):
+        if self._series_records is None:
+            self._series_records = [
+                SeriesParameters.from_params(self, i_series)
+                for i_series in range(len(self))
+            ]
+
+        return self._series_records
+
+
+class SeriesParameters(object):
+    """Immutable record with the parameters of only one series.
+
+    Parameters can be read as attributes (params.frequency) or as items
+    (params["frequency"]), so strategies work with plain dictionaries of series
+    parameters too. Records are hashable and can be used as cache keys: list
+    values (eg. composed_headers_coord or a multicolumn time_header_coord)
+    are frozen into tuples when the record is built.
+
+    Missing parameters are not set in the record, so they are not confused
+    with possible valid None values.
+
+    Args:
+        series_params (dict): Parameters of the series.
+    """
+
+    VALID_NAMES = tuple(Parameters.VALID_VALUES)
+
+    __slots__ = VALID_NAMES + ("_hash", )
+
+    def __init__(self, series_params):
+        for param_name, param_value in series_params.items():
+            object.__setattr__(self, param_name, self._freeze(param_value))
+
+        object.__setattr__(self, "_hash", None)
+
+    @classmethod
+    def from_params(cls, params, i_series):
+        """Build the record of a series from a Parameters object."""
+
+        series_params = {}
+        for param_name in params.VALID_VALUES:
+            param_value = params.__dict__.get(param_name)
+            if param_value is not None:
+                series_params[param_name] = param_value[i_series]
+
+        return cls(series_params)
+
+    @classmethod
+    def coerce(cls, params):
+        """Return params as a record, if they are not a record already."""
+
+        if isinstance(params, cls):
+            return params
+
+        return cls(params)
+
+    def __getitem__(self, param_name):
+        try:
+            return getattr(self, param_name)
+        except AttributeError:
+            raise KeyError(param_name)
+
+    def __setattr__(self, param_name, param_value):
+        raise AttributeError("SeriesParameters are immutable.")
+
+    def __delattr__(self, param_name):
+        raise AttributeError("SeriesParameters are immutable.")
+
+    def __contains__(self, param_name):
+        return param_name in self.VALID_NAMES and hasattr(self, param_name)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if not isinstance(other, SeriesParameters):
+            try:
+                other = self.coerce(other)
+            except (AttributeError, TypeError):
+                return NotImplemented
+
+        return self.items() == other.items()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(tuple(self.items())))
+        return self._hash
+
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(), ))
+
+    def __repr__(self):
+        return "SeriesParameters(" + pprint.pformat(self.to_dict()) + ")"
+
+    # PUBLIC
+    def keys(self):
+        return [name for name in self.VALID_NAMES if hasattr(self, name)]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def get(self, param_name, default=None):
+        return getattr(self, param_name, default)
+
+    def to_dict(self):
+        """Return a dictionary with the parameters of the series."""
+        return dict(self.items())
+
+    # PRIVATE
+    @classmethod
+    def _freeze(cls, value):
+        """Return an immutable version of a parameter value."""
+
+        if type(value) in (list, tuple):
+            return tuple(cls._freeze(item) for item in value)
+
+        return value
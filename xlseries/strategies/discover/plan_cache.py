@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+plan_cache
+
+This module contains a persistent cache of parse plans. A parse plan collects
+every decision taken while scraping a worksheet (the complete parameters and
+the clean time index, parse time and get data strategies chosen) so a sheet
+with the same layout can skip discovery and strategy selection entirely.
+
+Sheets are matched by a layout fingerprint that deliberately ignores the
+length of the time index, so a monthly bulletin that only adds new rows keeps
+matching the plan stored the first time it was scraped.
+"""
+
+import os
+import json
+import hashlib
+import datetime
+from copy import deepcopy
+
+from xlseries.strategies.discover.parameters import Parameters
+from xlseries.utils.coordinates import get_row, get_column
+
+# number of time values used to build the format signature of a time index
+TIME_SIGNATURE_LENGTH = 12
+
+
+class ParsePlan(object):
+    """Resolved decisions of a successful scraping run over a worksheet.
+
+    Attributes:
+        params (dict): Complete parameters used to scrape the worksheet. Data
+            ends are kept as passed by the user, so they are estimated again
+            when the plan is applied to a sheet that has grown.
+        clean_ti (dict): Name of the clean time index strategy used for each
+            time index, keyed by the time header coordinate.
+        parse_time (dict): Name of the parse time strategy (the inferred time
+            format) used for each time index, keyed as clean_ti.
+        get_data (list): Name of the get data strategy used for each series.
+    """
+
+    def __init__(self, params=None, clean_ti=None, parse_time=None,
+                 get_data=None):
+        self.params = params
+        self.clean_ti = clean_ti or {}
+        self.parse_time = parse_time or {}
+        self.get_data = get_data or []
+
+    def __repr__(self):
+        return "ParsePlan(clean_ti={}, parse_time={}, get_data={})".format(
+            self.clean_ti, self.parse_time, self.get_data)
+
+    # PUBLIC
+    @staticmethod
+    def time_index_key(time_header_coord):
+        """Return a hashable key for a (single or multicolumn) time index."""
+        return json.dumps(time_header_coord)
+
+    def set_params(self, params):
+        """Keep a copy of the parameters of the attempt being recorded."""
+        self.params = deepcopy(params.__dict__)
+
+    def get_params(self):
+        """Return a Parameters object with the complete parameters.
+
+        The stored parameters were already built and validated in the run that
+        recorded the plan, so they are loaded without building them again."""
+        params = Parameters()
+        for param_name in Parameters.VALID_VALUES:
+            setattr(params, param_name, deepcopy(self.params.get(param_name)))
+
+        return params
+
+    def record_clean_ti(self, time_header_coord, cleaner_obj):
+        """Record the strategies used to clean a time index."""
+        key = self.time_index_key(time_header_coord)
+        self.clean_ti[key] = cleaner_obj.__class__.__name__
+        if cleaner_obj.time_parser:
+            self.parse_time[key] = cleaner_obj.time_parser.__class__.__name__
+
+    def record_get_data(self, i_series, strategy):
+        """Record the get data strategy used for a series."""
+        while len(self.get_data) <= i_series:
+            self.get_data.append(None)
+        self.get_data[i_series] = strategy.__name__
+
+    def get_clean_ti(self, time_header_coord):
+        """Return the names of the clean time index and parse time strategies
+        recorded for a time index, or (None, None) if there is no record."""
+        key = self.time_index_key(time_header_coord)
+        return self.clean_ti.get(key), self.parse_time.get(key)
+
+    def get_get_data(self, i_series):
+        """Return the name of the get data strategy recorded for a series."""
+        if i_series < len(self.get_data):
+            return self.get_data[i_series]
+
+    def to_dict(self):
+        return {
+            "params": self.params,
+            "clean_ti": self.clean_ti,
+            "parse_time": self.parse_time,
+            "get_data": self.get_data
+        }
+
+    @classmethod
+    def from_dict(cls, plan_dict):
+        return cls(plan_dict["params"], plan_dict["clean_ti"],
+                   plan_dict["parse_time"], plan_dict["get_data"])
+
+
+class PlanCache(object):
+    """Directory of parse plans stored as JSON files named by fingerprint.
+
+    Args:
+        cache_dir (str): Directory where plans are stored. It is created if it
+            doesn't exist.
+
+    Example:
+        cache = PlanCache("~/.xlseries/plans")
+        dfs = XlSeries(path).get_data_frames(params, plan_cache=cache)
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def __repr__(self):
+        return "PlanCache({})".format(repr(self.cache_dir))
+
+    # PUBLIC
+    @staticmethod
+    def fingerprint(ws, params):
+        """Return a fingerprint of the layout of a worksheet.
+
+        Args:
+            ws (Worksheet): The (not yet cleaned) worksheet to be scraped.
+            params (Parameters): Parameters passed by the user.
+
+        Returns:
+            str: Hexadecimal digest of the layout.
+        """
+        return layout_fingerprint(ws, params)
+
+    def get(self, fingerprint):
+        """Return the ParsePlan stored for a fingerprint, or None."""
+        path = self._plan_path(fingerprint)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path) as f:
+                return ParsePlan.from_dict(json.load(f))
+
+        # a corrupt plan is as good as a missing one
+        except (ValueError, KeyError):
+            self.discard(fingerprint)
+            return None
+
+    def put(self, fingerprint, plan):
+        """Store a ParsePlan under a fingerprint."""
+        path = self._plan_path(fingerprint)
+        temp_path = path + ".tmp"
+
+        with open(temp_path, "w") as f:
+            json.dump(plan.to_dict(), f, indent=4, sort_keys=True)
+
+        # replace the old plan in one step, readers never see a partial file
+        os.replace(temp_path, path)
+
+    def discard(self, fingerprint):
+        """Remove the plan stored for a fingerprint, if any."""
+        path = self._plan_path(fingerprint)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    # PRIVATE
+    def _plan_path(self, fingerprint):
+        return os.path.join(self.cache_dir, fingerprint + ".json")
+
+
+def layout_fingerprint(ws, params):
+    """Fingerprint the layout of a worksheet to be scraped with params.
+
+    The fingerprint takes into account the parameters passed by the user, the
+    values of the header cells, a format signature of the first values of each
+    time index and the dimension of the sheet across the series (columns in
+    vertical series, rows in horizontal ones). The length of the time index is
+    not taken into account.
+
+    Args:
+        ws (Worksheet): The (not yet cleaned) worksheet to be scraped.
+        params (Parameters): Parameters passed by the user.
+
+    Returns:
+        str: Hexadecimal digest of the layout.
+    """
+
+    layout = {
+        "title": ws.title,
+        "width": _layout_width(ws, params),
+        "params": params.__dict__,
+        "headers": _headers_values(ws, params),
+        "time_formats": _time_formats(ws, params)
+    }
+
+    layout_str = json.dumps(layout, sort_keys=True, default=repr)
+    return hashlib.sha1(layout_str.encode("utf-8")).hexdigest()
+
+
+def _headers_values(ws, params):
+    """Return the values of all the header cells of the parameters."""
+
+    coords = []
+    for header_coord in params.headers_coord or []:
+        coords.append(header_coord)
+
+    for composed_hc in params.composed_headers_coord or []:
+        coords.extend(composed_hc or [])
+
+    return [_value_signature(ws[coord].value, True) for coord in coords]
+
+
+def _time_formats(ws, params):
+    """Return the format signature of the first values of each time index."""
+
+    alignments = params.alignment or [
+        Parameters._guess_alignment(params.headers_coord)
+        for time_header_coord in params.time_header_coord or []]
+
+    time_formats = []
+    for time_header_coord, data_starts, alignment in zip(
+            params.time_header_coord or [], params.data_starts or [],
+            alignments):
+
+        if type(time_header_coord) != list:
+            time_header_coord = [time_header_coord]
+
+        time_format = []
+        for coord in time_header_coord:
+
+            # don't read (and create) cells beyond the worksheet limits
+            if alignment == "horizontal":
+                limit = ws.max_column
+            else:
+                limit = ws.max_row
+            last_index = min(data_starts + TIME_SIGNATURE_LENGTH - 1, limit)
+
+            for index in range(data_starts, last_index + 1):
+                if alignment == "horizontal":
+                    value = ws.cell(row=get_row(coord), column=index).value
+                else:
+                    value = ws.cell(row=index, column=get_column(coord)).value
+                time_format.append(_value_signature(value))
+
+        time_formats.append(time_format)
+
+    return time_formats
+
+
+def _layout_width(ws, params):
+    """Return the dimension of the worksheet across the series."""
+
+    # alignment may be still missing, guess it as Parameters does
+    alignments = set(params.alignment or [
+        Parameters._guess_alignment(params.headers_coord)])
+
+    if alignments == {"horizontal"}:
+        return ws.max_row
+    elif alignments == {"vertical"}:
+        return ws.max_column
+    else:
+        return (ws.max_row, ws.max_column)
+
+
+def _value_signature(value, keep_strings=False):
+    """Return a signature of the type and format of a cell value.
+
+    Digits and letters of strings are replaced by "9" and "a" so time strings
+    like "2015 Q1" and "2016 Q3" share the same signature ("9999 a9").
+    """
+
+    if isinstance(value, str):
+        value = value.strip()
+        if keep_strings:
+            return value
+        return "".join("9" if char.isdigit() else "a" if char.isalpha()
+                       else char for char in value)
+
+    elif isinstance(value, (datetime.datetime, datetime.date)):
+        return "datetime"
+
+    elif value is None:
+        return None
+
+    else:
+        return type(value).__name__
+
@@ -20,7 +20,9 @@ from unidecode import unidecode
 import collections
 
 import xlseries.utils.strategies_helpers
+import xlseries.strategies.discover.parameters as parameters
 from xlseries.utils.time_manipulation import increment_time
+from xlseries.utils.coordinates import get_row, get_column
 
 
 class BaseGetDataStrategy(object):
@@ -29,10 +31,10 @@ class BaseGetDataStrategy(object):
     # PUBLIC INTERFACE
     @classmethod
     def accepts(cls, ws, params):
-        return cls._accepts(ws, params)
+        return cls._accepts(ws, parameters.SeriesParameters.coerce(params))
 
     def get_data(self, ws, params):
-        return self._get_data(ws, params)
+        return self._get_data(ws, parameters.SeriesParameters.coerce(params))
 
     # PRIVATE
     @classmethod
@@ -41,9 +43,9 @@ class BaseGetDataStrategy(object):
         return cls._base_cond(ws, params)
 
     def _get_data(self, ws, params):
-        name = self._get_name(ws, params["headers_coord"],
-                              params["composed_headers_coord"],
-                              params["context"], params["series_names"])
+        name = self._get_name(ws, params.headers_coord,
+                              params.composed_headers_coord,
+                              params.context, params.series_names)
         # print name
         values_list = self._get_values(ws, params)
         # print params["data_ends"]
@@ -84,7 +86,7 @@ class BaseGetDataStrategy(object):
                     repr(type(composed_headers_coord)),
                     repr(composed_headers_coord)
                 ])
-                assert type(composed_headers_coord) == list, msg
+                assert isinstance(composed_headers_coord, (list, tuple)), msg
 
                 name = " ".join([
                     unidecode(ws[coord].value).strip()
@@ -97,7 +99,7 @@ class BaseGetDataStrategy(object):
                     repr(type(context)),
                     repr(context)
                 ])
-                assert type(context) == list, msg
+                assert isinstance(context, (list, tuple)), msg
 
                 name = " - ".join(
                     [header_context.strip()
@@ -108,30 +110,30 @@ class BaseGetDataStrategy(object):
     def _get_values(self, ws, params):
         p = params
         # create iterator of values
-        iter_values = self._values_iterator(ws, p["alignment"],
-                                            p["headers_coord"],
-                                            p["data_starts"], p["data_ends"])
+        iter_values = self._values_iterator(ws, p.alignment,
+                                            p.headers_coord,
+                                            p.data_starts, p.data_ends)
 
         values_dict = collections.OrderedDict()
         for value, index in iter_values:
             new_value = self._handle_new_value(
-                list(values_dict.values()), value, p["missings"],
-                p["missing_value"], p["blank_rows"])
+                list(values_dict.values()), value, p.missings,
+                p.missing_value, p.blank_rows)
 
             if self._value_to_be_added(new_value, index, ws, p):
-                frequency = self._get_frequency(p["frequency"])
+                frequency = self._get_frequency(p.frequency)
                 if frequency not in values_dict:
                     values_dict[frequency] = []
                 values_dict[frequency].append(new_value)
 
         # fill the missing values if they are implicit
         # it doesn't work with multifrequency series
-        if (p["missings"] and "Implicit" in p["missing_value"]
-                and len(p["frequency"]) == 1):
+        if (p.missings and "Implicit" in p.missing_value
+                and len(p.frequency) == 1):
             values = list(values_dict.values())[0]
             values = self._fill_implicit_missings(
-                ws, values, p["frequency"], p["time_header_coord"],
-                p["data_starts"], p["data_ends"], p["alignment"])
+                ws, values, p.frequency, p.time_header_coord,
+                p.data_starts, p.data_ends, p.alignment)
             return [values]
 
         return list(values_dict.values())
@@ -140,12 +142,12 @@ class BaseGetDataStrategy(object):
     def _values_iterator(cls, ws, alignment, header_coord, ini, end):
 
         if alignment == "vertical":
-            col = ws[header_coord].column
+            col = get_column(header_coord)
             for row in range(ini, end + 1):
-                yield (ws[col + str(row)].value, row)
+                yield (ws.cell(row=row, column=col).value, row)
 
         elif alignment == "horizontal":
-            row = ws[header_coord].row
+            row = get_row(header_coord)
             for col in range(ini, end + 1):
                 yield (ws.cell(column=col, row=row).value, col)
 
@@ -157,13 +159,13 @@ class BaseGetDataStrategy(object):
     def _time_index_iterator(cls, ws, alignment, time_header_coord, ini, end):
 
         if alignment == "vertical":
+            col = get_column(cls._time_header_coord(time_header_coord))
             for row in range(ini, end + 1):
-                col = cls._time_header_cell(ws, time_header_coord).column
-                yield ws[col + str(row)].value
+                yield ws.cell(row=row, column=col).value
 
         elif alignment == "horizontal":
+            row = get_row(cls._time_header_coord(time_header_coord))
             for col in range(ini, end + 1):
-                row = cls._time_header_cell(ws, time_header_coord).row
                 yield ws.cell(column=col, row=row).value
 
         else:
@@ -171,12 +173,12 @@ class BaseGetDataStrategy(object):
                             "'horizontal', not " + repr(alignment))
 
     @classmethod
-    def _time_header_cell(cls, ws, time_header_coord):
-        """Returns the column where clean time index shouls be written."""
-        if type(time_header_coord) == list:
-            return ws[time_header_coord[0]]
+    def _time_header_coord(cls, time_header_coord):
+        """Returns the coordinate of the column (or row) of the time index."""
+        if isinstance(time_header_coord, (list, tuple)):
+            return time_header_coord[0]
         else:
-            return ws[time_header_coord]
+            return time_header_coord
 
     @classmethod
     def _valid_value(cls, value):
@@ -203,7 +205,7 @@ class BaseAccepts():
     def _base_cond(cls, ws, params):
         """Check that all base classes accept the input."""
         for base in cls.__bases__:
-            if (base is not BaseGetDataStrategy
+            if (base is not BaseGetDataStrategy and base is not BaseAccepts
                     and not base._accepts(ws, params)):
                 return False
         return True
@@ -336,24 +338,24 @@ class BaseNonContinuous():
         value in the time index."""
 
         # keep the first column in case time index is multicolumn
-        if params["time_multicolumn"]:
-            time_header_coord = params["time_header_coord"][0]
+        if params.time_multicolumn:
+            time_header_coord = params.time_header_coord[0]
         else:
-            time_header_coord = params["time_header_coord"]
+            time_header_coord = params.time_header_coord
 
-        if params["alignment"] == "vertical":
-            time_col = ws[time_header_coord].column
-            time_coord = time_col + str(index + params["time_alignment"])
-            time_value = ws[time_coord].value
+        if params.alignment == "vertical":
+            time_col = get_column(time_header_coord)
+            time_value = ws.cell(
+                row=index + params.time_alignment, column=time_col).value
 
-        elif params["alignment"] == "horizontal":
-            time_row = ws[time_header_coord].row
+        elif params.alignment == "horizontal":
+            time_row = get_row(time_header_coord)
             time_value = ws.cell(
-                column=index + params["time_alignment"], row=time_row).value
+                column=index + params.time_alignment, row=time_row).value
 
         else:
             raise Exception("Series alignment must be 'vertical' or " +
-                            "'horizontal', not " + repr(params["alignment"]))
+                            "'horizontal', not " + repr(params.alignment))
 
         return value is not None and type(time_value) == datetime.datetime
 
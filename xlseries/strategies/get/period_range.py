@@ -11,7 +11,7 @@ looking for accepting or refusing certain input.
 """
 
 from pprint import pprint
-from openpyxl.utils import column_index_from_string
+from xlseries.utils.coordinates import get_row, get_column
 import pandas as pd
 
 import xlseries.utils.strategies_helpers
@@ -32,6 +32,25 @@ class BaseGetPeriodRangesStrategy(object):
         return cls._get_period_ranges(ws, freq, ini_row, time_header_coord,
                                       end_row, time_alignement, alignment)
 
+    @classmethod
+    def _time_values(cls, ws, alignment, time_header_coord, first, last):
+        """Return the values of a time index between two rows (or columns).
+
+        Cells are read directly by their index, without going beyond the
+        limits of the worksheet."""
+
+        if alignment == "vertical":
+            col = get_column(time_header_coord)
+            last = min(last, ws.max_row)
+            return [ws.cell(row=row, column=col).value
+                    for row in range(max(first, 1), last + 1)]
+
+        else:
+            row = get_row(time_header_coord)
+            last = min(last, ws.max_column)
+            return [ws.cell(row=row, column=col).value
+                    for col in range(max(first, 1), last + 1)]
+
     @staticmethod
     def _convert_freq(freq):
         translator = {"A": "AS", "Y": "AS", "S": "6MS", "Q": "QS", "M": "MS"}
@@ -50,13 +69,13 @@ class GetPeriodRangesSingleFrequency(BaseGetPeriodRangesStrategy):
                            data_ends, time_alignement, alignment):
 
         if alignment == "vertical":
-            col = column_index_from_string(ws[time_header_coord].column)
+            col = get_column(time_header_coord)
             start = ws.cell(
                 row=data_starts + time_alignement, column=col).value
             end = ws.cell(row=data_ends + time_alignement, column=col).value
 
         elif alignment == "horizontal":
-            row = ws[time_header_coord].row
+            row = get_row(time_header_coord)
             start = ws.cell(
                 column=data_starts + time_alignement, row=row).value
             end = ws.cell(column=data_ends + time_alignement, row=row).value
@@ -87,60 +106,44 @@ class GetPeriodRangesMultifrequency(BaseGetPeriodRangesStrategy):
         starts = {f: None for f in freq}
         ends = {f: None for f in freq}
 
-        if type(time_header_coord) == list:
+        if isinstance(time_header_coord, (list, tuple)):
             th_coord = time_header_coord[0]
         else:
             th_coord = time_header_coord
 
-        if alignment == "vertical":
-            col = column_index_from_string(ws[th_coord].column)
-
-            # capture starting times
-            rows = list(ws.rows)[ini - 1:ini + len(freq) - 1]
-            for cell, f in zip((row[col - 1] for row in rows), freq):
-                if not starts[f]:
-                    starts[f] = cell.value
-
-            # capture ending times
-            # calculates if multifreq series stop before a complete cycle
-            freq_end = (end - ini + 1) % len(freq)
-            if freq_end == 0:
-                freq_end = len(freq)
-
-            rows = list(ws.rows)[end - freq_end:end]
-            for cell, f in zip((row[col - 1] for row in reversed(rows)),
-                               freq[:freq_end][::-1]):
-                if not ends[f]:
-                    ends[f] = cell.value
+        if alignment not in ("vertical", "horizontal"):
+            raise Exception("Series alignment must be 'vertical' or " +
+                            "'horizontal', not " + repr(alignment))
 
-        elif alignment == "horizontal":
-            row = ws[th_coord].row
+        # capture starting times
+        first_values = cls._time_values(ws, alignment, th_coord, ini,
+                                        ini + len(freq) - 1)
+        for value, f in zip(first_values, freq):
+            if not starts[f]:
+                starts[f] = value
 
-            # capture starting times
-            cols = list(ws.columns)[ini - 1:ini + len(freq) - 1]
-            for cell, f in zip((col[row - 1] for col in cols), freq):
-                if not starts[f]:
-                    starts[f] = cell.value
+        # capture ending times
+        # calculates if multifreq series stop before a complete cycle
+        freq_end = (end - ini + 1) % len(freq)
+        if freq_end == 0:
+            freq_end = len(freq)
 
-            # capture ending times
-            # calculates if multifreq series stop before a complete cycle
-            freq_end = (end - ini + 1) % len(freq)
-            if freq_end == 0:
-                freq_end = len(freq)
+        if alignment == "vertical":
+            last_values = cls._time_values(ws, alignment, th_coord,
+                                           end - freq_end + 1, end)
+            last_freqs = freq[:freq_end]
 
+        else:
             # ends will be searched backwards from the global end
-            cols = list(ws.columns)[end - len(freq):end]
-            last_cols = (col[row - 1] for col in reversed(cols))
+            last_values = cls._time_values(ws, alignment, th_coord,
+                                           end - len(freq) + 1, end)
 
             # freq must be reordered to match the last columns
             last_freqs = freq[freq_end - 1:] + freq[:freq_end]
-            for cell, f in zip(last_cols, last_freqs[::-1]):
-                if not ends[f]:
-                    ends[f] = cell.value
 
-        else:
-            raise Exception("Series alignment must be 'vertical' or " +
-                            "'horizontal', not " + repr(alignment))
+        for value, f in zip(reversed(last_values), last_freqs[::-1]):
+            if not ends[f]:
+                ends[f] = value
 
         return [
             pd.date_range(
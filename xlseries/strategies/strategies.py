@@ -8,17 +8,27 @@ time data series from excel files into Pandas DataFrames.
 """
 
 from pprint import pprint
-import pandas as pd
-import numpy as np
 import copy
+import time
+import functools
 
 import xlseries.utils.strategies_helpers
 from xlseries.strategies.discover.parameters import Parameters
-import xlseries.strategies.clean.time_index as clean_ti_strategies
-import xlseries.strategies.get.data as get_data_strategies
-import xlseries.strategies.get.period_range as get_pr_strategies
-from xlseries.utils.data_frame import compare_data_frames
+import xlseries.strategies.discover.plan_cache as plan_caches
+import xlseries.utils.instrumentation as instrumentation
 from xlseries.utils.xl_methods import make_ws_copy
+from xlseries.utils.lazy_import import lazy_import
+
+# heavy dependencies and strategy modules are imported when first used
+arrow = lazy_import("arrow")
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+clean_ti_strategies = lazy_import("xlseries.strategies.clean.time_index")
+get_data_strategies = lazy_import("xlseries.strategies.get.data")
+get_pr_strategies = lazy_import("xlseries.strategies.get.period_range")
+parse_time_strategies = lazy_import("xlseries.strategies.clean.parse_time")
+lazy_data_frame = lazy_import("xlseries.utils.lazy_data_frame")
+data_frame = lazy_import("xlseries.utils.data_frame")
 
 
 # EXCEPTIONS
@@ -27,6 +37,37 @@ class TimeIndexNotClean(Exception):
     pass
 
 
+class IncrementalUpdateError(Exception):
+    """Raised if only the new observations of a worksheet can't be scraped.
+
+    The previous result doesn't match the tail of the worksheet or its
+    parameters don't allow an incremental update. A complete scraping should
+    be done instead."""
+    pass
+
+
+class NoSeriesSelected(Exception):
+    """Raised if no series of the parameters matches the selector."""
+    pass
+
+
+class NoStrategyAccepts(Exception):
+    """Raised if no strategy of a module accepts the inputs."""
+    pass
+
+
+class PlanNotApplicable(Exception):
+    """Raised if a cached parse plan fails scraping the worksheet.
+
+    The plan is discarded from the cache before raising. The worksheet may have
+    been partially cleaned, so it should be scraped again from a fresh copy."""
+
+    def __init__(self, fingerprint, original_exception):
+        msg = "Cached plan {} could not be applied: {}".format(
+            fingerprint, repr(original_exception))
+        super(PlanNotApplicable, self).__init__(msg)
+
+
 # STRATEGIES
 class BaseXlSeriesScraper(object):
     """Base class for the highest level algorithms of `xlseries`.
@@ -66,8 +107,14 @@ class BaseXlSeriesScraper(object):
     def accepts(cls, wb):
         return cls._accepts(wb)
 
-    def get_data_frames(self, safe_mode):
-        return self._get_data_frames(self.ws, self.params, safe_mode)
+    def get_data_frames(self, safe_mode, plan_cache=None, output="wide",
+                        select=None, write_frame=None):
+        return self._get_data_frames(self.ws, self.params, safe_mode,
+                                     plan_cache, output, select, write_frame)
+
+    def update_data_frames(self, previous_dfs, overlap, merge):
+        return self._update_data_frames(self.ws, self.params, previous_dfs,
+                                        overlap, merge)
 
 
 class ParameterDiscovery(BaseXlSeriesScraper):
@@ -88,35 +135,71 @@ class ParameterDiscovery(BaseXlSeriesScraper):
         return True
 
     @classmethod
-    def _get_data_frames(cls, ws, params, safe_mode):
-        """Extract time data series and return them as data frames."""
+    def _get_data_frames(cls, ws, params, safe_mode, plan_cache=None,
+                         output="wide", select=None, write_frame=None):
+        """Extract time data series and return them as data frames.
+
+        Args:
+            plan_cache (PlanCache): If passed, a parse plan stored for the
+                layout of ws is used to skip discovery and strategy selection.
+                The plan of a successful run is stored for the next ones.
+            output (str): "wide" or "long" data frames (see _get_data).
+            select: If passed, only the series matching it are scraped (see
+                _select_series).
+            write_frame (function): If passed, called with (df, params) for
+                every data frame, returning what is kept in its place (see
+                _get_data). When attempts of parameters are tried, the data
+                frames are written once an attempt succeeds.
+        """
+
+        # prune the series not selected before doing anything with them
+        if select is not None:
+            params = cls._select_series(ws, params, select)
+
+        if plan_cache:
+            fingerprint = plan_cache.fingerprint(ws, params)
+            cached_plan = plan_cache.get(fingerprint)
+
+            instrumentation.trace("plan_cache", fingerprint=fingerprint,
+                                  hit=bool(cached_plan))
+            if cached_plan:
+                return cls._apply_plan(ws, cached_plan, plan_cache,
+                                       fingerprint, output, write_frame)
 
         # FIRST: discover missing parameters generating attempts
-        attempts = cls._discover_parameters(ws, params)
+        with instrumentation.stage("discovery"):
+            attempts = cls._discover_parameters(ws, params)
+        instrumentation.trace("discovery", num_attempts=len(attempts),
+                              missing_params=params.get_missings())
 
         # there is only one attempt, probably the user passed all the params
         if len(attempts) == 1:
+            plan = cls._new_plan(attempts[0], plan_cache)
+
+            # SECOND: clean the data and THIRD: get the data from it
+            dfs = cls._run_attempt(ws, attempts[0], plan, output, 0, params,
+                                   write_frame=write_frame)
             params = attempts[0]
 
-            # SECOND: clean the data
-            cls._clean_data(ws, params)
+            if plan_cache:
+                plan_cache.put(fingerprint, plan)
 
-            # THIRD: get the data from a cleaned worksheet
-            dfs = cls._get_data(ws, params)
             return (dfs, params)
 
         # there is multiple combinations of parameters to try
         else:
             results = []
-            for params_attempt in attempts:
-                ws_temp = make_ws_copy(ws)
+            plans = []
+            for i_attempt, params_attempt in enumerate(attempts):
+                with instrumentation.stage("worksheet_copy"):
+                    ws_temp = make_ws_copy(ws)
+                plan = cls._new_plan(params_attempt, plan_cache)
 
                 try:
-                    # SECOND: clean the data
-                    cls._clean_data(ws_temp, params_attempt)
-
-                    # THIRD: get the data from a cleaned worksheet
-                    dfs = cls._get_data(ws_temp, params_attempt)
+                    # SECOND: clean the data and THIRD: get the data from it
+                    dfs = cls._run_attempt(ws_temp, params_attempt, plan,
+                                           output, i_attempt, params,
+                                           check_values=True)
 
                     # don't return a list with only one element
                     if type(dfs) == list and len(dfs) == 1:
@@ -126,12 +209,14 @@ class ParameterDiscovery(BaseXlSeriesScraper):
                         params_attempt = params_attempt[0]
 
                     results.append((dfs, params_attempt))
+                    plans.append(plan)
 
                     # stops with the first successful result
                     if not safe_mode:
                         break
 
-                except:
+                # the failure is in the trace of the run
+                except Exception:
                     continue
 
             # remove duplicates
@@ -143,7 +228,7 @@ class ParameterDiscovery(BaseXlSeriesScraper):
                     repeated = True
                     for df_a, df_b in zip(res[0], unique_res[0]):
                         try:
-                            compare_data_frames(df_a, df_b)
+                            data_frame.compare_data_frames(df_a, df_b)
                         except AssertionError:
                             repeated = False
                     if repeated:
@@ -163,6 +248,18 @@ Last attempt was:
 {}
 """.format(repr(params), repr(params_attempt)))
             elif len(unique_results) == 1:
+                # only an unambiguous result is worth a plan (the first
+                # result is always unique, so the plan is the first one)
+                if plan_cache:
+                    plan_cache.put(fingerprint, plans[0])
+
+                if write_frame:
+                    dfs, params_attempt = unique_results[0]
+                    if type(dfs) != list:
+                        dfs = [dfs]
+                    return ([write_frame(df, params_attempt) for df in dfs],
+                            params_attempt)
+
                 return unique_results[0]
 
             else:
@@ -171,6 +268,323 @@ Last attempt was:
                 params = [res[1] for res in unique_results]
                 return (dfs, params_attempt)
 
+    @classmethod
+    def _update_data_frames(cls, ws, params, previous_dfs, overlap, merge):
+        """Extract only the observations appended after a previous result.
+
+        Time index and values are cleaned and extracted starting a few rows
+        (or columns) before the previous end. That overlapping tail is checked
+        against the previous data frames before appending the new periods.
+
+        Only single frequency and continuous series without blank rows nor
+        implicit missings are supported, where every row (or column) of the
+        time index is the next period of the previous one.
+
+        Args:
+            params (Parameters): Complete parameters resolved in the previous
+                run, with the data ends of every series.
+            previous_dfs (list): Data frames returned by the previous run.
+            overlap (int): Number of previous observations of each time index
+                scraped again to check they match (at least 2).
+            merge (bool): If True, return the previous data frames with the
+                new periods appended. If False, return only the new periods.
+
+        Returns:
+            tuple: (dfs, params) where params have the new data ends.
+        """
+
+        cls._check_incremental_params(params)
+
+        msg = "At least 2 observations must overlap, not {}".format(overlap)
+        assert overlap >= 2, msg
+
+        if type(previous_dfs) != list:
+            previous_dfs = [previous_dfs]
+
+        # scrape from the overlapping tail to the new end of each series
+        delta_params = params.derive({
+            "data_starts": [
+                max(start, end - overlap + 1)
+                for start, end in zip(params.data_starts, params.data_ends)
+            ],
+            "data_ends": [None for end in params.data_ends]
+        })
+
+        try:
+            time_indexes_ends = {}
+            delta_data_ends = list(delta_params.data_ends)
+            for i_series in range(len(params.headers_coord)):
+                key = plan_caches.ParsePlan.time_index_key(
+                    params["time_header_coord"][i_series])
+
+                # the time value before the tail gives context to parse it
+                if key not in time_indexes_ends:
+                    last_time = cls._time_before_tail(
+                        ws, params[i_series], delta_params[i_series],
+                        previous_dfs)
+                    time_indexes_ends[key] = cls._clean_time_index(
+                        ws, delta_params[i_series], last_time=last_time)
+
+                delta_data_ends[i_series] = time_indexes_ends[key]
+
+            delta_params["data_ends"] = delta_data_ends
+            delta_dfs = cls._get_data(ws, delta_params)
+
+        except IncrementalUpdateError:
+            raise
+
+        except Exception as inst:
+            raise IncrementalUpdateError(
+                "New observations couldn't be scraped: " + repr(inst))
+
+        dfs = []
+        for previous_df in previous_dfs:
+            delta_df = cls._matching_data_frame(previous_df, delta_dfs)
+            new_df = cls._new_periods(previous_df, delta_df)
+
+            if merge:
+                dfs.append(pd.concat([previous_df, new_df]))
+            else:
+                dfs.append(new_df)
+
+        new_params = params.derive({"data_ends": delta_params.data_ends})
+
+        return (dfs, new_params)
+
+    @classmethod
+    def _check_incremental_params(cls, params):
+        """Check parameters allow to update a previous result incrementally."""
+
+        if not params.is_complete() or not all(params.data_ends):
+            raise IncrementalUpdateError(
+                "Previous parameters must be complete and have data ends.")
+
+        if params.time_multicolumn[0]:
+            raise IncrementalUpdateError(
+                "Multicolumn time indexes can't be updated incrementally.")
+
+        for p in params.get_series_records():
+
+            if len(p.frequency) > 1:
+                raise IncrementalUpdateError(
+                    "Multifrequency series can't be updated incrementally.")
+
+            if (not p.continuity or p.blank_rows
+                    or (p.missings and "Implicit" in p.missing_value)):
+                raise IncrementalUpdateError(
+                    "Only continuous series without blank rows nor " +
+                    "implicit missings can be updated incrementally.")
+
+    @classmethod
+    def _time_before_tail(cls, ws, params_series, delta_params_series,
+                          previous_dfs):
+        """Return the time value preceding the tail of a time index.
+
+        Every row (or column) of the previous time index is a period, so the
+        time value preceding the tail is found counting periods backwards from
+        the end of the previous data frame that has the series."""
+
+        name = get_data_strategies.BaseGetDataStrategy._get_name(
+            ws, params_series.headers_coord,
+            params_series.composed_headers_coord,
+            params_series.context, params_series.series_names)
+
+        for previous_df in previous_dfs:
+            if name in previous_df.columns:
+                tail_length = (params_series.data_ends -
+                               delta_params_series.data_starts + 1)
+
+                if tail_length >= len(previous_df.index):
+                    return None
+
+                period = previous_df.index[-tail_length - 1]
+                if isinstance(period, pd.Period):
+                    period = period.to_timestamp()
+
+                return arrow.get(period.to_pydatetime())
+
+        raise IncrementalUpdateError(
+            "There is no previous data frame with the series " + repr(name))
+
+    @classmethod
+    def _matching_data_frame(cls, previous_df, delta_dfs):
+        """Return the data frame of the delta with the previous columns."""
+
+        for delta_df in delta_dfs:
+            if list(delta_df.columns) == list(previous_df.columns):
+                return delta_df
+
+        raise IncrementalUpdateError(
+            "No new data frame has the columns " + repr(
+                list(previous_df.columns)))
+
+    @classmethod
+    def _new_periods(cls, previous_df, delta_df):
+        """Check the overlapping tail and return the periods after it."""
+
+        last_period = previous_df.index[-1]
+        tail_df = delta_df[delta_df.index <= last_period]
+        new_df = delta_df[delta_df.index > last_period]
+
+        if len(tail_df) == 0:
+            raise IncrementalUpdateError(
+                "There is no overlapping tail to check at " + str(last_period))
+
+        if not tail_df.index.isin(previous_df.index).all():
+            raise IncrementalUpdateError(
+                "Overlapping periods don't match the previous time index.")
+
+        previous_tail = previous_df.loc[tail_df.index]
+        equal = np.isclose(previous_tail.values.astype(float),
+                           tail_df.values.astype(float), equal_nan=True)
+        if not equal.all():
+            raise IncrementalUpdateError(
+                "Overlapping values don't match the previous ones.")
+
+        # the new periods have to follow the previous ones without holes
+        if (len(new_df) > 0 and previous_df.index.freq
+                and new_df.index[0] != last_period + previous_df.index.freq):
+            raise IncrementalUpdateError(
+                "New periods don't follow the last one: " + str(last_period))
+
+        return new_df
+
+    @classmethod
+    def _apply_plan(cls, ws, plan, plan_cache, fingerprint, output="wide",
+                    write_frame=None):
+        """Scrape ws straight away with the decisions of a cached plan."""
+
+        params = plan.get_params()
+
+        try:
+            dfs = cls._run_attempt(ws, params, plan, output,
+                                   write_frame=write_frame)
+
+        except Exception as inst:
+            plan_cache.discard(fingerprint)
+            raise PlanNotApplicable(fingerprint, inst)
+
+        return (dfs, params)
+
+    @classmethod
+    def _select_series(cls, ws, params, select):
+        """Return parameters with only the series matching a selector.
+
+        Args:
+            select: A series name or header coordinate (str), a compiled
+                regular expression searched in the series name, a function
+                called with (name, header_coord) that returns True for the
+                series wanted, or a list of any of them.
+
+        Returns:
+            Parameters: New parameters with the selected series, in order.
+        """
+
+        matchers = select if type(select) in (list, tuple) else [select]
+
+        indexes = []
+        for i_series in range(len(params)):
+            header_coord = params.headers_coord[i_series]
+            name = get_data_strategies.BaseGetDataStrategy._get_name(
+                ws, header_coord, params.composed_headers_coord[i_series],
+                params.context[i_series], params.series_names[i_series])
+
+            if any(cls._series_matches(matcher, name, header_coord)
+                   for matcher in matchers):
+                indexes.append(i_series)
+
+        if not indexes:
+            raise NoSeriesSelected(
+                "No series matches the selector " + repr(select))
+
+        return params.select_series(indexes)
+
+    @classmethod
+    def _series_matches(cls, matcher, name, header_coord):
+        if callable(matcher):
+            return bool(matcher(name, header_coord))
+
+        elif hasattr(matcher, "search"):
+            return bool(matcher.search(name))
+
+        elif type(matcher) == str:
+            return matcher == name or matcher == header_coord
+
+        else:
+            raise TypeError("Series selector must be a str, a regular " +
+                            "expression or a function, not " + repr(matcher))
+
+    @classmethod
+    def _run_attempt(cls, ws, params, plan=None, output="wide", i_attempt=0,
+                     base_params=None, check_values=False, write_frame=None):
+        """Clean ws and get the data with an attempt of parameters.
+
+        The attempt is traced with its outcome, the time spent and the
+        parameters that differ from the base ones, if passed.
+
+        Args:
+            i_attempt (int): Position of the attempt in the attempts tried.
+            base_params (Parameters): Parameters the attempt was derived from.
+            check_values (bool): If True, the values of lazy data frames are
+                extracted and checked, so the attempt fails like it does
+                with eager data frames. Used when choosing between attempts.
+            write_frame (function): Called with every data frame built (see
+                _get_data).
+        """
+
+        wall_start = time.perf_counter()
+        try:
+            with instrumentation.stage("attempt"):
+                cls._clean_data(ws, params, plan)
+                dfs = cls._get_data(ws, params, plan, output, write_frame)
+
+                # values already extracted are kept by the lazy data frames
+                if output == "lazy" and check_values:
+                    for df in dfs:
+                        df.load_all()
+
+        except Exception as inst:
+            if instrumentation.tracing():
+                instrumentation.trace(
+                    "attempt", attempt=i_attempt, status="failed",
+                    reason=instrumentation.reason_code(inst),
+                    error=str(inst).strip()[:500],
+                    params_delta=cls._params_delta(params, base_params),
+                    wall_time=time.perf_counter() - wall_start)
+            raise
+
+        if instrumentation.tracing():
+            instrumentation.trace(
+                "attempt", attempt=i_attempt, status="ok",
+                params_delta=cls._params_delta(params, base_params),
+                wall_time=time.perf_counter() - wall_start)
+
+        return dfs
+
+    @staticmethod
+    def _params_delta(params, base_params=None):
+        """Return the parameters of an attempt that differ from the base."""
+
+        if base_params is None:
+            return {}
+
+        return {
+            param_name: params[param_name] for param_name in params
+            if base_params[param_name] is not params[param_name]
+            and base_params[param_name] != params[param_name]
+        }
+
+    @classmethod
+    def _new_plan(cls, params, plan_cache):
+        """Create a plan recording params, if there is a cache to store it."""
+
+        if not plan_cache:
+            return None
+
+        plan = plan_caches.ParsePlan()
+        plan.set_params(params)
+        return plan
+
     # HIGH LEVEL TASKS
     @classmethod
     def _discover_parameters(cls, ws, params):
@@ -187,14 +601,19 @@ Last attempt was:
             return [params]
 
     @classmethod
-    def _clean_data(cls, ws, params):
-        """Ensure data is clean to be processed with the parameters."""
+    def _clean_data(cls, ws, params, plan=None):
+        """Ensure data is clean to be processed with the parameters.
+
+        Args:
+            plan (ParsePlan): If passed, the clean time index strategies
+                recorded in it are used and the ones chosen are recorded.
+        """
 
         # 1. Clean time index
 
         # if time index is multicolumn, only one time index is allowed
         if params["time_multicolumn"][0]:
-            end = cls._clean_time_index(ws, params[0])
+            end = cls._clean_time_index(ws, params[0], plan)
 
             # if not provided, the end is when time index finish
             if not params["data_ends"][0]:
@@ -204,115 +623,289 @@ Last attempt was:
         else:
             time_indexes_ends = {}
             time_indexes = set()
+
+            # data ends may be shared with other attempts, set a new list
+            data_ends = list(params["data_ends"])
             for i_series in range(len(params.time_header_coord)):
 
                 # avoid cleaning the same time index twice
                 time_header_coord = params["time_header_coord"][i_series]
                 if time_header_coord not in time_indexes:
                     time_indexes.add(time_header_coord)
-                    end = cls._clean_time_index(ws, params[i_series])
+                    end = cls._clean_time_index(ws, params[i_series], plan)
                     assert end, "Clean time index should have an end."
                     time_indexes_ends[time_header_coord] = end
 
                 # if not provided, the end is when time index finish
-                if not params["data_ends"][i_series]:
+                if not data_ends[i_series]:
                     # start = params["data_starts"][i_series]
 
                     # for i_series in xrange(len(params.time_header_coord)):
                     #     if params["data_starts"][i_series] == start:
-                    params["data_ends"][i_series] = time_indexes_ends[
-                        time_header_coord]
+                    data_ends[i_series] = time_indexes_ends[time_header_coord]
+
+            params["data_ends"] = data_ends
 
         # 2. Clean data values
         for i_series in range(len(params.headers_coord)):
             cls._clean_values(ws)
 
     @classmethod
-    def _get_data(cls, ws, params):
-        """Parse data using parameters and return it in data frames."""
+    def _get_data(cls, ws, params, plan=None, output="wide",
+                  write_frame=None):
+        """Parse data using parameters and return it in data frames.
+
+        Args:
+            plan (ParsePlan): If passed, the get data strategies recorded in it
+                are used and the ones chosen are recorded.
+            output (str): "wide" returns a data frame for each period range,
+                with a column for each series. "long" returns only one data
+                frame with a record (series_name, frequency, period, value)
+                for each observed value. "lazy" returns a LazyDataFrame for
+                each period range, that extracts the values of a series only
+                when its column is accessed.
+            write_frame (function): If passed, every data frame is passed to
+                it with params as soon as it is built, and the value it
+                returns (eg. the path of the file where the frame was
+                written) is returned in place of the frame. Not supported
+                with lazy output.
+        """
         # import pdb; pdb.set_trace()
         # 1. Build data frames dict based on number of period ranges founded
         dfs_dict = {}
-        for period_range in cls._get_period_ranges(ws, params):
+        prs_cache = {}
+        for period_range in cls._get_period_ranges(ws, params, prs_cache):
             hashable_pr = cls._hash_period_range(period_range)
             if hashable_pr not in dfs_dict:
                 dfs_dict[hashable_pr] = {
                     "columns": [],
+                    "names": {},
                     "data": [],
                     "period_range": period_range
                 }
 
         # 2. Get name (column) and values of each data series
-        for i_series in range(len(params.headers_coord)):
-
-            # iterate strategies looking for someone that accepts it
-            params_series = params[i_series]
-            name, values = None, None
-            for strategy in get_data_strategies.get_strategies():
-
-                if strategy.accepts(ws, params_series):
-                    strategy_obj = strategy()
-                    # import pdb; pdb.set_trace()
-                    names_and_values = strategy_obj.get_data(ws, params_series)
-                    names, values = names_and_values[0]
-                    break
+        for i_series, params_series in enumerate(
+                params.get_series_records()):
 
-            # raise exception if no strategy accepts the input
-            if not names_and_values:
-                msg = "There is no strategy to deal with " + str(params_series)
-                raise Exception(msg)
+            strategy = cls._get_data_strategy(ws, params_series, i_series,
+                                              plan)
 
-            if (params_series["time_multicolumn"]
-                    and type(params_series["time_header_coord"]) == list):
-                time_header_coord = params_series["time_header_coord"][0]
+            if (params_series.time_multicolumn and isinstance(
+                    params_series.time_header_coord, (list, tuple))):
+                time_header_coord = params_series.time_header_coord[0]
             else:
-                time_header_coord = params_series["time_header_coord"]
+                time_header_coord = params_series.time_header_coord
 
             prs = cls._get_series_prs(
-                ws, params_series["frequency"], params_series["data_starts"],
-                time_header_coord, params_series["data_ends"],
-                params_series["time_alignment"], params_series["alignment"])
+                ws, params_series.frequency, params_series.data_starts,
+                time_header_coord, params_series.data_ends,
+                params_series.time_alignment, params_series.alignment,
+                prs_cache)
+
+            # values are extracted only when a lazy column is accessed
+            if output == "lazy":
+                name = strategy._get_name(
+                    ws, params_series.headers_coord,
+                    params_series.composed_headers_coord,
+                    params_series.context, params_series.series_names)
+                load = cls._lazy_values_loader(ws, strategy, params_series)
+                names_and_values = [
+                    (name, functools.partial(load, i_value))
+                    for i_value in range(len(prs))
+                ]
+            else:
+                with instrumentation.stage("get_values"):
+                    names_and_values = strategy().get_data(ws, params_series)
 
             for period_range, (name, values) in zip(prs, names_and_values):
                 hashable_pr = cls._hash_period_range(period_range)
 
-                cls._add_name(name, dfs_dict[hashable_pr]["columns"])
+                cls._add_name(name, dfs_dict[hashable_pr]["columns"],
+                              dfs_dict[hashable_pr]["names"])
                 dfs_dict[hashable_pr]["data"].append(values)
 
         # 3. Build data frames
+        if output == "long":
+            with instrumentation.stage("build_data_frames"):
+                df = cls._build_long_data_frame(list(dfs_dict.values()))
+            return [write_frame(df, params) if write_frame else df]
+
+        if output == "lazy":
+            return [
+                lazy_data_frame.LazyDataFrame(
+                    df_inputs["columns"], df_inputs["data"],
+                    functools.partial(cls._data_frame_index,
+                                      df_inputs["period_range"]),
+                    functools.partial(cls._build_data_frame,
+                                      df_inputs["period_range"]))
+                for df_inputs in dfs_dict.values()
+            ]
+
+        # the inputs of each frame are released once it is built, and the
+        # frame itself once it is written
         dfs = []
-        for df_inputs in list(dfs_dict.values()):
+        with instrumentation.stage("build_data_frames"):
+            while dfs_dict:
+                df_inputs = dfs_dict.pop(next(iter(dfs_dict)))
+                df = cls._build_data_frame(df_inputs["period_range"],
+                                           df_inputs["columns"],
+                                           df_inputs["data"])
+                del df_inputs
+                dfs.append(write_frame(df, params) if write_frame else df)
+                del df
+
+        return dfs
 
-            period_range = df_inputs["period_range"]
-            columns = df_inputs["columns"]
-            data = np.array(df_inputs["data"]).transpose()
+    # auxiliar methods
+    @classmethod
+    def _get_data_strategy(cls, ws, params_series, i_series, plan=None):
+        """Return the first get data strategy that accepts a series."""
 
-            # try with business days if daily frequency fails
-            if period_range.freqstr == "D":
-                try:
-                    df = pd.DataFrame(
-                        index=period_range, columns=columns, data=data)
-                except ValueError:
-                    # rework period range in business days
-                    pr = period_range
-                    ini_date = "{}-{}-{}".format(pr[0].year, pr[0].month,
-                                                 pr[0].day)
-                    end_date = "{}-{}-{}".format(pr[-1].year, pr[-1].month,
-                                                 pr[-1].day)
-                    pr_B = pd.period_range(ini_date, end_date, freq="B")
-
-                    df = pd.DataFrame(index=pr_B, columns=columns, data=data)
-
-            # go straight if frequency is not daily
-            else:
-                df = pd.DataFrame(
-                    index=period_range, columns=columns, data=data)
+        for strategy in cls._strategies_to_try(
+                get_data_strategies, plan and plan.get_get_data(i_series)):
 
-            dfs.append(df)
+            if strategy.accepts(ws, params_series):
+                if plan:
+                    plan.record_get_data(i_series, strategy)
+                instrumentation.trace(
+                    "get_data", series=i_series, strategy=strategy.__name__,
+                    headers_coord=params_series.headers_coord)
+                return strategy
 
-        return dfs
+        # raise exception if no strategy accepts the input
+        msg = "There is no strategy to deal with " + str(params_series)
+        raise NoStrategyAccepts(msg)
+
+    @staticmethod
+    def _lazy_values_loader(ws, strategy, params_series):
+        """Return a function that extracts the values of a series once.
+
+        The function returns the values of one of the period ranges of the
+        series (multifrequency series have many), by its position."""
+
+        names_and_values = []
+
+        def load(i_value):
+            if not names_and_values:
+                with instrumentation.stage("get_values"):
+                    names_and_values.extend(
+                        strategy().get_data(ws, params_series))
+            return names_and_values[i_value][1]
+
+        return load
+
+    @staticmethod
+    def _strategies_to_try(strategies_module, planned_name=None):
+        """Return the strategies of a module, with the planned one first.
+
+        The rest of the strategies are kept as fallback if the planned one
+        doesn't accept the input any more."""
+
+        strategies = strategies_module.get_strategies()
+
+        if planned_name:
+            planned = [strategy for strategy in strategies
+                       if strategy.__name__ == planned_name]
+            others = [strategy for strategy in strategies
+                      if strategy.__name__ != planned_name]
+            return planned + others
+
+        return strategies
+
+    @classmethod
+    def _build_data_frame(cls, period_range, columns, data):
+        """Build a data frame with the values of series sharing a period range.
+
+        Values are written straight into a float64 block with a column for
+        each series, that is used by the data frame without copying it.
+
+        Args:
+            period_range (DatetimeIndex): Period range of the series.
+            columns (list): Names of the series.
+            data (list): Lists of values of each series.
+        """
+
+        num_values = len(data[0]) if data else len(period_range)
+        index = cls._data_frame_index(period_range, num_values)
+
+        # fortran order makes each column contiguous, as the data frame block
+        values = np.empty((len(index), len(columns)), dtype=np.float64,
+                          order="F")
+        for i_col, (name, series_values) in enumerate(zip(columns, data)):
+            if len(series_values) != len(index):
+                msg = "{} has {} values but its period range has {}".format(
+                    repr(name), len(series_values), len(index))
+                raise ValueError(msg)
+
+            values[:, i_col] = series_values
+
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+    @classmethod
+    def _build_long_data_frame(cls, dfs_inputs):
+        """Build a data frame with a record for each observed value.
+
+        Args:
+            dfs_inputs (list): Dicts with the period range, the names of the
+                series sharing it and their values.
+
+        Returns:
+            DataFrame: Columns series_name, frequency, period and value.
+                Missing values are not included.
+        """
+
+        names, freqs, periods, values = [], [], [], []
+        for df_inputs in dfs_inputs:
+            for name, series_values in zip(df_inputs["columns"],
+                                           df_inputs["data"]):
+                index = cls._data_frame_index(df_inputs["period_range"],
+                                              len(series_values))
+                if len(series_values) != len(index):
+                    msg = "{} has {} values but its period range has {}"
+                    raise ValueError(
+                        msg.format(repr(name), len(series_values), len(index)))
+
+                freq = index.freqstr
+                if isinstance(index, pd.PeriodIndex):
+                    index = index.to_timestamp()
+
+                series_values = np.asarray(series_values, dtype=np.float64)
+                observed = ~np.isnan(series_values)
+
+                names.append(np.repeat(name, observed.sum()))
+                freqs.append(np.repeat(freq, observed.sum()))
+                periods.append(index.values[observed])
+                values.append(series_values[observed])
+
+        if not values:
+            names = freqs = periods = values = [np.array([])]
+
+        return pd.DataFrame({
+            "series_name": pd.Categorical(np.concatenate(names)),
+            "frequency": pd.Categorical(np.concatenate(freqs)),
+            "period": np.concatenate(periods).astype("datetime64[ns]"),
+            "value": np.concatenate(values)
+        })
+
+    @classmethod
+    def _data_frame_index(cls, period_range, num_values):
+        """Return the index for a period range with a number of values.
+
+        Daily series that skip weekends and holidays have fewer values than
+        calendar days in their period range, they are indexed in business
+        days."""
+
+        if period_range.freqstr == "D" and num_values != len(period_range):
+            pr = period_range
+            ini_date = "{}-{}-{}".format(pr[0].year, pr[0].month, pr[0].day)
+            end_date = "{}-{}-{}".format(pr[-1].year, pr[-1].month,
+                                         pr[-1].day)
+
+            return pd.period_range(ini_date, end_date, freq="B")
+
+        return period_range
 
-    # auxiliar methods
     @staticmethod
     def _hash_period_range(period_range):
         """Returns a tuple describing a period range in a hashable way."""
@@ -342,10 +935,7 @@ Last attempt was:
         attempts = []
         for combination in cls._param_combinations_generator(
                 missings_dict, params.DEFAULT_VALUES, params.LIKELINESS_ORDER):
-            new_params = copy.deepcopy(params)
-
-            for param_name, param_value in combination.items():
-                new_params[param_name] = param_value
+            new_params = params.derive(combination)
 
             msg = repr(new_params) + \
                 " is not complete.\nMissing parameters " + \
@@ -442,20 +1032,63 @@ Last attempt was:
 
     # 2. CLEAN DATA methods
     @classmethod
-    def _clean_time_index(cls, ws, params):
+    def _clean_time_index(cls, ws, params, plan=None, last_time=None):
         """Clean time index from strings, typos and errors.
 
         Modify ws changing cell values in the time index for the correspondent
-        time value in datetime.datetime format."""
+        time value in datetime.datetime format.
+
+        Args:
+            plan (ParsePlan): Plan with the strategies to use first, if any.
+            last_time (arrow.Arrow): Time value preceding data_starts, if the
+                time index is cleaned starting in the middle of it.
+        """
 
-        for cleaner in clean_ti_strategies.get_strategies():
+        if plan:
+            cleaner_name, parser_name = plan.get_clean_ti(
+                params["time_header_coord"])
+        else:
+            cleaner_name, parser_name = None, None
+
+        for cleaner in cls._strategies_to_try(clean_ti_strategies,
+                                              cleaner_name):
             if cleaner.accepts(ws, params):
-                cleaner_obj = cleaner()
-                return cleaner_obj.clean_time_index(ws, params)
+                cleaner_obj = cleaner(
+                    cls._planned_time_parser(parser_name, cleaner_name,
+                                             cleaner), last_time)
+                wall_start = time.perf_counter()
+                with instrumentation.stage("clean_time_index"):
+                    end = cleaner_obj.clean_time_index(ws, params)
+
+                if plan:
+                    plan.record_clean_ti(params["time_header_coord"],
+                                         cleaner_obj)
+                if instrumentation.tracing():
+                    instrumentation.trace(
+                        "clean_time_index",
+                        time_header_coord=params["time_header_coord"],
+                        strategy=cleaner.__name__,
+                        parse_time=(
+                            cleaner_obj.time_parser.__class__.__name__
+                            if cleaner_obj.time_parser else None),
+                        end=end, wall_time=time.perf_counter() - wall_start)
+                return end
 
         msg = "Time index in '" + ws.title + "'' could not be cleaned."
         raise TimeIndexNotClean(msg)
 
+    @classmethod
+    def _planned_time_parser(cls, parser_name, cleaner_name, cleaner):
+        """Return the parse time strategy object planned for a cleaner, if
+        the cleaner is the planned one."""
+
+        if parser_name and cleaner.__name__ == cleaner_name:
+            for parser in parse_time_strategies.get_strategies():
+                if parser.__name__ == parser_name:
+                    return parser()
+
+        return None
+
     @classmethod
     def _clean_values(cls, ws):
         """TODO: This method should clean the missing values, instead of
@@ -464,12 +1097,14 @@ Last attempt was:
 
     # 3. GET DATA methods
     @classmethod
-    def _get_period_ranges(cls, ws, params):
+    def _get_period_ranges(cls, ws, params, prs_cache=None):
         """Get period ranges for all series in the worksheet.
 
         Args:
             ws (Worksheet): A clean worksheet with time values in its time
                 index.
+            prs_cache (dict): Period ranges already computed for each time
+                index, to be reused by series sharing the same one.
             freq (str): Frequency (Y, Q, M, D, YQQQQ...).
             ini (int): Row or column where data starts.
             time_header_coord (str): Coordinate of the first cell that would be
@@ -492,19 +1127,20 @@ Last attempt was:
             assert end_row and end_row > ini_row, msg
 
             # if time is multicolumn, pass only the first column
-            if params.time_multicolumn and type(time_header_coord) == list:
+            if (params.time_multicolumn
+                    and isinstance(time_header_coord, (list, tuple))):
                 time_header_coord_single = time_header_coord[0]
             else:
                 time_header_coord_single = time_header_coord
 
-            for pr in cls._get_series_prs(ws, freq, ini_row,
-                                          time_header_coord_single, end_row,
-                                          time_alignement, alignment):
+            for pr in cls._get_series_prs(
+                    ws, freq, ini_row, time_header_coord_single, end_row,
+                    time_alignement, alignment, prs_cache):
                 yield pr
 
     @classmethod
     def _get_series_prs(cls, ws, freq, ini_row, time_header_coord, end_row,
-                        time_alignement, alignment):
+                        time_alignement, alignment, prs_cache=None):
         """Get the period ranges of one time index.
 
         In single frequency series this would be just one period range. In
@@ -523,22 +1159,34 @@ Last attempt was:
             time_alignement (int): Indicates if data runs parallel to the time
                 index or is offset (-1, 0 or 1).
             alignment (str): "vertical" or "horizontal" series.
+            prs_cache (dict): Period ranges already computed for each time
+                index, to be reused by series sharing the same one.
         """
 
+        key = (plan_caches.ParsePlan.time_index_key(time_header_coord), freq,
+               ini_row, end_row, time_alignement, alignment)
+        if prs_cache is not None and key in prs_cache:
+            return prs_cache[key]
+
         for strategy in get_pr_strategies.get_strategies():
             if strategy.accepts(ws, freq):
-                return strategy.get_period_ranges(ws, freq, ini_row,
-                                                  time_header_coord, end_row,
-                                                  time_alignement, alignment)
+                with instrumentation.stage("period_ranges"):
+                    prs = strategy.get_period_ranges(
+                        ws, freq, ini_row, time_header_coord, end_row,
+                        time_alignement, alignment)
+                if prs_cache is not None:
+                    prs_cache[key] = prs
+
+                return prs
 
         msg = " ".join([
             "There is no strategy to get period range for", "\nFrequency:",
             freq, "\nTime header coord:", time_header_coord
         ])
-        raise Exception(msg)
+        raise NoStrategyAccepts(msg)
 
     @classmethod
-    def _add_name(cls, name, columns, index=1):
+    def _add_name(cls, name, columns, registry=None):
         """Add a new name to the data frame columns.
 
         If name is repeated, and index number is added an incremented until the
@@ -547,12 +1195,24 @@ Last attempt was:
         Args:
             name (str): Field name.
             columns (list): Fields of the data frame.
-            index (int): Index number for repeated fields.
+            registry (dict): Names already in columns, with the next index to
+                try if they are repeated. It is updated with the new name, so
+                the same registry has to be passed every time with columns.
+                If not passed, it is built from columns.
         """
-        if cls._indexed_name(name, index) not in columns:
-            columns.append(cls._indexed_name(name, index))
-        else:
-            cls._add_name(name, columns, index + 1)
+
+        if registry is None:
+            registry = {column: 2 for column in columns}
+
+        # every index before the registered one is already taken
+        index = registry.get(name, 1)
+        while cls._indexed_name(name, index) in registry:
+            index += 1
+
+        indexed_name = cls._indexed_name(name, index)
+        registry[indexed_name] = 2
+        registry[name] = index + 1
+        columns.append(indexed_name)
 
     @classmethod
     def _indexed_name(cls, name, index):
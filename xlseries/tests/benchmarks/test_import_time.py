@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_import_time
+----------------------------------
+
+Tests for `import_time` module.
+"""
+
+import unittest
+import nose
+
+from xlseries.benchmarks import import_time
+
+
+class ImportTimeTestCase(unittest.TestCase):
+
+    def test_import_xlseries_is_light(self):
+        """Heavy dependencies are only imported when they are used."""
+
+        for statement in ["import xlseries", "from xlseries import XlSeries"]:
+            measure = import_time.measure_statement(statement)
+            self.assertEqual(measure["heavy_modules"], [])
+
+        # strategies are imported when the first data frames are scraped
+        measure = import_time.measure_statement(
+            "from openpyxl import Workbook; from xlseries import XlSeries; " +
+            "XlSeries(Workbook())")
+        self.assertNotIn("xlseries.strategies.strategies",
+                         measure["heavy_modules"])
+
+    def test_parse_importtime(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 | site",
+            import_time.MARKER,
+            "import time:       200 |        200 |   numpy.core",
+            "import time:       300 |        500 | numpy",
+            "import time:       400 |       1400 | xlseries"])
+
+        self.assertEqual(import_time.parse_importtime(stderr),
+                         [("numpy", 0.0005), ("xlseries", 0.0014)])
+
+    def test_run(self):
+        results = import_time.run(names=["import_xlseries"], repeat=1)
+        result = results["results"]["import/import_xlseries"]
+
+        self.assertEqual(result["statement"], "import xlseries")
+        self.assertEqual(len(result["times"]), 1)
+        self.assertEqual(result["heavy_modules"], [])
+
+        with self.assertRaises(ValueError):
+            import_time.run(names=["import_nothing"])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
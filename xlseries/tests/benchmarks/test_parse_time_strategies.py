@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_parse_time_strategies
+----------------------------------
+
+Tests for `parse_time_strategies` module.
+"""
+
+import unittest
+import nose
+import arrow
+
+from xlseries.benchmarks import parse_time_strategies
+from xlseries.strategies.clean import parse_time
+
+
+class ParseTimeStrategiesBenchmarkTestCase(unittest.TestCase):
+
+    def test_doctest_strings(self):
+        self.assertEqual(
+            parse_time_strategies.doctest_strings(
+                parse_time.ParseComposedQuarter3),
+            ["III 01", "IV 01", "I 02", "II 02"])
+        self.assertEqual(parse_time_strategies.doctest_strings(
+            parse_time.ParseSimpleTime), [])
+
+    def test_sequence_corpus(self):
+        params = {"time_composed": True, "frequency": "Q"}
+        corpus = parse_time_strategies.sequence_corpus(
+            parse_time.ParseComposedQuarter3, params,
+            ["III 01", "not a quarter 123", "IV 01", "I 02"])
+
+        self.assertEqual([time_value for _, time_value, _ in corpus],
+                         ["III 01", "IV 01", "I 02"])
+        self.assertEqual([last_time for _, _, last_time in corpus],
+                         [None, arrow.get(2001, 7, 1),
+                          arrow.get(2001, 10, 1)])
+
+    def test_scale_corpus(self):
+        self.assertEqual(parse_time_strategies.scale_corpus([1, 2, 3], 7),
+                         [1, 2, 3, 1, 2, 3, 1])
+        self.assertEqual(parse_time_strategies.scale_corpus([], 7), [])
+
+    def test_run(self):
+        results = parse_time_strategies.run(
+            names=["ParseComposedQuarter3", "ParseSimpleTime"],
+            sources=["doctest"], size=20, repeat=2, min_time=0.05)
+
+        for operation in parse_time_strategies.OPERATIONS:
+            key = "parse_time.{}/ParseComposedQuarter3".format(operation)
+            result = results["results"][key]
+            self.assertEqual(result["corpus_size"], 4)
+            self.assertEqual(len(result["times"]), 2)
+            self.assertAlmostEqual(result["rate"], 1.0 / result["min"])
+
+            # there are no doctest examples of ParseSimpleTime
+            self.assertIn("parse_time.{}/ParseSimpleTime".format(operation),
+                          results["skipped"])
+
+        self.assertIn("ParseComposedQuarter3",
+                      parse_time_strategies.format_results(results))
+
+        with self.assertRaises(ValueError):
+            parse_time_strategies.run(names=["ParseNothing"])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
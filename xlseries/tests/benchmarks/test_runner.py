@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_runner
+----------------------------------
+
+Tests for `runner` module.
+"""
+
+import unittest
+import nose
+import os
+import shutil
+import tempfile
+
+from xlseries.benchmarks import runner
+
+
+class BenchmarksRunnerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_run_pipeline_benchmarks(self):
+        keys = []
+        results = runner.run(sizes=["tiny"], repeat=2,
+                             callback=lambda key, result, reason:
+                             keys.append(key))
+
+        self.assertEqual(len(keys), 2 * len(runner.BENCHMARKS))
+        for name in ["get_data_frames", "make_wb_copy", "clean_time_index",
+                     "parse_time", "get_values", "get_period_ranges"]:
+            for alignment in runner.ALIGNMENTS:
+                key = "{}/tiny-{}".format(name, alignment)
+                self.assertIn(key, results["results"])
+                self.assertEqual(len(results["results"][key]["times"]), 2)
+                self.assertLessEqual(results["results"][key]["min"],
+                                     results["results"][key]["median"])
+
+        # without xlwt, the xls benchmarks are skipped with the reason
+        for key in results["skipped"]:
+            self.assertTrue(key.startswith("open_xls_as_xlsx/"))
+
+    def test_run_unknown_benchmark_or_size(self):
+        with self.assertRaises(ValueError):
+            runner.run(names=["not_a_benchmark"], sizes=["tiny"])
+        with self.assertRaises(ValueError):
+            runner.run(names=["make_wb_copy"], sizes=["huge"])
+
+    def test_compare(self):
+        baseline = {"results": {
+            "a/tiny-vertical": {"min": 1.0, "median": 1.0, "mean": 1.0},
+            "b/tiny-vertical": {"min": 1.0, "median": 1.0, "mean": 1.0},
+            "c/tiny-vertical": {"min": 1.0, "median": 1.0, "mean": 1.0}}}
+        results = {"results": {
+            "a/tiny-vertical": {"min": 1.1, "median": 1.5, "mean": 1.5},
+            "b/tiny-vertical": {"min": 1.3, "median": 1.3, "mean": 1.3},
+            "d/tiny-vertical": {"min": 9.0, "median": 9.0, "mean": 9.0}}}
+
+        comparisons = runner.compare(results, baseline, threshold=0.2)
+        self.assertEqual([(comp["key"], comp["regression"])
+                          for comp in comparisons],
+                         [("a/tiny-vertical", False),
+                          ("b/tiny-vertical", True)])
+
+        comparisons = runner.compare(results, baseline, threshold=0.2,
+                                     stat="median")
+        self.assertTrue(all(comp["regression"] for comp in comparisons))
+
+        comparisons = runner.compare(results, baseline, threshold=0.5)
+        self.assertFalse(any(comp["regression"] for comp in comparisons))
+
+        with self.assertRaises(ValueError):
+            runner.compare(results, baseline, stat="max")
+
+    def test_main_with_baseline(self):
+        baseline_path = os.path.join(self.output_dir, "baseline.json")
+        args = ["run", "--benchmarks", "make_wb_copy,get_period_ranges",
+                "--sizes", "tiny", "--alignments", "vertical", "--repeat",
+                "1"]
+
+        self.assertEqual(runner.main(args + ["--output", baseline_path]), 0)
+        baseline = runner.load_results(baseline_path)
+        self.assertEqual(list(baseline["results"]),
+                         ["make_wb_copy/tiny-vertical",
+                          "get_period_ranges/tiny-vertical"])
+
+        # make the baseline impossibly fast, every benchmark regresses
+        for result in baseline["results"].values():
+            result["min"] = result["min"] / 100.0
+        runner.save_results(baseline, baseline_path)
+
+        self.assertEqual(runner.main(args + ["--baseline", baseline_path]),
+                         1)
+        self.assertEqual(runner.main(["compare", baseline_path,
+                                      baseline_path]), 0)
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -28,6 +28,7 @@ from xlseries.strategies.clean.parse_time import ParseComposedMonth1
 from xlseries.strategies.clean.parse_time import ParseComposedMonth2
 from xlseries.strategies.clean.parse_time import ParseSimpleTime
 from xlseries.strategies.clean.parse_time import NoTimeValue
+from xlseries.strategies.clean import parse_time
 from xlseries.utils.case_loaders import load_parameters_case
 from xlseries.utils.path_finders import abs_path
 
@@ -333,6 +334,31 @@ class ParseComposedTimeTest(unittest.TestCase):
         self.run_parse_time_case(case_num, ParseComposedSemester, True)
 
 
+class GrammarsTest(unittest.TestCase):
+
+    def test_grammars_are_compiled_once(self):
+        parse_time._GRAMMARS.clear()
+        with patch.object(ParseComposedQuarter1, "make_parsley_grammar",
+                          wraps=ParseComposedQuarter1.make_parsley_grammar
+                          ) as make_grammar:
+            params = {"time_composed": True, "frequency": "Q"}
+            for value in ["1986    1º trim.", "            2º trim."]:
+                ParseComposedQuarter1.accepts(params, value)
+                ParseComposedQuarter1().parse_time(params, value)
+
+        self.assertEqual(make_grammar.call_count, 1)
+
+    def test_load_grammars(self):
+        parse_time._GRAMMARS.clear()
+        parse_time.load_grammars()
+
+        self.assertIn(ParseComposedMonth2, parse_time._GRAMMARS)
+        self.assertNotIn(ParseSimpleTime, parse_time._GRAMMARS)
+        # subclasses with their own grammar don't share it
+        self.assertIsNot(parse_time.get_grammar(ParseComposedYearQuarter1),
+                         parse_time.get_grammar(ParseComposedQuarterYear1))
+
+
 if __name__ == '__main__':
     nose.run(defaultTest=__name__)
     # unittest.main()
@@ -8,7 +8,9 @@ import json
 from functools import wraps
 from openpyxl import Workbook
 
+import pickle
 from xlseries.strategies.discover.parameters import Parameters
+from xlseries.strategies.discover.parameters import SeriesParameters
 from xlseries.strategies.discover.parameters import InvalidParameter
 from xlseries.strategies.discover.parameters import CriticalParameterMissing
 from xlseries.utils.case_loaders import load_critical_parameters_case
@@ -69,7 +71,104 @@ class ParametersTest(unittest.TestCase):
         self.assertEqual(params["time_header_coord"],
                          [["A1", "A2"], ["A1", "A2"], ["A1", "A2"]])
 
-        self.assertEqual(params[0]["time_header_coord"], ["A1", "A2"])
+        self.assertEqual(params[0]["time_header_coord"], ("A1", "A2"))
+
+    def test_derive(self):
+        derived = self.params.derive({"missings": True, "blank_rows": True})
+
+        self.assertEqual(derived.missings, [True, True, True])
+        self.assertEqual(derived.blank_rows, [True, True, True])
+        self.assertEqual(self.params.blank_rows, [False, False, False])
+
+        # values not changed are shared, not copied
+        self.assertIs(derived.headers_coord, self.params.headers_coord)
+
+        with self.assertRaises(InvalidParameter):
+            self.params.derive({"missings": "yes"})
+
+    def test_select_series(self):
+        headers_coord = list(self.params.headers_coord)
+        selected = self.params.select_series([2, 0])
+
+        self.assertEqual(len(selected), 2)
+        self.assertEqual(selected.headers_coord,
+                         [headers_coord[2], headers_coord[0]])
+        self.assertEqual(self.params.headers_coord, headers_coord)
+
+    def test_series_params_record(self):
+        series_params = self.params[0]
+
+        self.assertIsInstance(series_params, SeriesParameters)
+        self.assertEqual(series_params.frequency, series_params["frequency"])
+        self.assertEqual(series_params.data_starts,
+                         self.params.data_starts[0])
+
+        with self.assertRaises(AttributeError):
+            series_params.frequency = "Q"
+
+        # the record doesn't share mutable values with the parameters
+        self.params.time_header_coord[0] = "Z1"
+        self.assertNotEqual(series_params.time_header_coord, "Z1")
+
+    def test_series_params_missing_values(self):
+        self.params.remove("continuity")
+        series_params = self.params[0]
+
+        self.assertNotIn("continuity", series_params)
+        self.assertIn("frequency", series_params)
+        with self.assertRaises(KeyError):
+            series_params["continuity"]
+
+    def test_series_params_records(self):
+        records = self.params.get_series_records()
+
+        self.assertEqual(len(records), 3)
+        self.assertIs(self.params[0], records[0])
+        self.assertEqual(pickle.loads(pickle.dumps(records[0])), records[0])
+        self.assertEqual(
+            SeriesParameters.coerce(records[0].to_dict()), records[0])
+
+    def test_series_params_hashable(self):
+        records = self.params.get_series_records()
+
+        self.assertEqual(hash(records[0]), hash(
+            SeriesParameters.coerce(records[0].to_dict())))
+        self.assertEqual({records[0]: 1}[self.params[0]], 1)
+        self.assertEqual(len({records[0], records[1], records[0]}), 2)
+
+        # list values are frozen, so the hash can't change
+        series_params = SeriesParameters({"time_header_coord": ["A1", "B1"],
+                                          "continuity": True})
+        self.assertEqual(series_params.time_header_coord, ("A1", "B1"))
+        self.assertEqual(series_params, {"time_header_coord": ["A1", "B1"],
+                                         "continuity": True})
+        cache = {series_params: "cached"}
+        self.assertEqual(cache[SeriesParameters(
+            {"continuity": True, "time_header_coord": ("A1", "B1")})],
+            "cached")
+
+    def test_series_records_are_rebuilt_when_params_change(self):
+        records = self.params.get_series_records()
+
+        self.params["data_ends"] = 100
+        self.assertEqual(self.params[0].data_ends, 100)
+        self.assertNotEqual(records[0].data_ends, 100)
+
+        self.params.frequency = ["Q", "Q", "Q"]
+        self.assertEqual(self.params[1].frequency, "Q")
+
+        self.params.remove("continuity")
+        self.assertNotIn("continuity", self.params[2])
+
+        self.params.remove_series(0)
+        self.assertEqual(len(self.params.get_series_records()), 2)
+
+        derived = self.params.derive({"data_starts": 3})
+        self.assertEqual(derived[0].data_starts, 3)
+        self.assertNotEqual(self.params[0].data_starts, 3)
+
+        copied = pickle.loads(pickle.dumps(self.params))
+        self.assertEqual(copied[0], self.params[0])
 
     def test_valid_param_value(self):
         self.assertTrue(self.params._valid_param_value(True, [True, False]))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_plan_cache
+
+Tests for `plan_cache` module.
+"""
+
+import unittest
+import nose
+import os
+import json
+import shutil
+import tempfile
+import mock
+
+from xlseries import XlSeries
+from xlseries.strategies.discover.parameters import Parameters
+from xlseries.strategies.discover.plan_cache import PlanCache, ParsePlan
+from xlseries.strategies.strategies import ParameterDiscovery
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_param_cases_path
+
+
+class PlanCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = PlanCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_fingerprint_ignores_new_rows(self):
+        ws = load_original_case(1).active
+        params = Parameters(get_param_cases_path(1))
+        fingerprint = self.cache.fingerprint(ws, params)
+
+        new_row = ws.max_row + 1
+        ws.cell(row=new_row, column=1).value = "2015-01-01"
+        ws.cell(row=new_row, column=2).value = 1.0
+        ws.cell(row=new_row, column=3).value = 2.0
+
+        self.assertEqual(self.cache.fingerprint(ws, params), fingerprint)
+
+    def test_fingerprint_changes_with_headers(self):
+        ws = load_original_case(1).active
+        params = Parameters(get_param_cases_path(1))
+        fingerprint = self.cache.fingerprint(ws, params)
+
+        ws["B1"].value = "A different header"
+
+        self.assertNotEqual(self.cache.fingerprint(ws, params), fingerprint)
+
+    def test_put_and_get(self):
+        plan = ParsePlan({"frequency": ["M"]}, {'"A1"': "CleanTi"},
+                         {'"A1"': "ParseSimpleTime"}, ["GetData"])
+        self.cache.put("fingerprint", plan)
+
+        cached_plan = self.cache.get("fingerprint")
+        self.assertEqual(cached_plan.to_dict(), plan.to_dict())
+
+        self.cache.discard("fingerprint")
+        self.assertIsNone(self.cache.get("fingerprint"))
+
+    def test_cached_plan_skips_discovery(self):
+        with open(get_param_cases_path(3)) as f:
+            params = json.load(f)
+        del params["continuity"]
+        del params["blank_rows"]
+
+        exp_df = XlSeries(load_original_case(3)).get_data_frames(
+            params, plan_cache=self.cache)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        with mock.patch.object(ParameterDiscovery, "_discover_parameters",
+                               side_effect=AssertionError("discovery")):
+            df = XlSeries(load_original_case(3)).get_data_frames(
+                params, plan_cache=self.cache_dir)
+
+        self.assertTrue(df.equals(exp_df))
+
+    def test_stale_plan_is_replaced(self):
+        params = Parameters(get_param_cases_path(1))
+        exp_df = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1), plan_cache=self.cache)
+
+        # corrupt the stored plan so it can't scrape the file any more
+        fingerprint = self.cache.fingerprint(load_original_case(1).active,
+                                             params)
+        plan = self.cache.get(fingerprint)
+        plan.params["frequency"] = ["Q", "Q"]
+        self.cache.put(fingerprint, plan)
+
+        df = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1), plan_cache=self.cache)
+
+        self.assertTrue(df.equals(exp_df))
+        self.assertEqual(
+            self.cache.get(fingerprint).params["frequency"], ["M", "M"])
+
+    def test_stale_plan_without_workbook_copy(self):
+        """A plan failing on the workbook itself doesn't leave it changed."""
+
+        params = Parameters(get_param_cases_path(5))
+        exp_df = XlSeries(load_original_case(5)).get_data_frames(
+            get_param_cases_path(5), plan_cache=self.cache)
+
+        fingerprint = self.cache.fingerprint(load_original_case(5).active,
+                                             params)
+        plan = self.cache.get(fingerprint)
+        plan.params["frequency"] = ["Q"] * len(plan.params["frequency"])
+        self.cache.put(fingerprint, plan)
+
+        df = XlSeries(load_original_case(5)).get_data_frames(
+            get_param_cases_path(5), plan_cache=self.cache,
+            preserve_wb_obj=False)
+
+        self.assertTrue(df.equals(exp_df))
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
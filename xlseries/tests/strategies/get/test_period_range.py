@@ -144,6 +144,26 @@ class GetPeriodRangesMultifrequencyTestCase(unittest.TestCase):
         self.assertTrue(compare_period_ranges(pr_y, prs[0]))
         self.assertTrue(compare_period_ranges(pr_q, prs[1]))
 
+    def test_get_period_ranges_reads_only_needed_cells(self):
+        wb = Workbook()
+        ws = wb.active
+        for row, (year, month) in enumerate([(2000, 1), (2000, 1), (2000, 4),
+                                             (2000, 7), (2000, 10), (2001, 1),
+                                             (2001, 1), (2001, 4)], 1):
+            ws.cell(row=row, column=1).value = arrow.get(year, month,
+                                                         1).datetime
+        ws["Z5000"] = "far away value"
+        num_cells = len(ws._cells)
+
+        prs = GetPeriodRangesMultifrequency.get_period_ranges(
+            ws, "AQQQQ", 1, "A1", 8, 0, "vertical")
+
+        # no cells are created reading the whole worksheet
+        self.assertEqual(len(ws._cells), num_cells)
+        self.assertTrue(compare_period_ranges(
+            pd.date_range("20000101", "20010101", freq="AS"), prs[0]))
+        self.assertTrue(compare_period_ranges(
+            pd.date_range("20000101", "20010401", freq="QS"), prs[1]))
 
 if __name__ == '__main__':
     nose.run(defaultTest=__name__)
@@ -8,7 +8,13 @@ Tests for `strategies` module.
 
 import unittest
 import nose
+import json
+import re
+import mock
+import arrow
+from openpyxl import Workbook
 import pandas as pd
+import numpy as np
 from functools import wraps
 
 from xlseries.strategies.discover.parameters import Parameters
@@ -18,6 +24,11 @@ from xlseries.utils.case_loaders import load_expected_case
 from xlseries.utils.data_frame import compare_period_ranges
 from xlseries.utils.data_frame import compare_data_frames
 from xlseries.strategies.strategies import ParameterDiscovery
+import xlseries.strategies.get.period_range as get_pr_strategies
+from xlseries.strategies.strategies import IncrementalUpdateError
+from xlseries.strategies.strategies import NoSeriesSelected
+from xlseries.utils.path_finders import get_param_cases_path
+from xlseries import XlSeries
 
 
 # @unittest.skip("skip")
@@ -40,6 +51,65 @@ class ParameterDiscoveryTestCase(unittest.TestCase):
         self.assertTrue(compare_period_ranges(pr_d, period_ranges[0]))
         self.assertTrue(compare_period_ranges(pr_m, period_ranges[1]))
 
+    def test_get_series_prs_cached(self):
+        ws = Workbook().active
+        for row, month in enumerate([1, 4, 7, 10], 2):
+            ws.cell(row=row, column=1).value = arrow.get(2000, month,
+                                                         1).datetime
+        prs_cache = {}
+
+        prs = ParameterDiscovery._get_series_prs(
+            ws, "Q", 2, "A1", 5, 0, "vertical", prs_cache)
+
+        with mock.patch.object(get_pr_strategies,
+                               "get_strategies",
+                               side_effect=AssertionError("not cached")):
+            cached_prs = ParameterDiscovery._get_series_prs(
+                ws, "Q", 2, "A1", 5, 0, "vertical", prs_cache)
+
+        self.assertIs(cached_prs, prs)
+        self.assertEqual(len(prs[0]), 4)
+
+    def test_build_data_frame(self):
+        pr = pd.date_range("20000101", "20001001", freq="QS")
+        df = ParameterDiscovery._build_data_frame(
+            pr, ["a", "b"], [[1, 2, 3, 4], [5.0, float("nan"), 7.0, 8.0]])
+
+        self.assertEqual(list(df.dtypes), [np.float64, np.float64])
+        self.assertTrue(compare_period_ranges(pr, df.index))
+        self.assertEqual(list(df["a"]), [1.0, 2.0, 3.0, 4.0])
+        self.assertTrue(np.isnan(df["b"].iloc[1]))
+
+        with self.assertRaises(ValueError):
+            ParameterDiscovery._build_data_frame(pr, ["a"], [[1, 2, 3]])
+
+    def test_build_data_frame_business_days(self):
+        # from monday 2015-06-01 to friday 2015-06-12
+        pr = pd.date_range("20150601", "20150612", freq="D")
+
+        df = ParameterDiscovery._build_data_frame(pr, ["a"], [range(10)])
+        self.assertEqual(df.index.freqstr, "B")
+
+        df = ParameterDiscovery._build_data_frame(pr, ["a"], [range(12)])
+        self.assertEqual(df.index.freqstr, "D")
+
+    def test_add_name(self):
+        columns, registry = [], {}
+        for name in ["Total", "Total", "Total.3", "Total", "Total", "Other"]:
+            ParameterDiscovery._add_name(name, columns, registry)
+
+        self.assertEqual(columns, ["Total", "Total.2", "Total.3", "Total.4",
+                                   "Total.5", "Other"])
+
+        # many repeated names don't recurse
+        for i in range(5000):
+            ParameterDiscovery._add_name("Total", columns, registry)
+        self.assertEqual(columns[-1], "Total.5005")
+
+        # without a registry, names already in columns are taken into account
+        ParameterDiscovery._add_name("Other", columns)
+        self.assertEqual(columns[-1], "Other.2")
+
     def test_generate_attempts(self):
         params = Parameters({
             "alignment": "vertical",
@@ -186,6 +256,154 @@ class ParameterDiscoveryTestCase(unittest.TestCase):
             self.assertIn(comb_with_def, no_def)
 
 
+class LongOutputTestCase(unittest.TestCase):
+
+    def test_long_output(self):
+        for case_num in [1, 2, 6]:
+            wide_dfs = XlSeries(load_original_case(case_num)).get_data_frames(
+                get_param_cases_path(case_num))
+            if type(wide_dfs) != list:
+                wide_dfs = [wide_dfs]
+
+            df = XlSeries(load_original_case(case_num)).get_data_frames(
+                get_param_cases_path(case_num), output="long")
+
+            self.assertEqual(list(df.columns),
+                             ["series_name", "frequency", "period", "value"])
+            self.assertFalse(df["value"].isnull().any())
+
+            # every observed value of the wide data frames is a record
+            self.assertEqual(len(df),
+                             sum(wide_df.count().sum() for wide_df in wide_dfs))
+            for wide_df in wide_dfs:
+                for name in wide_df.columns:
+                    series = wide_df[name].dropna()
+                    records = df[(df["series_name"] == name) &
+                                 (df["frequency"] == wide_df.index.freqstr)]
+                    self.assertEqual(list(records["value"]), list(series))
+
+    def test_long_output_metadata(self):
+        df = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1), output="long")
+
+        self.assertEqual(df.attrs["worksheet"], "Hoja1")
+        self.assertEqual(str(df["period"].dtype), "datetime64[ns]")
+        self.assertEqual(str(df["value"].dtype), "float64")
+
+        with self.assertRaises(ValueError):
+            XlSeries(load_original_case(1)).get_data_frames(
+                get_param_cases_path(1), output="tall")
+
+    def test_long_output_keeps_only_observed_values(self):
+        pr = pd.date_range("20000101", "20001001", freq="QS")
+        df = ParameterDiscovery._build_long_data_frame([{
+            "period_range": pr,
+            "columns": ["a", "b"],
+            "data": [[1.0, np.nan, 3.0, 4.0], [np.nan, np.nan, 7.0, np.nan]]
+        }])
+
+        self.assertEqual(list(df["series_name"]), ["a", "a", "a", "b"])
+        self.assertEqual(list(df["value"]), [1.0, 3.0, 4.0, 7.0])
+        self.assertEqual(list(df["period"]), [pr[0], pr[2], pr[3], pr[2]])
+        self.assertEqual(set(df["frequency"]), {"QS-JAN"})
+
+
+class SelectSeriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.exp_df = XlSeries(load_original_case(7)).get_data_frames(
+            get_param_cases_path(7))
+
+    def get_data_frames(self, select):
+        return XlSeries(load_original_case(7)).get_data_frames(
+            get_param_cases_path(7), select=select)
+
+    def test_select_by_name_and_regex(self):
+        df = self.get_data_frames(["Imports FOB", re.compile("^Exports ")])
+
+        self.assertEqual(list(df.columns), ["Exports FOB", "Imports FOB"])
+        self.assertTrue(df.equals(self.exp_df[list(df.columns)]))
+
+    def test_select_with_predicate(self):
+        df = self.get_data_frames(
+            lambda name, header_coord: name == "Credit")
+
+        # repeated names are numbered as when all the series are scraped
+        self.assertEqual(list(df.columns), ["Credit", "Credit.2"])
+        self.assertTrue(df.equals(self.exp_df[["Credit", "Credit.2"]]))
+
+    def test_select_discards_before_cleaning(self):
+        ws = load_original_case(1).active
+        params = Parameters(get_param_cases_path(1))
+
+        with mock.patch.object(ParameterDiscovery, "_clean_data",
+                               side_effect=AssertionError("cleaned")):
+            with self.assertRaises(NoSeriesSelected):
+                ParameterDiscovery._get_data_frames(
+                    ws, params, False, select="Non existent series")
+
+        selected = ParameterDiscovery._select_series(ws, params, "C1")
+        self.assertEqual(selected.headers_coord, ["C1"])
+
+
+class IncrementalUpdateTestCase(unittest.TestCase):
+
+    def _truncated_run(self, case_num, first_new_row):
+        """Scrape a case as if rows from first_new_row were not there yet."""
+
+        with open(get_param_cases_path(case_num)) as f:
+            params = json.load(f)
+        params["data_ends"] = None
+
+        wb = load_original_case(case_num)
+        for row in wb.active.iter_rows(min_row=first_new_row):
+            for cell in row:
+                cell.value = None
+
+        xl = XlSeries(wb)
+        dfs = xl.get_data_frames(params)
+
+        return params, dfs, xl.params[wb.active.title]
+
+    def test_update_appended_rows(self):
+        for case_num, first_new_row in [(1, 200), (3, 100)]:
+            params, old_dfs, old_params = self._truncated_run(
+                case_num, first_new_row)
+            exp_dfs = XlSeries(load_original_case(case_num)).get_data_frames(
+                params)
+
+            xl = XlSeries(load_original_case(case_num))
+            dfs = xl.update_data_frames(old_dfs, old_params)
+
+            self.assertGreater(len(dfs), len(old_dfs))
+            self.assertTrue(dfs.equals(exp_dfs))
+
+    def test_update_only_new_periods(self):
+        params, old_dfs, old_params = self._truncated_run(1, 200)
+
+        new_dfs = XlSeries(load_original_case(1)).update_data_frames(
+            old_dfs, old_params, merge=False)
+
+        self.assertEqual(len(old_dfs) + len(new_dfs), 255)
+        self.assertGreater(new_dfs.index[0], old_dfs.index[-1])
+
+    def test_update_changed_tail(self):
+        params, old_dfs, old_params = self._truncated_run(1, 200)
+
+        wb = load_original_case(1)
+        wb.active.cell(row=198, column=2).value = 123456.0
+
+        with self.assertRaises(IncrementalUpdateError):
+            XlSeries(wb).update_data_frames(old_dfs, old_params)
+
+    def test_update_non_continuous_series(self):
+        params, old_dfs, old_params = self._truncated_run(5, 900)
+
+        with self.assertRaises(IncrementalUpdateError):
+            XlSeries(load_original_case(5)).update_data_frames(
+                old_dfs, old_params)
+
+
 if __name__ == '__main__':
     # unittest.main()
     nose.run(defaultTest=__name__)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_async_xlseries
+----------------------------------
+
+Tests for `async_xlseries` module.
+"""
+
+import unittest
+import nose
+import time
+import shutil
+import asyncio
+import tempfile
+import threading
+
+from xlseries.async_xlseries import AsyncXlSeries
+from xlseries.utils.synthetic_cases import SyntheticCase
+from xlseries.utils.data_frame import compare_data_frames
+
+
+class AsyncXlSeriesTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.case = SyntheticCase(num_periods=30, num_series=2)
+        cls.paths = cls.case.save(cls.directory, "small")
+        cls.big_paths = SyntheticCase(num_periods=3000, num_series=5).save(
+            cls.directory, "big")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_get_data_frames(self):
+        for executor in ["thread", "process"]:
+            async def scrape():
+                async with AsyncXlSeries(executor, max_workers=2) as scraper:
+                    return await scraper.get_data_frames(
+                        self.paths["workbook"], self.paths["params"])
+
+            df = self.run_async(scrape())
+            compare_data_frames(df, self.case.get_expected_data_frames()[0])
+
+    def test_event_loop_is_not_blocked(self):
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def scrape():
+            ticker = asyncio.ensure_future(tick())
+            async with AsyncXlSeries("process", max_workers=1) as scraper:
+                await scraper.get_data_frames(self.big_paths["workbook"],
+                                              self.big_paths["params"])
+            ticker.cancel()
+
+        self.run_async(scrape())
+        self.assertGreater(len(ticks), 10)
+
+    def test_timeout_stops_the_run(self):
+        async def scrape(scraper):
+            wall_start = time.perf_counter()
+            with self.assertRaises(asyncio.TimeoutError):
+                await scraper.get_data_frames(self.big_paths["workbook"],
+                                              self.big_paths["params"],
+                                              timeout=0.3)
+            self.assertLess(time.perf_counter() - wall_start, 1)
+
+            # the run stops at its next stage, freeing the worker
+            for _ in range(50):
+                if scraper._running == 0:
+                    break
+                await asyncio.sleep(0.05)
+            self.assertEqual(scraper._running, 0)
+
+        for executor in ["thread", "process"]:
+            scraper = AsyncXlSeries(executor, max_workers=1)
+            self.run_async(scrape(scraper))
+            scraper.close()
+
+    def test_errors_are_raised(self):
+        async def scrape():
+            async with AsyncXlSeries() as scraper:
+                await scraper.get_data_frames("missing.xlsx",
+                                              self.paths["params"])
+
+        with self.assertRaises(IOError):
+            self.run_async(scrape())
+
+    def test_concurrency_limits(self):
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        def scrape_in_thread(*args):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+
+        async def scrape(scraper, keys):
+            await asyncio.gather(*[
+                scraper.get_data_frames(self.paths["workbook"],
+                                        self.paths["params"], key=key)
+                for key in keys])
+
+        import xlseries.async_xlseries as async_xlseries
+        original_scrape = async_xlseries._scrape
+        async_xlseries._scrape = scrape_in_thread
+        try:
+            for limits, keys, expected_max in [
+                    ({"max_concurrency": 2}, [None] * 6, 2),
+                    ({"max_per_key": 1}, ["a"] * 4, 1),
+                    ({"max_per_key": 1}, ["a", "b", "c", "a"], 3)]:
+                running["max"] = 0
+                scraper = AsyncXlSeries(max_workers=4, **limits)
+                self.run_async(scrape(scraper, keys))
+                scraper.close()
+
+                self.assertEqual(running["max"], expected_max, limits)
+                self.assertEqual(scraper._key_semaphores, {})
+        finally:
+            async_xlseries._scrape = original_scrape
+
+    def test_wrong_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncXlSeries("greenlet")
+        with self.assertRaises(ValueError):
+            AsyncXlSeries(max_concurrency=0)
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_cli
+----------------------------------
+
+Tests for `cli` module.
+"""
+
+import unittest
+import nose
+import os
+import io
+import json
+import shutil
+import tempfile
+import contextlib
+
+import pandas as pd
+
+from xlseries import cli
+from xlseries.utils.synthetic_cases import SyntheticCase
+
+
+class CommandLineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cases = [SyntheticCase(num_periods=30, num_series=2),
+                      SyntheticCase(num_periods=20, num_series=3,
+                                    alignment="horizontal")]
+        self.paths = [case.save(self.directory, "case{}".format(i_case))
+                      for i_case, case in enumerate(self.cases)]
+        self.num_records = 30 * 2 + 20 * 3
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_main(self, args):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            exit_code = cli.main(args)
+        return exit_code, stderr.getvalue()
+
+    def write_manifest(self, name, jobs):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            if name.endswith(".csv"):
+                f.write("path,sheet,params\n")
+                for job in jobs:
+                    f.write("{path},{sheet},{params}\n".format(**job))
+            else:
+                for job in jobs:
+                    f.write(json.dumps(job) + "\n")
+        return path
+
+    def test_manifest_to_csv(self):
+        manifest = self.write_manifest("manifest.csv", [
+            {"path": os.path.basename(paths["workbook"]), "sheet": "",
+             "params": os.path.basename(paths["params"])}
+            for paths in self.paths])
+        output = os.path.join(self.directory, "series.csv")
+
+        exit_code, _ = self.run_main(["--manifest", manifest, "-o", output])
+
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        df = pd.read_csv(output)
+        self.assertEqual(list(df.columns), cli.COLUMNS)
+        self.assertEqual(len(df), self.num_records)
+        self.assertEqual(set(df.source_file),
+                         {paths["workbook"] for paths in self.paths})
+
+    def test_manifest_jsonl_with_inline_params(self):
+        with open(self.paths[0]["params"]) as f:
+            params = json.load(f)
+        manifest = self.write_manifest("manifest.jsonl", [
+            {"path": self.paths[0]["workbook"], "params": params}])
+        output = os.path.join(self.directory, "series.jsonl")
+
+        exit_code, _ = self.run_main(["--manifest", manifest, "-o", output,
+                                      "--quiet"])
+
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 30 * 2)
+        self.assertEqual(sorted(records[0]), sorted(cli.COLUMNS))
+
+    def test_glob_to_parquet_with_workers(self):
+        params = self.cases[0].save(self.directory, "params_only")["params"]
+        output = os.path.join(self.directory, "series.parquet")
+        summary_path = os.path.join(self.directory, "summary.json")
+
+        exit_code, _ = self.run_main([
+            os.path.join(self.directory, "case0.xlsx"),
+            os.path.join(self.directory, "params_only.xlsx"),
+            "--params", params, "-o", output, "--workers", "2",
+            "--summary", summary_path])
+
+        self.assertEqual(exit_code, cli.EXIT_OK)
+        df = pd.read_parquet(output)
+        self.assertEqual(len(df), 2 * 30 * 2)
+        with open(summary_path) as f:
+            summary = json.load(f)
+        self.assertEqual(summary["ok"], 2)
+        self.assertEqual(summary["records"], 2 * 30 * 2)
+
+    def test_failed_jobs(self):
+        manifest = self.write_manifest("manifest.jsonl", [
+            {"path": self.paths[0]["workbook"],
+             "params": self.paths[0]["params"]},
+            {"path": "missing.xlsx", "params": self.paths[0]["params"]}])
+        output = os.path.join(self.directory, "series.csv")
+        summary_path = os.path.join(self.directory, "summary.json")
+
+        exit_code, stderr = self.run_main(["--manifest", manifest, "-o",
+                                           output, "--summary", summary_path])
+
+        self.assertEqual(exit_code, cli.EXIT_FAILED_JOBS)
+        self.assertIn("missing.xlsx", stderr)
+        # records of the files scraped are written anyway
+        self.assertEqual(len(pd.read_csv(output)), 30 * 2)
+        with open(summary_path) as f:
+            summary = json.load(f)
+        self.assertEqual((summary["ok"], summary["failed"]), (1, 1))
+        self.assertTrue(summary["failures"][0][0].endswith("missing.xlsx"))
+
+    def test_usage_errors(self):
+        output = os.path.join(self.directory, "series.csv")
+        manifest = self.write_manifest("manifest.jsonl", [
+            {"path": self.paths[0]["workbook"]}])
+
+        for args in [["-o", output],
+                     [self.paths[0]["workbook"], "-o", output],
+                     ["--manifest", manifest, "-o", output],
+                     [self.paths[0]["workbook"], "--params",
+                      self.paths[0]["params"], "-o", "series.txt"],
+                     [os.path.join(self.directory, "*.xls"), "--params",
+                      self.paths[0]["params"], "-o", output]]:
+            exit_code, stderr = self.run_main(args)
+            self.assertEqual(exit_code, cli.EXIT_USAGE, args)
+            self.assertIn("xlseries: error:", stderr)
+
+    def test_read_manifest_relative_paths(self):
+        manifest = self.write_manifest("manifest.csv", [
+            {"path": "a.xlsx", "sheet": "Sheet1",
+             "params": '"{""alignment"": ""vertical""}"'}])
+
+        jobs = cli.read_manifest(manifest)
+
+        self.assertEqual(jobs, [{
+            "path": os.path.join(self.directory, "a.xlsx"),
+            "sheet": "Sheet1", "params": {"alignment": "vertical"}}])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_server
+----------------------------------
+
+Tests for `server` module.
+"""
+
+import unittest
+import nose
+import json
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from xlseries.server import ScrapingServer
+from xlseries.utils.synthetic_cases import SyntheticCase
+from xlseries.utils.data_frame import compare_data_frames
+
+
+class ScrapingServerTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.case = SyntheticCase(num_periods=30, num_series=2)
+        cls.paths = cls.case.save(cls.directory, "case")
+
+        cls.server = ScrapingServer(("127.0.0.1", 0), workers=2, quiet=True)
+        cls.pids = cls.server.warm_up()
+        threading.Thread(target=cls.server.serve_forever,
+                         daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.directory)
+
+    def request(self, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        try:
+            with urllib.request.urlopen(self.server.url + path,
+                                        data=data) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as inst:
+            return inst.code, json.load(inst)
+
+    def test_warm_up(self):
+        self.assertEqual(len(self.pids), 2)
+
+    def test_scrape(self):
+        status, response = self.request("/scrape", {
+            "path": self.paths["workbook"], "params": self.paths["params"]})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(response["frames"]), 1)
+        frame = response["frames"][0]
+        df = pd.DataFrame(frame["data"], columns=frame["columns"],
+                          index=pd.DatetimeIndex(frame["index"],
+                                                 freq="infer"))
+        compare_data_frames(df, self.case.get_expected_data_frames()[0])
+
+        # the workbook is cached by the worker that loaded it
+        cached = [self.request("/scrape", {
+            "path": self.paths["workbook"], "params": self.case.params,
+            "output": "long"})[1]["cached"] for _ in range(4)]
+        self.assertIn(True, cached)
+
+    def test_failed_scrape(self):
+        status, response = self.request("/scrape", {
+            "path": "missing.xlsx", "params": self.paths["params"]})
+
+        self.assertEqual(status, 422)
+        self.assertIn("missing.xlsx", response["error"])
+
+    def test_bad_requests(self):
+        for body in [{"path": self.paths["workbook"]},
+                     {"path": self.paths["workbook"],
+                      "params": self.paths["params"], "output": "tall"},
+                     []]:
+            status, response = self.request("/scrape", body)
+            self.assertEqual(status, 400, body)
+
+        self.assertEqual(self.request("/other", {})[0], 404)
+
+    def test_health(self):
+        status, response = self.request("/health")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["workers"], 2)
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
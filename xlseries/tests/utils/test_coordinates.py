@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_coordinates
+----------------------------------
+
+Tests for `coordinates` module.
+"""
+
+import unittest
+import nose
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from xlseries.utils.coordinates import parse_coord, format_coord
+from xlseries.utils.coordinates import column_index, column_letter
+from xlseries.utils.coordinates import coords_range, InvalidCoordinate
+
+
+class CoordinatesTest(unittest.TestCase):
+    def test_parse_coord(self):
+        self.assertEqual(parse_coord("A1"), (1, 1))
+        self.assertEqual(parse_coord("AB12"), (12, 28))
+        self.assertEqual(parse_coord("$ab$12"), (12, 28))
+
+        for coord in ["", "12", "A", "A0", "1A", "ABCD1", None]:
+            with self.assertRaises(InvalidCoordinate):
+                parse_coord(coord)
+
+    def test_columns_as_openpyxl(self):
+        for index in [1, 26, 27, 52, 53, 702, 703, 16384]:
+            letter = get_column_letter(index)
+            self.assertEqual(column_letter(index), letter)
+            self.assertEqual(column_index(letter), index)
+            self.assertEqual(column_index_from_string(letter), index)
+
+    def test_format_coord(self):
+        self.assertEqual(format_coord(12, 28), "AB12")
+        self.assertEqual(parse_coord(format_coord(7, 703)), (7, 703))
+
+    def test_coords_range(self):
+        self.assertEqual(coords_range("A1", "B2"), ["A1", "B1", "A2", "B2"])
+        self.assertEqual(coords_range("Z5", "AB5"), ["Z5", "AA5", "AB5"])
+        self.assertEqual(coords_range("A7", "A5"), ["A5", "A6", "A7"])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
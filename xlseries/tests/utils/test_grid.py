@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_grid
+----------------------------------
+
+Tests for `grid` module.
+"""
+
+import unittest
+import nose
+import os
+import csv
+import shutil
+import datetime
+import tempfile
+
+from openpyxl import Workbook
+
+from xlseries import XlSeries
+from xlseries.utils.grid import SheetGrid, GridCache, UnsupportedCellValue
+from xlseries.utils.grid import workbook_to_grids, grids_to_workbook
+from xlseries.utils.grid import csv_to_grid, load_csv_workbook
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_orig_cases_path
+from xlseries.utils.path_finders import get_param_cases_path
+from xlseries.utils.data_frame import compare_data_frames
+
+
+class SheetGridTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Índice"
+        values = {"A1": "Período", "B1": "año 2000", "A2": 1986,
+                  "B2": 1.5e-7, "C2": -2.25, "A3": True, "B3": False,
+                  "C3": datetime.datetime(1986, 3, 1, 12, 30, 5, 250),
+                  "A4": datetime.time(8, 15), "B4": "", "C4": 2 ** 40}
+        for coordinate, value in values.items():
+            ws[coordinate] = value
+        # an empty cell at the end still counts in the dimensions
+        ws["E7"].value = None
+
+        ws_new = grids_to_workbook(workbook_to_grids(wb)).active
+
+        self.assertEqual(ws_new.title, "Índice")
+        self.assertEqual((ws_new.max_row, ws_new.max_column), (7, 5))
+        for coordinate, value in values.items():
+            self.assertEqual(ws_new[coordinate].value, value)
+            self.assertEqual(type(ws_new[coordinate].value), type(value))
+        self.assertIsNone(ws_new["D1"].value)
+
+    def test_integration_cases(self):
+        for case_num in range(1, 8):
+            wb = load_original_case(case_num)
+            wb_new = grids_to_workbook(workbook_to_grids(wb))
+
+            self.assertEqual(wb_new.sheetnames, wb.sheetnames)
+            for ws, ws_new in zip(wb.worksheets, wb_new.worksheets):
+                self.assertEqual((ws_new.max_row, ws_new.max_column),
+                                 (ws.max_row, ws.max_column))
+                for row in ws.iter_rows():
+                    for cell in row:
+                        self.assertEqual(ws_new[cell.coordinate].value,
+                                         cell.value)
+
+    def test_unsupported_values(self):
+        for value in [datetime.timedelta(days=1), 2 ** 70]:
+            wb = Workbook()
+            wb.active["A1"].value = value
+            with self.assertRaises(UnsupportedCellValue):
+                SheetGrid.from_worksheet(wb.active)
+
+
+class CsvTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text, encoding="utf-8"):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+        return path
+
+    def test_values_and_coordinates(self):
+        path = self.write("Índice.csv",
+                          "Año,Valor,Nota\n"
+                          "\n"
+                          "1986, 12 ,\"a, b\"\n"
+                          "1987-03-01,1.5e3,nan,extra\n"
+                          "007,-11909.644610715795,inf\n"
+                          "12345678901234567890,,\n")
+
+        ws = load_csv_workbook(path).active
+
+        self.assertEqual(ws.title, "Índice")
+        self.assertEqual((ws.max_row, ws.max_column), (6, 4))
+        self.assertEqual([[cell.value for cell in row]
+                          for row in ws.iter_rows()],
+                         [["Año", "Valor", "Nota", None],
+                          [None, None, None, None],
+                          [1986, 12, "a, b", None],
+                          [datetime.datetime(1987, 3, 1), 1500.0, "nan",
+                           "extra"],
+                          [7, -11909.644610715795, "inf", None],
+                          [1.2345678901234567e+19, None, None, None]])
+
+    def test_tsv_and_encodings(self):
+        path = self.write("latin.tsv", "Período\t2000-13-01\n1\t2.5\n",
+                          encoding="latin-1")
+
+        grid = csv_to_grid(path)
+
+        self.assertEqual(grid.values(), ["Período", "2000-13-01", 1, 2.5])
+        self.assertEqual((grid.max_row, grid.max_column), (2, 2))
+
+    def test_empty_file(self):
+        ws = load_csv_workbook(self.write("empty.csv", "")).active
+        self.assertEqual((ws.max_row, ws.max_column), (1, 1))
+        self.assertIsNone(ws["A1"].value)
+
+    def test_xlseries(self):
+        """Parameters of an excel file scrape its CSV export."""
+
+        ws = load_original_case(1).active
+        path = os.path.join(self.directory, "case1.csv")
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(
+                [["" if cell.value is None else cell.value for cell in row]
+                 for row in ws.iter_rows()])
+
+        df = XlSeries(get_orig_cases_path(1)).get_data_frames(
+            get_param_cases_path(1))
+        df_csv = XlSeries(path).get_data_frames(get_param_cases_path(1))
+
+        compare_data_frames(df_csv, df)
+
+        with self.assertRaises(ValueError):
+            XlSeries(os.path.join(self.directory, "case1.ods"))
+
+
+class GridCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.grid_cache = GridCache(os.path.join(self.directory, "grids"))
+        self.path = os.path.join(self.directory, "case1.xlsx")
+        shutil.copy(get_orig_cases_path(1), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hits_and_misses(self):
+        wb = self.grid_cache.load_workbook(self.path, data_only=True)
+        wb_cached = self.grid_cache.load_workbook(self.path, data_only=True)
+
+        self.assertEqual((self.grid_cache.misses, self.grid_cache.hits),
+                         (1, 1))
+        self.assertEqual(wb_cached.active["B10"].value,
+                         wb.active["B10"].value)
+
+        # other loader arguments are cached apart
+        self.grid_cache.load_workbook(self.path, data_only=False)
+        self.assertEqual(self.grid_cache.misses, 2)
+
+    def test_changed_files_are_parsed_again(self):
+        self.grid_cache.load_workbook(self.path, data_only=True)
+
+        wb = load_original_case(1)
+        wb.active["B10"] = 123456.0
+        wb.save(self.path)
+        wb_changed = self.grid_cache.load_workbook(self.path, data_only=True)
+
+        self.assertEqual(self.grid_cache.misses, 2)
+        self.assertEqual(wb_changed.active["B10"].value, 123456.0)
+
+    def test_broken_entries_are_parsed_again(self):
+        self.grid_cache.load_workbook(self.path, data_only=True)
+        digest = GridCache.digest(self.path, {"data_only": True})
+        os.remove(os.path.join(self.grid_cache.directory, digest,
+                               "sheet0_values.npy"))
+
+        self.grid_cache.load_workbook(self.path, data_only=True)
+        self.grid_cache.load_workbook(self.path, data_only=True)
+
+        self.assertEqual((self.grid_cache.misses, self.grid_cache.hits),
+                         (2, 1))
+
+    def test_xlseries(self):
+        grid_dir = os.path.join(self.directory, "grids")
+        df = XlSeries(self.path).get_data_frames(get_param_cases_path(1))
+        for _ in range(2):
+            xl = XlSeries(self.path, grid_cache=grid_dir)
+            compare_data_frames(
+                xl.get_data_frames(get_param_cases_path(1)), df)
+
+        self.assertEqual(len(os.listdir(grid_dir)), 1)
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_instrumentation
+----------------------------------
+
+Tests for `instrumentation` module.
+"""
+
+import unittest
+import nose
+import io
+import os
+import json
+import shutil
+import tempfile
+import tracemalloc
+
+from xlseries import XlSeries
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_param_cases_path
+from xlseries.utils.path_finders import get_orig_cases_path
+from xlseries.utils.instrumentation import RunStats, stage, recording
+from xlseries.utils.instrumentation import active_run_stats, RunTrace
+from xlseries.utils.instrumentation import trace, tracing, reason_code
+from xlseries.utils.instrumentation import CancelToken, RunCancelled
+from xlseries.utils.instrumentation import cancelling
+from xlseries.strategies.strategies import TimeIndexNotClean
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def test_stages_are_not_timed_without_recording(self):
+        self.assertIsNone(active_run_stats())
+        self.assertIs(stage("a"), stage("b"))
+
+    def test_recording(self):
+        events = []
+        run_stats = RunStats(lambda *event: events.append(event[0]))
+
+        with recording(run_stats):
+            with stage("outer"):
+                for i in range(3):
+                    with stage("inner"):
+                        pass
+
+        self.assertIsNone(active_run_stats())
+        self.assertEqual(run_stats["inner"]["calls"], 3)
+        self.assertEqual(run_stats["outer"]["calls"], 1)
+        self.assertGreaterEqual(run_stats["outer"]["wall_time"],
+                                run_stats["inner"]["wall_time"])
+        self.assertEqual(events, ["inner", "inner", "inner", "outer"])
+
+    def test_failed_stages_are_recorded(self):
+        run_stats = RunStats()
+
+        with self.assertRaises(ValueError):
+            with recording(run_stats):
+                with stage("failing"):
+                    raise ValueError()
+
+        self.assertEqual(run_stats["failing"]["calls"], 1)
+        self.assertIsNone(active_run_stats())
+
+
+class MemoryProfilingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tracemalloc.start()
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    def test_peak_and_retained_bytes(self):
+        run_stats = RunStats(memory=True)
+
+        with recording(run_stats):
+            with stage("outer"):
+                with stage("inner"):
+                    temporary = bytearray(10 ** 7)
+                    del temporary
+                retained = bytearray(10 ** 6)
+
+        outer, inner = run_stats["outer"], run_stats["inner"]
+
+        # the peak of an inner stage is also a peak of the outer one
+        self.assertGreaterEqual(inner["peak_bytes"], 10 ** 7)
+        self.assertGreaterEqual(outer["peak_bytes"], inner["peak_bytes"])
+
+        self.assertLess(inner["retained_bytes"], 10 ** 6)
+        self.assertGreaterEqual(outer["retained_bytes"], 10 ** 6)
+        self.assertIsNotNone(retained)
+
+    def test_top_sites(self):
+        run_stats = RunStats(memory=True, top_sites=3)
+
+        with recording(run_stats):
+            with stage("attempt"):
+                retained = [bytearray(10 ** 6)]
+
+        top_sites = run_stats.to_dict()["attempt"]["top_sites"]
+        self.assertLessEqual(len(top_sites), 3)
+        self.assertIn(__file__.replace(".pyc", ".py"), top_sites[0][0])
+        self.assertGreaterEqual(top_sites[0][1], 10 ** 6)
+        self.assertIsNotNone(retained)
+
+
+class RunTraceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.run_trace = RunTrace(source_file="file.xlsx")
+        with recording(RunStats(), self.run_trace):
+            self.assertTrue(tracing())
+            trace("attempt", attempt=0, status="failed")
+            trace("attempt", attempt=1, status="ok")
+            trace("run", status="ok")
+
+        self.assertFalse(tracing())
+        trace("attempt", attempt=2)
+
+    def test_events(self):
+        self.assertEqual(len(self.run_trace), 3)
+        self.assertEqual([event["attempt"] for event in
+                          self.run_trace.filter("attempt")], [0, 1])
+
+    def test_export(self):
+        output_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(output_dir, "trace.json")
+            self.run_trace.to_json(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), self.run_trace.to_dict())
+
+            # many runs can be collected in the same file
+            path = os.path.join(output_dir, "trace.jsonl")
+            self.run_trace.write_jsonl(path)
+            self.run_trace.write_jsonl(path)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+
+        finally:
+            shutil.rmtree(output_dir)
+
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[1], {"source_file": "file.xlsx",
+                                    "event": "attempt", "attempt": 1,
+                                    "status": "ok"})
+
+        f = io.StringIO()
+        self.run_trace.write_jsonl(f)
+        self.assertEqual(len(f.getvalue().splitlines()), 3)
+
+    def test_reason_code(self):
+        self.assertEqual(reason_code(TimeIndexNotClean()),
+                         "time_index_not_clean")
+        self.assertEqual(reason_code(AssertionError()), "assertion_error")
+
+
+class CancellationTestCase(unittest.TestCase):
+
+    def test_stages_check_the_token(self):
+        cancel_token = CancelToken()
+        with cancelling(cancel_token):
+            with stage("discovery"):
+                cancel_token.cancel()
+
+            with self.assertRaises(RunCancelled) as context:
+                with stage("attempt"):
+                    pass
+            self.assertEqual(context.exception.stage_name, "attempt")
+
+        # the token is only checked while it is active
+        with stage("attempt"):
+            pass
+
+    def test_poll_interval(self):
+        cancel_token = CancelToken(poll_interval=60)
+        self.assertFalse(cancel_token.cancelled)
+
+        # the event is not checked again until the interval passes
+        cancel_token.event.set()
+        self.assertFalse(cancel_token.cancelled)
+
+        cancel_token.cancel()
+        self.assertTrue(cancel_token.cancelled)
+
+    def test_cancel_xlseries_run(self):
+        cancel_token = CancelToken()
+
+        def callback(stage_name, wall_time, cpu_time):
+            if stage_name == "discovery":
+                cancel_token.cancel()
+
+        xl = XlSeries(load_original_case(1), stats_callback=callback)
+        with cancelling(cancel_token):
+            # failed attempts are caught, but a cancelled run is not
+            with self.assertRaises(RunCancelled):
+                xl.get_data_frames(get_param_cases_path(1))
+
+        self.assertNotIn("get_values", xl.last_run_stats)
+        self.assertEqual(xl.last_run_trace.events[-1]["status"],
+                         "cancelled")
+
+
+class XlSeriesRunStatsTestCase(unittest.TestCase):
+
+    def test_last_run_stats(self):
+        stages = []
+
+        def callback(stage_name, wall_time, cpu_time):
+            stages.append(stage_name)
+
+        xl = XlSeries(get_orig_cases_path(1), stats_callback=callback)
+        self.assertIn("load", xl.last_run_stats)
+
+        xl.get_data_frames(get_param_cases_path(1))
+
+        for stage_name in ["run", "workbook_copy", "discovery", "attempt",
+                           "clean_time_index", "get_values", "period_ranges",
+                           "build_data_frames"]:
+            self.assertIn(stage_name, xl.last_run_stats)
+            self.assertIn(stage_name, stages)
+
+        self.assertNotIn("load", xl.last_run_stats)
+        self.assertEqual(xl.last_run_stats["get_values"]["calls"], 2)
+        self.assertEqual(xl.last_run_stats.to_dict()["run"]["calls"], 1)
+
+    def test_last_run_trace(self):
+        with open(get_param_cases_path(3)) as f:
+            params = json.load(f)
+        del params["continuity"]
+
+        xl = XlSeries(load_original_case(3), record_runs=True)
+        xl.get_data_frames(params)
+        run_trace = xl.last_run_trace
+
+        self.assertEqual(run_trace.context["worksheet"], list(xl.params)[0])
+        self.assertEqual(run_trace.filter("discovery")[0]["missing_params"],
+                         ["continuity"])
+        self.assertEqual(run_trace.filter("attempt")[0]["params_delta"],
+                         {"continuity": [True, True, True]})
+        self.assertEqual(len(run_trace.filter("get_data")), 3)
+        self.assertIsNotNone(
+            run_trace.filter("clean_time_index")[0]["parse_time"])
+        self.assertEqual(run_trace.events[-1]["status"], "ok")
+
+    def test_failed_attempts_are_traced(self):
+        with open(get_param_cases_path(1)) as f:
+            params = json.load(f)
+        del params["continuity"]
+        params["time_header_coord"] = "B1"
+
+        xl = XlSeries(load_original_case(1), record_runs=True)
+        with self.assertRaises(Exception):
+            xl.get_data_frames(params)
+
+        attempts = xl.last_run_trace.filter("attempt")
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual([attempt["reason"] for attempt in attempts],
+                         ["assertion_error", "assertion_error"])
+        self.assertEqual(xl.last_run_trace.events[-1]["status"], "failed")
+
+    def test_profile_memory(self):
+        xl = XlSeries(get_orig_cases_path(1), profile_memory=True)
+        self.assertGreater(xl.last_run_stats["load"]["peak_bytes"], 0)
+
+        xl.get_data_frames(get_param_cases_path(1))
+        stats = xl.last_run_stats.to_dict()
+
+        for stage_name in ["workbook_copy", "attempt", "build_data_frames"]:
+            self.assertIn("peak_bytes", stats[stage_name])
+            self.assertIn("retained_bytes", stats[stage_name])
+            self.assertIn("top_sites", stats[stage_name])
+        self.assertNotIn("top_sites", stats["get_values"])
+
+        # tracemalloc is only tracing during the runs
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_workbook_without_load(self):
+        xl = XlSeries(load_original_case(1), record_runs=True)
+        self.assertIsNone(xl.last_run_stats)
+
+    def test_runs_not_recorded(self):
+        xl = XlSeries(get_orig_cases_path(1))
+        xl.get_data_frames(get_param_cases_path(1))
+
+        self.assertIsNone(xl.last_run_stats)
+        self.assertIsNone(xl.last_run_trace)
+        self.assertEqual(xl.last_ws_name, list(xl.params)[0])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
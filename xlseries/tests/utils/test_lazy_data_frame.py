@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_lazy_data_frame
+----------------------------------
+
+Tests for `lazy_data_frame` module.
+"""
+
+import unittest
+import nose
+import mock
+import json
+
+from xlseries import XlSeries
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_param_cases_path
+from xlseries.utils.data_frame import compare_data_frames
+import xlseries.strategies.get.data as get_data_strategies
+
+
+class LazyDataFrameTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.exp_df = XlSeries(load_original_case(7)).get_data_frames(
+            get_param_cases_path(7))
+        self.lazy_df = XlSeries(load_original_case(7)).get_data_frames(
+            get_param_cases_path(7), lazy=True)
+
+    def test_columns_are_extracted_on_access(self):
+        self.assertEqual(list(self.lazy_df.columns),
+                         list(self.exp_df.columns))
+        self.assertEqual(self.lazy_df.loaded_columns, [])
+
+        series = self.lazy_df["Exports FOB"]
+        self.assertTrue(series.equals(self.exp_df["Exports FOB"]))
+        self.assertEqual(self.lazy_df.loaded_columns, ["Exports FOB"])
+
+        df = self.lazy_df[["Credit", "Credit.2"]]
+        self.assertTrue(df.equals(self.exp_df[["Credit", "Credit.2"]]))
+
+        with self.assertRaises(KeyError):
+            self.lazy_df["Non existent series"]
+
+    def test_materialized_columns_are_cached(self):
+        self.lazy_df["Exports FOB"]
+
+        with mock.patch.object(get_data_strategies.BaseGetDataStrategy,
+                               "_get_values",
+                               side_effect=AssertionError("extracted")):
+            self.lazy_df["Exports FOB"]
+
+        self.assertTrue(self.lazy_df.materialize().equals(self.exp_df))
+
+    def test_multifrequency_series(self):
+        exp_dfs = XlSeries(load_original_case(6)).get_data_frames(
+            get_param_cases_path(6))
+        lazy_dfs = XlSeries(load_original_case(6)).get_data_frames(
+            get_param_cases_path(6), lazy=True)
+
+        for lazy_df, exp_df in zip(lazy_dfs, exp_dfs):
+            self.assertTrue(lazy_df.materialize().equals(exp_df))
+
+    def test_discovered_parameters(self):
+        """Lazy data frames choose the same attempt as eager ones."""
+
+        for case_num, missing_params in [(1, ["missings"]),
+                                         (2, ["continuity"]),
+                                         (5, ["missings"])]:
+            with open(get_param_cases_path(case_num)) as f:
+                params = json.load(f)
+            for param in missing_params:
+                del params[param]
+
+            exp_dfs = XlSeries(load_original_case(case_num)).get_data_frames(
+                dict(params))
+            lazy_dfs = XlSeries(
+                load_original_case(case_num)).get_data_frames(
+                dict(params), lazy=True)
+            if type(exp_dfs) != list:
+                exp_dfs, lazy_dfs = [exp_dfs], [lazy_dfs]
+
+            self.assertEqual(len(lazy_dfs), len(exp_dfs))
+            for lazy_df, exp_df in zip(lazy_dfs, exp_dfs):
+                compare_data_frames(lazy_df.materialize(), exp_df)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            XlSeries(load_original_case(1)).get_data_frames(
+                get_param_cases_path(1), lazy=True, safe_mode=True)
+
+        with self.assertRaises(ValueError):
+            XlSeries(load_original_case(1)).get_data_frames(
+                get_param_cases_path(1), lazy=True, output="long")
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
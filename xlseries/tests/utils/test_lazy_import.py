@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_lazy_import
+----------------------------------
+
+Tests for `lazy_import` module.
+"""
+
+import unittest
+import nose
+import os
+import sys
+import json
+import mock
+import subprocess
+
+from xlseries.utils.lazy_import import lazy_import, is_imported, LazyModule
+
+
+class LazyImportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # a light module of the standard library, imported from scratch
+        self.name = "colorsys"
+        self.previous = sys.modules.pop(self.name, None)
+
+    def tearDown(self):
+        sys.modules.pop(self.name, None)
+        if self.previous is not None:
+            sys.modules[self.name] = self.previous
+
+    def test_import_on_first_use(self):
+        module = lazy_import(self.name)
+
+        self.assertIsInstance(module, LazyModule)
+        self.assertFalse(is_imported(module))
+        self.assertNotIn(self.name, sys.modules)
+
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(is_imported(module))
+        self.assertIs(module._module, sys.modules[self.name])
+
+    def test_already_imported(self):
+        import colorsys
+        self.assertIs(lazy_import(self.name), colorsys)
+        self.assertTrue(is_imported(colorsys))
+
+    def test_patched_module(self):
+        module = lazy_import(self.name)
+        import colorsys
+
+        with mock.patch.object(colorsys, "rgb_to_hsv", return_value="hsv"):
+            self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), "hsv")
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+
+    def test_missing_module(self):
+        module = lazy_import("xlseries_missing_module")
+        with self.assertRaises(ImportError):
+            module.anything
+
+
+class HeavyDependenciesTestCase(unittest.TestCase):
+
+    def test_strategies_import_no_heavy_dependencies(self):
+        """Importing xlseries and its strategies doesn't import the heavy
+        dependencies, in a new interpreter."""
+
+        code = ("import sys, json, xlseries, xlseries.strategies.strategies\n"
+                "print(json.dumps([name for name in ['arrow', 'numpy', "
+                "'openpyxl', 'pandas'] if name in sys.modules]))")
+        package_dir = os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         cwd=package_dir)
+
+        self.assertEqual(json.loads(output.decode("utf-8")), [])
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_sinks
+----------------------------------
+
+Tests for `sinks` module.
+"""
+
+import unittest
+import nose
+import os
+import shutil
+import datetime
+import tempfile
+import mock
+
+import pandas as pd
+from openpyxl import Workbook
+
+from xlseries import XlSeries
+from xlseries.strategies.strategies import ParameterDiscovery
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_param_cases_path
+from xlseries.utils.sinks import ParquetSink, ArrowIPCSink, read_metadata
+from xlseries.utils.sinks import FileAlreadyWritten
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class SinksTestCase(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def run_sink(self, sink_class, read_table):
+        exp_df = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1))
+
+        path = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1), sink=sink_class(self.output_dir))
+
+        self.assertTrue(os.path.isfile(path))
+        self.assertTrue(read_table(path).to_pandas().equals(exp_df))
+
+        metadata = read_metadata(path)
+        self.assertEqual(metadata["frequency"], "MS")
+        self.assertEqual(metadata["params"]["headers_coord"], ["B1", "C1"])
+
+    def test_parquet_sink(self):
+        import pyarrow.parquet as pq
+        self.run_sink(ParquetSink, pq.read_table)
+
+    def test_arrow_ipc_sink(self):
+        import pyarrow.ipc as ipc
+
+        def read_table(path):
+            with pyarrow.memory_map(path) as source:
+                return ipc.open_file(source).read_all()
+
+        self.run_sink(ArrowIPCSink, read_table)
+
+    def test_sink_keeping_frames(self):
+        sink = ParquetSink(self.output_dir, keep_frames=True)
+        df = XlSeries(load_original_case(1)).get_data_frames(
+            get_param_cases_path(1), sink=sink)
+
+        self.assertEqual(len(df.columns), 2)
+        self.assertEqual(len(sink.written), 1)
+
+    def test_long_sink(self):
+        import pyarrow.parquet as pq
+        exp_df = XlSeries(load_original_case(6)).get_data_frames(
+            get_param_cases_path(6), output="long")
+
+        path = XlSeries(load_original_case(6)).get_data_frames(
+            get_param_cases_path(6), output="long",
+            sink=ParquetSink(self.output_dir))
+
+        df = pq.read_table(path).to_pandas()
+        self.assertEqual(len(df), len(exp_df))
+        self.assertEqual(list(df["value"]), list(exp_df["value"]))
+        self.assertIsNone(read_metadata(path)["frequency"])
+
+    def two_tables(self):
+        """Return a worksheet with two monthly tables and its parameters."""
+
+        wb = Workbook()
+        ws = wb.active
+        for col, start_year in [(1, 2000), (4, 2005)]:
+            ws.cell(row=1, column=col).value = "Fecha"
+            ws.cell(row=1, column=col + 1).value = "Serie " + str(start_year)
+            for i_month in range(12):
+                ws.cell(row=i_month + 2, column=col).value = \
+                    datetime.datetime(start_year, i_month + 1, 1)
+                ws.cell(row=i_month + 2, column=col + 1).value = \
+                    float(i_month)
+        params = {"headers_coord": ["B1", "E1"], "data_starts": 2,
+                  "data_ends": 13, "frequency": "M",
+                  "time_header_coord": ["A1", "D1"], "continuity": True,
+                  "blank_rows": False, "missings": False,
+                  "time_alignment": 0, "alignment": "vertical",
+                  "series_names": None, "time_multicolumn": False,
+                  "time_composed": False}
+
+        return wb, params
+
+    def test_frames_with_the_same_frequency(self):
+        wb, params = self.two_tables()
+        paths = XlSeries(wb).get_data_frames(
+            params, sink=ParquetSink(self.output_dir))
+
+        self.assertEqual([os.path.basename(path) for path in paths],
+                         ["workbook_Sheet_MS_2000-01-01.parquet",
+                          "workbook_Sheet_MS_2005-01-01.parquet"])
+        self.assertEqual(len(os.listdir(self.output_dir)), 2)
+
+    def test_frames_are_written_as_built(self):
+        wb, params = self.two_tables()
+        build_data_frame = ParameterDiscovery._build_data_frame
+        sink = ParquetSink(self.output_dir)
+        write = sink.write
+        events = []
+
+        def build(*args):
+            events.append("build")
+            return build_data_frame(*args)
+
+        def write_frame(df, metadata):
+            events.append("write")
+            return write(df, metadata)
+
+        sink.write = write_frame
+        with mock.patch.object(ParameterDiscovery, "_build_data_frame",
+                               side_effect=build):
+            XlSeries(wb).get_data_frames(params, sink=sink)
+            self.assertEqual(events, ["build", "write", "build", "write"])
+
+            # frames of an attempt are written once it succeeds
+            del events[:]
+            del params["continuity"]
+            XlSeries(wb).get_data_frames(params, sink=sink)
+            self.assertEqual(events, ["build", "build", "write", "write"])
+
+    def test_files_are_not_overwritten_in_a_run(self):
+        sink = ParquetSink(self.output_dir)
+        df = pd.DataFrame({"serie": [1.0, 2.0]},
+                          index=pd.date_range("2000-01-01", periods=2,
+                                              freq="MS"))
+        metadata = {"source_file": None, "worksheet": "Sheet"}
+
+        sink.start_run()
+        sink.write(df, metadata)
+        with self.assertRaises(FileAlreadyWritten):
+            sink.write(df, metadata)
+
+        # a new run replaces the files of the previous one
+        sink.start_run()
+        sink.write(df, metadata)
+
+    def test_sink_with_safe_mode(self):
+        with self.assertRaises(ValueError):
+            XlSeries(load_original_case(1)).get_data_frames(
+                get_param_cases_path(1), safe_mode=True,
+                sink=ParquetSink(self.output_dir))
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_synthetic_cases
+----------------------------------
+
+Tests for `synthetic_cases` module.
+"""
+
+import unittest
+import nose
+import os
+import json
+import shutil
+import tempfile
+import pandas as pd
+
+from xlseries import XlSeries
+from xlseries.utils.synthetic_cases import SyntheticCase
+
+try:
+    import xlwt
+except ImportError:
+    xlwt = None
+
+
+class SyntheticCaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def check_scraping(self, case, xl_path_or_wb=None, params=None):
+        dfs = XlSeries(xl_path_or_wb or case.get_workbook()).get_data_frames(
+            params or case.params)
+        if type(dfs) != list:
+            dfs = [dfs]
+
+        exp_dfs = case.get_expected_data_frames()
+        self.assertEqual(len(dfs), len(exp_dfs))
+        for df, exp_df in zip(dfs, exp_dfs):
+            self.assertTrue(df.equals(exp_df))
+
+    def test_layouts(self):
+        for options in [{"alignment": "vertical"},
+                        {"alignment": "horizontal"},
+                        {"frequency": ["M", "Q", "A"], "num_series": 4},
+                        {"frequency": "D", "num_periods": 400},
+                        {"frequency": "M", "num_tables": 3}]:
+            self.check_scraping(SyntheticCase(**options))
+
+    def test_dirty_values(self):
+        for options in [{"missings_density": 0.1},
+                        {"missings_density": 0.1, "missing_value": "-"},
+                        {"typos_density": 0.3},
+                        {"frequency": "Q", "time_composed": True,
+                         "num_periods": 40},
+                        {"alignment": "horizontal", "frequency": ["Q", "M"],
+                         "missings_density": 0.05}]:
+            self.check_scraping(SyntheticCase(**options))
+
+    def test_time_layouts(self):
+        for options in [{"time_alignment": -1, "frequency": ["M", "D"]},
+                        {"time_alignment": 1, "typos_density": 0.2,
+                         "missings_density": 0.1, "missing_value": "-"},
+                        {"frequency": "Q", "time_composed": True,
+                         "time_multicolumn": True, "num_periods": 41},
+                        {"alignment": "horizontal", "frequency": "Q",
+                         "time_composed": True, "time_multicolumn": True,
+                         "missings_density": 0.1}]:
+            self.check_scraping(SyntheticCase(**options))
+
+    def test_multifrequency(self):
+        for options in [{"frequency": ["AQQQQ", "Q"], "num_periods": 42},
+                        {"alignment": "horizontal", "time_multicolumn": True,
+                         "num_periods": 40},
+                        {"time_multicolumn": True, "num_series": 1,
+                         "missings_density": 0.1}]:
+            case = SyntheticCase(time_composed=True,
+                                 **dict({"frequency": "AQQQQ"}, **options))
+            self.check_scraping(case)
+
+        # a year and its quarters, with a data frame for each frequency
+        annual_df, quarterly_df = case.get_expected_data_frames()
+        self.assertEqual(len(annual_df), 24)
+        self.assertEqual(len(quarterly_df), 96)
+        self.assertEqual(quarterly_df.index[4], pd.Timestamp("2001-01-01"))
+
+    def test_same_seed_same_case(self):
+        case = SyntheticCase(missings_density=0.2, typos_density=0.2, seed=3)
+        other_case = SyntheticCase(missings_density=0.2, typos_density=0.2,
+                                   seed=3)
+
+        self.assertEqual(list(case.iter_rows()), list(other_case.iter_rows()))
+        self.assertNotEqual(list(case.iter_rows()),
+                            list(SyntheticCase(seed=4).iter_rows()))
+
+    def test_save_xlsx(self):
+        case = SyntheticCase(num_periods=1000, frequency=["D", "M"],
+                             missings_density=0.05)
+        paths = case.save(self.output_dir, "case")
+
+        with open(paths["params"]) as f:
+            self.assertEqual(json.load(f), case.params)
+
+        self.check_scraping(case, paths["workbook"], paths["params"])
+
+        exp_df = pd.read_csv(paths["expected"][1], index_col=0,
+                             parse_dates=True)
+        self.assertEqual(list(exp_df.columns), ["Series 2.1", "Series 2.2",
+                                                "Series 2.3"])
+        self.assertEqual(len(exp_df), 1000)
+
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_save_xls(self):
+        case = SyntheticCase(typos_density=0.1, missings_density=0.1)
+        paths = case.save(self.output_dir, "case", "xls")
+
+        self.assertTrue(paths["workbook"].endswith(".xls"))
+        self.check_scraping(case, paths["workbook"], paths["params"])
+
+        case = SyntheticCase(alignment="horizontal", frequency="AQQQQ",
+                             time_composed=True, time_multicolumn=True)
+        paths = case.save(self.output_dir, "multicolumn", "xls")
+        self.check_scraping(case, paths["workbook"], paths["params"])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            SyntheticCase(frequency="W")
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(frequency="M", time_composed=True)
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(missings_density=1.5)
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(frequency="AQQQQ")
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(frequency="Q", time_composed=True,
+                          time_multicolumn=True, num_tables=2)
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(time_alignment=-1, alignment="horizontal")
+
+        with self.assertRaises(ValueError):
+            SyntheticCase(time_alignment=1, missings_density=0.1)
+
+        # excel doesn't have so many columns
+        with self.assertRaises(ValueError):
+            SyntheticCase(num_periods=20000, alignment="horizontal").save(
+                self.output_dir, "case")
+        self.assertFalse(os.path.isfile(
+            os.path.join(self.output_dir, "case.xlsx")))
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+test_workbook_cache
+----------------------------------
+
+Tests for `workbook_cache` module.
+"""
+
+import unittest
+import nose
+import os
+import shutil
+import tempfile
+
+from openpyxl import Workbook
+
+from xlseries.utils import workbook_cache
+from xlseries.utils.workbook_cache import WorkbookCache
+from xlseries.utils.case_loaders import load_original_case
+from xlseries.utils.path_finders import get_orig_cases_path
+from xlseries import XlSeries
+
+
+class WorkbookCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        for name in ["a.xlsx", "b.xlsx", "c.xlsx"]:
+            self.paths.append(os.path.join(self.directory, name))
+            with open(self.paths[-1], "w") as f:
+                f.write(name)
+        self.loaded = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def loader(self, path, num_cells=0):
+        self.loaded.append(os.path.basename(path))
+        wb = Workbook()
+        for i_cell in range(num_cells):
+            wb.active.cell(row=i_cell + 1, column=1, value=i_cell)
+        return wb
+
+    def test_hits_and_evictions(self):
+        cache = WorkbookCache(max_entries=2)
+
+        wb = cache.get(self.paths[0], self.loader)
+        self.assertIs(cache.get(self.paths[0], self.loader), wb)
+        cache.get(self.paths[1], self.loader)
+        # a is used again, so b is the least recently used one
+        cache.get(self.paths[0], self.loader)
+        cache.get(self.paths[2], self.loader)
+        cache.get(self.paths[1], self.loader)
+
+        self.assertEqual(self.loaded, ["a.xlsx", "b.xlsx", "c.xlsx",
+                                       "b.xlsx"])
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"],
+                          stats["evictions"]), (2, 2, 4, 2))
+        self.assertEqual(stats["bytes"], 2 * workbook_cache.WORKSHEET_BYTES)
+
+    def test_memory_limit(self):
+        cell_bytes = workbook_cache.CELL_BYTES
+        sheet_bytes = workbook_cache.WORKSHEET_BYTES
+        cache = WorkbookCache(max_bytes=2 * sheet_bytes + 150 * cell_bytes)
+
+        cache.get(self.paths[0], self.loader, num_cells=100)
+        cache.get(self.paths[1], self.loader, num_cells=50)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.bytes, 2 * sheet_bytes + 150 * cell_bytes)
+
+        # a is evicted to make room for c
+        cache.get(self.paths[2], self.loader, num_cells=10)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.bytes, 2 * sheet_bytes + 60 * cell_bytes)
+
+        # workbooks bigger than the limit are not cached
+        cache.get(self.paths[0], self.loader, num_cells=1000)
+        self.assertEqual(len(cache), 2)
+
+    def test_loader_arguments_are_part_of_the_key(self):
+        cache = WorkbookCache()
+
+        wb = cache.get(self.paths[0], self.loader)
+        self.assertIsNot(cache.get(self.paths[0], self.loader, num_cells=1),
+                         wb)
+        self.assertIs(cache.get(self.paths[0], self.loader), wb)
+
+    def test_copies(self):
+        cache = WorkbookCache()
+
+        wb = cache.get(self.paths[0], self.loader, num_cells=2)
+        wb_copy = cache.get(self.paths[0], self.loader, copy=True,
+                            num_cells=2)
+
+        self.assertIsNot(wb_copy, wb)
+        self.assertEqual(wb_copy.active["A2"].value, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_disabled(self):
+        cache = WorkbookCache(max_entries=0)
+
+        wb = cache.get(self.paths[0], self.loader)
+
+        self.assertIsNot(cache.get(self.paths[0], self.loader), wb)
+        self.assertEqual(len(cache), 0)
+
+    def test_changed_files_are_loaded_again(self):
+        cache = WorkbookCache()
+
+        wb = cache.get(self.paths[0], self.loader)
+        stat = os.stat(self.paths[0])
+        os.utime(self.paths[0], ns=(stat.st_atime_ns,
+                                    stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIsNot(cache.get(self.paths[0], self.loader), wb)
+        self.assertEqual(self.loaded, ["a.xlsx", "a.xlsx"])
+
+    def test_relative_paths_share_the_entry(self):
+        cache = WorkbookCache()
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            wb = cache.get("a.xlsx", self.loader)
+        finally:
+            os.chdir(cwd)
+
+        self.assertIs(cache.get(self.paths[0], self.loader), wb)
+
+
+class ProcessWorkbookCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        workbook_cache.get_cache().clear()
+        workbook_cache.configure(max_entries=4)
+
+    def tearDown(self):
+        workbook_cache.configure(max_entries=0)
+        workbook_cache.get_cache().clear()
+
+    def test_shared_by_xlseries_and_case_loaders(self):
+        cache = workbook_cache.get_cache()
+        misses, hits = cache.misses, cache.hits
+
+        wb = load_original_case(1)
+        xl = XlSeries(get_orig_cases_path(1))
+        self.assertEqual((cache.misses - misses, cache.hits - hits), (1, 1))
+
+        # case loaders return copies, that can be changed
+        self.assertIsNot(wb, xl.wb)
+        wb.active["A1"] = "changed"
+        self.assertNotEqual(xl.wb.active["A1"].value, "changed")
+
+    def test_shared_workbooks_are_always_copied(self):
+        from xlseries.utils.path_finders import get_param_cases_path
+
+        xl = XlSeries(get_orig_cases_path(1), record_runs=True)
+        xl.get_data_frames(get_param_cases_path(1), preserve_wb_obj=False)
+
+        self.assertIn("workbook_copy", xl.last_run_stats)
+        self.assertIs(XlSeries(get_orig_cases_path(1)).wb, xl.wb)
+        XlSeries(get_orig_cases_path(1)).get_data_frames(
+            get_param_cases_path(1))
+
+
+if __name__ == '__main__':
+    # unittest.main()
+    nose.run(defaultTest=__name__)
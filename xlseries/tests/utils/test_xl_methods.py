@@ -9,6 +9,9 @@ Tests for `xl_methods` utils module.
 import unittest
 import nose
 import os
+import shutil
+import datetime
+import tempfile
 from openpyxl import load_workbook
 
 from xlseries.utils.xl_methods import xl_coordinates_range
@@ -19,6 +22,11 @@ from xlseries.utils.xl_methods import common_row_or_column, coord_in_scope
 from xlseries.utils.case_loaders import load_original_case
 from xlseries.utils.path_finders import abs_path
 
+try:
+    import xlwt
+except ImportError:
+    xlwt = None
+
 
 class XlMethodsTest(unittest.TestCase):
     def test_xl_coordinates_range(self):
@@ -58,6 +66,28 @@ class XlMethodsTest(unittest.TestCase):
 
         self.assertTrue(compare_cells(wb_xls, wb_exp))
 
+    @unittest.skipIf(xlwt is None, "xlwt is not installed")
+    def test_open_xls_as_xlsx_dates(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "dates.xls")
+        wb = xlwt.Workbook()
+        ws = wb.add_sheet("Dates")
+        ws.write(0, 0, datetime.datetime(1986, 3, 1),
+                 xlwt.easyxf(num_format_str="YYYY-MM-DD"))
+        ws.write(0, 1, 31107.0)
+        ws.write(0, 2, "1986-03-01")
+        wb.save(path)
+
+        try:
+            ws_xlsx = open_xls_as_xlsx(path).active
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(ws_xlsx["A1"].value, datetime.datetime(1986, 3, 1))
+        # numbers without a date format are not dates
+        self.assertEqual(ws_xlsx["B1"].value, 31107.0)
+        self.assertEqual(ws_xlsx["C1"].value, "1986-03-01")
+
     def test_common_row_or_column(self):
 
         coords = ["A1", "A2", "A3"]
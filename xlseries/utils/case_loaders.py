@@ -7,10 +7,10 @@ Auxiliar methods to quickly load an integration case file.
 """
 
 import os
-from openpyxl import load_workbook
 
 from xlseries.strategies.discover.parameters import Parameters
 from .data_frame import get_data_frames, compare_data_frames
+from . import workbook_cache
 from .path_finders import get_orig_cases_dir
 from .path_finders import get_param_cases_dir
 from .path_finders import get_exp_cases_dir
@@ -42,7 +42,9 @@ def load_original_case(case_num=1, special_case=None, **loader_args):
         loader_args: Aditional key word arguments to load the excel file.
 
     Returns:
-        Workbook: Original test case excel file loaded in it.
+        Workbook: Original test case excel file loaded in it. If the workbook
+            cache of the process is enabled, it is a copy of the cached one
+            (read only workbooks are not copied).
     """
     case_name = _gen_filename(case_num, special_case, "xlsx")
     case_path = os.path.join(get_orig_cases_dir(), case_name)
@@ -50,7 +52,8 @@ def load_original_case(case_num=1, special_case=None, **loader_args):
     # look at data rather than formulae
     loader_args["data_only"] = True
 
-    return load_workbook(case_path, **loader_args)
+    return workbook_cache.load_workbook(
+        case_path, copy=not loader_args.get("read_only"), **loader_args)
 
 
 def load_parameters_case(case_num=1, special_case=None):
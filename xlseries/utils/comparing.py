@@ -6,7 +6,9 @@ comparing
 Auxiliar methods to compare approximate values.
 """
 
-import numpy as np
+from .lazy_import import lazy_import
+
+np = lazy_import("numpy")
 
 
 def approx_equal(a, b, tolerance=0.00001):
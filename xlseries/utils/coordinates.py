@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+coordinates
+
+Pure arithmetic of excel coordinates ("AB12"), without creating worksheets or
+cells to parse them. Parsing is memoized because the same coordinates are
+parsed again and again while building parameters and scraping.
+"""
+
+import re
+from functools import lru_cache
+
+COORD_REGEX = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+# excel limits
+MAX_COLUMN = 18278
+MAX_ROW = 1048576
+
+
+class InvalidCoordinate(ValueError):
+    """Raised when a string is not a valid excel coordinate."""
+
+    def __init__(self, coord):
+        msg = "{} is not a valid excel coordinate.".format(repr(coord))
+        super(InvalidCoordinate, self).__init__(msg)
+
+
+@lru_cache(maxsize=None)
+def parse_coord(coord):
+    """Return the row and column indexes of a coordinate.
+
+    Args:
+        coord (str): An excel coordinate (eg. "AB12" or "$AB$12").
+
+    Returns:
+        tuple: (row, column) as integers starting at 1.
+
+    >>> parse_coord("AB12")
+    (12, 28)
+    """
+
+    if not isinstance(coord, str):
+        raise InvalidCoordinate(coord)
+
+    match = COORD_REGEX.match(coord.strip())
+    if not match:
+        raise InvalidCoordinate(coord)
+
+    row = int(match.group(2))
+    col = column_index(match.group(1))
+    if not 0 < row <= MAX_ROW:
+        raise InvalidCoordinate(coord)
+
+    return (row, col)
+
+
+@lru_cache(maxsize=None)
+def column_index(column_letter):
+    """Return the index of a column from its letters ("AB" -> 28)."""
+
+    index = 0
+    for char in column_letter.upper():
+        if not "A" <= char <= "Z":
+            raise InvalidCoordinate(column_letter)
+        index = index * 26 + ord(char) - ord("A") + 1
+
+    if not 0 < index <= MAX_COLUMN:
+        raise InvalidCoordinate(column_letter)
+
+    return index
+
+
+@lru_cache(maxsize=None)
+def column_letter(column_index):
+    """Return the letters of a column from its index (28 -> "AB")."""
+
+    if not 0 < column_index <= MAX_COLUMN:
+        raise InvalidCoordinate(column_index)
+
+    letters = []
+    while column_index > 0:
+        column_index, remainder = divmod(column_index - 1, 26)
+        letters.append(chr(ord("A") + remainder))
+
+    return "".join(reversed(letters))
+
+
+def format_coord(row, col):
+    """Return the coordinate of a row and column indexes ((12, 28) -> "AB12").
+    """
+    return column_letter(col) + str(row)
+
+
+def get_row(coord):
+    """Return the row index of a coordinate."""
+    return parse_coord(coord)[0]
+
+
+def get_column(coord):
+    """Return the column index of a coordinate."""
+    return parse_coord(coord)[1]
+
+
+def coords_range(start, end):
+    """Return the coordinates of a range, row by row.
+
+    >>> coords_range("A1", "B2")
+    ['A1', 'B1', 'A2', 'B2']
+    """
+
+    start_row, start_col = parse_coord(start)
+    end_row, end_col = parse_coord(end)
+
+    min_row, max_row = sorted((start_row, end_row))
+    min_col, max_col = sorted((start_col, end_col))
+
+    return [
+        format_coord(row, col)
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    ]
+
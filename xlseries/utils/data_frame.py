@@ -7,7 +7,6 @@ Auxiliar methods to load and manipulate data frames.
 """
 
 import pandas as pd
-from openpyxl import load_workbook
 import os
 import arrow
 import glob
@@ -16,6 +15,7 @@ import string
 from .time_manipulation import infer_freq
 from .comparing import approx_equal
 from .xl_methods import normalize_value
+from . import workbook_cache
 
 
 class NoSerializedDataFrameFound(Exception):
@@ -41,7 +41,7 @@ def get_data_frames(serial_df_path, use_period_range=True):
     serial_df_path, extension = _parse_path_and_extension(serial_df_path)
 
     if extension == ".xlsx":
-        wb = load_workbook(serial_df_path, read_only=True)
+        wb = workbook_cache.load_workbook(serial_df_path, read_only=True)
         ws_names = wb.sheetnames
 
         for ws_index in range(len(ws_names)):
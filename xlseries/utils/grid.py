@@ -0,0 +1,513 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+grid
+
+Cell values of worksheets (their grid) in compact numpy arrays, and an on
+disk cache of the grids of the files already parsed, so later runs on an
+unchanged file build its workbook from the grids instead of parsing the
+excel file again.
+
+CSV and TSV files are parsed straight into a grid (with the C parser of
+pandas), with the coordinates Excel gives their fields, so they are scraped
+with the same parameters as the excel files they were exported from.
+
+Only non empty cells are kept, each one with its coordinates, a type tag and
+a 64 bits value (strings are kept apart, as UTF-8). Workbooks built from a
+grid have the values of the cells, like the copies of xl_methods.make_wb_copy
+scraped by XlSeries, but no formatting.
+
+Example:
+    grid_cache = GridCache("~/.cache/xlseries")
+
+    # parses the file the first time, builds it from the cache afterwards
+    wb = grid_cache.load_workbook("bulletin.xlsx", data_only=True)
+"""
+
+import os
+import csv
+import json
+import time
+import shutil
+import hashlib
+import datetime
+import tempfile
+import threading
+
+from .lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+openpyxl = lazy_import("openpyxl")
+
+# changes of the format invalidate the grids stored with the previous one
+FORMAT_VERSION = 1
+
+# type tags of the cells
+INT = 1
+FLOAT = 2
+STR = 3
+BOOL = 4
+DATETIME = 5
+TIME = 6
+
+ARRAYS = ("rows", "cols", "types", "values", "string_offsets",
+          "string_data")
+
+EPOCH = datetime.datetime(1970, 1, 1)
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+# delimiters of the fields of CSV files, by extension
+DELIMITERS = {".csv": ",", ".tsv": "\t", ".tab": "\t"}
+# tried in order if the encoding of a CSV file is not passed
+CSV_ENCODINGS = ("utf-8-sig", "latin-1")
+# integers with more digits may not fit in int64, they are read as floats
+INT_PATTERN = r"[+-]?\d{1,18}"
+# dates (and times) written by excel, pandas and most databases
+DATETIME_PATTERN = r"\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?"
+# longest title of an excel worksheet
+MAX_TITLE_LENGTH = 31
+
+
+class UnsupportedCellValue(TypeError):
+    """Raised if a cell value can't be kept in a grid."""
+
+    def __init__(self, value, coordinate):
+        msg = "{} value {} of cell {} can't be kept in a grid.".format(
+            type(value).__name__, repr(value), coordinate)
+        super(UnsupportedCellValue, self).__init__(msg)
+
+
+class SheetGrid(object):
+    """Non empty cell values of a worksheet.
+
+    Attributes:
+        title (str): Title of the worksheet.
+        max_row (int): Last row of the worksheet.
+        max_column (int): Last column of the worksheet.
+        arrays (dict): The coordinates of the cells ("rows" and "cols"),
+            their type tags ("types"), their "values" (as int64, floats are
+            kept as their bits and strings as their index in the strings) and
+            the strings ("string_data" with their UTF-8 bytes one after the
+            other, "string_offsets" with where each one starts and ends).
+    """
+
+    def __init__(self, title, max_row, max_column, arrays):
+        self.title = title
+        self.max_row = max_row
+        self.max_column = max_column
+        self.arrays = arrays
+
+    def __repr__(self):
+        return "SheetGrid({}, {}x{}, {} cells)".format(
+            repr(self.title), self.max_row, self.max_column, len(self))
+
+    def __len__(self):
+        return len(self.arrays["rows"])
+
+    @classmethod
+    def from_worksheet(cls, ws):
+        """Return the grid of an openpyxl worksheet.
+
+        Raises:
+            UnsupportedCellValue: If a cell has a value of a type not
+                supported (eg. timedelta) or an integer too big.
+        """
+
+        rows, cols, types, values, strings = [], [], [], [], []
+        floats = {}
+        for (row, col), cell in sorted(ws._cells.items()):
+            value = cell.value
+            if value is None:
+                continue
+
+            type_tag, value = cls._encode(value, cell.coordinate, strings)
+            if type_tag == FLOAT:
+                floats[len(values)] = value
+                value = 0
+
+            rows.append(row)
+            cols.append(col)
+            types.append(type_tag)
+            values.append(value)
+
+        arrays = {"rows": np.array(rows, dtype=np.int32),
+                  "cols": np.array(cols, dtype=np.int32),
+                  "types": np.array(types, dtype=np.uint8),
+                  "values": np.array(values, dtype=np.int64)}
+        if floats:
+            positions = np.fromiter(floats.keys(), dtype=np.int64)
+            arrays["values"][positions] = np.fromiter(
+                floats.values(), dtype=np.float64).view(np.int64)
+        arrays.update(cls._encode_strings(strings))
+
+        return cls(ws.title, ws.max_row, ws.max_column, arrays)
+
+    def to_worksheet(self, ws):
+        """Write the cell values of the grid in an empty worksheet, and the
+        title of the grid."""
+
+        ws.title = self.title
+
+        # cells are added straight away, as the openpyxl readers do (going
+        # through ws.cell checks each coordinate and takes twice the time)
+        Cell = openpyxl.cell.Cell
+        for row, col, value in zip(self.arrays["rows"].tolist(),
+                                   self.arrays["cols"].tolist(),
+                                   self.values()):
+            ws._add_cell(Cell(ws, row=row, col_idx=col, value=value))
+
+        # empty cells at the end count in the dimensions of the worksheet
+        if (self.max_row, self.max_column) not in ws._cells:
+            ws.cell(row=self.max_row, column=self.max_column)
+
+        return ws
+
+    def values(self):
+        """Return the values of the cells as python objects."""
+
+        arrays = self.arrays
+        types = np.asarray(arrays["types"])
+        values = arrays["values"].tolist()
+
+        positions = np.flatnonzero(types == FLOAT)
+        floats = np.asarray(arrays["values"])[positions].view(np.float64)
+        for position, value in zip(positions.tolist(), floats.tolist()):
+            values[position] = value
+        for position in np.flatnonzero(types == BOOL).tolist():
+            values[position] = bool(values[position])
+        for position in np.flatnonzero(types == DATETIME).tolist():
+            values[position] = EPOCH + datetime.timedelta(
+                microseconds=values[position])
+        for position in np.flatnonzero(types == TIME).tolist():
+            values[position] = (EPOCH + datetime.timedelta(
+                microseconds=values[position])).time()
+
+        string_positions = np.flatnonzero(types == STR).tolist()
+        if string_positions:
+            offsets = arrays["string_offsets"].tolist()
+            data = arrays["string_data"].tobytes()
+            for position in string_positions:
+                i_string = values[position]
+                values[position] = data[offsets[i_string]:
+                                        offsets[i_string + 1]].decode("utf-8")
+
+        return values
+
+    # PRIVATE
+    @staticmethod
+    def _encode(value, coordinate, strings):
+        """Return the type tag of a value and the value to store."""
+
+        # bool is a subclass of int, and datetime of date
+        if isinstance(value, bool):
+            return BOOL, int(value)
+
+        elif isinstance(value, int):
+            if not INT64_RANGE[0] <= value <= INT64_RANGE[1]:
+                raise UnsupportedCellValue(value, coordinate)
+            return INT, value
+
+        elif isinstance(value, float):
+            return FLOAT, value
+
+        elif isinstance(value, str):
+            strings.append(value)
+            return STR, len(strings) - 1
+
+        elif (isinstance(value, datetime.datetime) and
+              value.tzinfo is None):
+            return DATETIME, (value - EPOCH) // datetime.timedelta(
+                microseconds=1)
+
+        elif isinstance(value, datetime.time) and value.tzinfo is None:
+            return TIME, (datetime.datetime.combine(EPOCH, value) -
+                          EPOCH) // datetime.timedelta(microseconds=1)
+
+        raise UnsupportedCellValue(value, coordinate)
+
+    @staticmethod
+    def _encode_strings(strings):
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(string) for string in encoded], out=offsets[1:])
+
+        return {"string_offsets": offsets,
+                "string_data": np.frombuffer(b"".join(encoded),
+                                             dtype=np.uint8)}
+
+
+def workbook_to_grids(wb):
+    """Return the grids of the worksheets of a workbook."""
+    return [SheetGrid.from_worksheet(ws) for ws in wb.worksheets]
+
+
+def grids_to_workbook(grids):
+    """Return a new workbook with a worksheet for each grid."""
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for grid in grids:
+        grid.to_worksheet(wb.create_sheet())
+
+    return wb
+
+
+def csv_to_grid(path, delimiter=None, encoding=None, title=None):
+    """Return the grid of a CSV (or TSV) file.
+
+    Fields get the coordinates they have when Excel opens the file (the first
+    field of the first line is A1, blank lines count). Fields that are
+    numbers are converted to int or float and ISO dates (like "1986-03-01"
+    or "1986-03-01 12:30:00") to datetime, like Excel does. The rest are
+    kept as strings and empty fields are empty cells.
+
+    Args:
+        path (str): Path to the CSV file.
+        delimiter (str): Between the fields of a line, taken from the
+            extension of the file if None (tab for .tsv and .tab files,
+            comma otherwise).
+        encoding (str): Of the file, UTF-8 (or Latin-1 if it is not valid
+            UTF-8) if None.
+        title (str): Of the grid, the name of the file (without extension)
+            if None, like Excel does.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if delimiter is None:
+        delimiter = DELIMITERS.get(extension, ",")
+    if title is None:
+        title = os.path.basename(path)[:-len(extension) or None]
+    title = title[:MAX_TITLE_LENGTH]
+
+    fields = _read_csv_fields(path, delimiter, encoding)
+    # an empty worksheet still has the A1 cell
+    max_row, max_column = max(fields.shape[0], 1), max(fields.shape[1], 1)
+
+    rows, cols = np.nonzero(fields != "")
+    texts = pd.Series(fields[rows, cols], dtype=object)
+    stripped = texts.str.strip()
+
+    is_int = stripped.str.fullmatch(INT_PATTERN).to_numpy(dtype=bool)
+    numbers = pd.to_numeric(stripped.where(~is_int), errors="coerce")
+    # excel keeps "nan" or "inf" as text
+    is_float = np.isfinite(numbers.to_numpy(dtype=np.float64))
+
+    is_datetime = stripped.str.fullmatch(DATETIME_PATTERN).to_numpy(
+        dtype=bool)
+    datetimes = pd.to_datetime(stripped[is_datetime], errors="coerce")
+    is_datetime[is_datetime] = datetimes.notna().to_numpy()
+    is_str = ~(is_int | is_float | is_datetime)
+
+    types = np.full(len(texts), STR, dtype=np.uint8)
+    types[is_int] = INT
+    types[is_float] = FLOAT
+    types[is_datetime] = DATETIME
+
+    values = np.zeros(len(texts), dtype=np.int64)
+    values[is_int] = stripped[is_int].to_numpy().astype(np.int64)
+    # to_numeric may round the last digit, astype doesn't
+    values[is_float] = stripped[is_float].to_numpy().astype(
+        np.float64).view(np.int64)
+    values[is_datetime] = (datetimes.dropna().to_numpy(
+        dtype="datetime64[us]").astype(np.int64))
+    values[is_str] = np.arange(is_str.sum())
+
+    arrays = {"rows": (rows + 1).astype(np.int32),
+              "cols": (cols + 1).astype(np.int32),
+              "types": types,
+              "values": values}
+    arrays.update(SheetGrid._encode_strings(texts[is_str].tolist()))
+
+    return SheetGrid(title, max_row, max_column, arrays)
+
+
+def load_csv_workbook(path, data_only=True, delimiter=None, encoding=None):
+    """Return a workbook with the fields of a CSV (or TSV) file in its only
+    worksheet.
+
+    Args:
+        path (str): Path to the CSV file.
+        data_only (bool): Ignored, CSV files have only values. Taken so CSV
+            files are loaded like excel files.
+        delimiter (str): Like csv_to_grid.
+        encoding (str): Like csv_to_grid.
+    """
+    return grids_to_workbook([csv_to_grid(path, delimiter, encoding)])
+
+
+def _read_csv_fields(path, delimiter, encoding=None):
+    """Return the fields of a CSV file in a 2d array of strings, with ""
+    where a line has no field."""
+
+    encodings = [encoding] if encoding else CSV_ENCODINGS
+    for i_encoding, encoding in enumerate(encodings):
+        try:
+            return _read_csv(path, delimiter, encoding)
+        except UnicodeDecodeError:
+            if i_encoding == len(encodings) - 1:
+                raise
+
+
+def _read_csv(path, delimiter, encoding, num_fields=None):
+    try:
+        df = pd.read_csv(path, sep=delimiter, header=None, encoding=encoding,
+                         dtype=str, na_filter=False, skip_blank_lines=False,
+                         engine="c", names=(range(num_fields)
+                                            if num_fields else None))
+    except pd.errors.EmptyDataError:
+        return np.empty((0, 0), dtype=object)
+
+    # the C parser takes the number of fields from the first line
+    except pd.errors.ParserError:
+        if num_fields:
+            raise
+        with open(path, newline="", encoding=encoding) as f:
+            num_fields = max(len(line) for line in
+                             csv.reader(f, delimiter=delimiter))
+        return _read_csv(path, delimiter, encoding, num_fields)
+
+    return df.to_numpy(dtype=object)
+
+
+class GridCache(object):
+    """Directory where the grids of the files parsed are stored.
+
+    Grids are found by the hash of the content of the file (and the loader
+    arguments), so a file copied or moved is still found and a file changed
+    is parsed again. The arrays of a grid are stored as .npy files that are
+    memory mapped when read.
+
+    Args:
+        directory (str): Where grids are stored, created if it doesn't
+            exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "GridCache({}, {} hits, {} misses)".format(
+            repr(self.directory), self.hits, self.misses)
+
+    # PUBLIC
+    def load_workbook(self, path, parser=None, **loader_args):
+        """Return the workbook of a file, built from its grids if they are
+        stored, parsing it (and storing its grids) otherwise.
+
+        Args:
+            path (str): Path to the excel file.
+            parser (function): Called with the path and loader_args to parse
+                the file, openpyxl.load_workbook by default.
+            loader_args: Key word arguments of the parser (eg. data_only).
+        """
+
+        if parser is None:
+            parser = openpyxl.load_workbook
+
+        digest = self.digest(path, loader_args)
+        grids = self.read(digest)
+        with self._lock:
+            if grids is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if grids is not None:
+            return grids_to_workbook(grids)
+
+        wb = parser(path, **loader_args)
+        try:
+            self.write(digest, workbook_to_grids(wb))
+        # the file is parsed every time
+        except UnsupportedCellValue:
+            pass
+
+        return wb
+
+    @staticmethod
+    def digest(path, loader_args=None):
+        """Return the hash of the content of a file and the arguments used to
+        load it."""
+
+        file_hash = hashlib.blake2b(digest_size=20)
+        file_hash.update("{}:{}".format(
+            FORMAT_VERSION, sorted((loader_args or {}).items())).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def read(self, digest):
+        """Return the grids stored with a digest, or None if there are not
+        (or they can't be read)."""
+
+        entry_dir = os.path.join(self.directory, digest)
+        try:
+            with open(os.path.join(entry_dir, "workbook.json")) as f:
+                metadata = json.load(f)
+            if metadata["format_version"] != FORMAT_VERSION:
+                return None
+
+            grids = []
+            for i_sheet, sheet in enumerate(metadata["sheets"]):
+                arrays = {name: np.load(self._array_path(entry_dir, i_sheet,
+                                                         name),
+                                        mmap_mode="r")
+                          for name in ARRAYS}
+                grids.append(SheetGrid(sheet["title"], sheet["max_row"],
+                                       sheet["max_column"], arrays))
+
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+        return grids
+
+    def write(self, digest, grids):
+        """Store the grids of a file, replacing the ones stored with the same
+        digest (if any)."""
+
+        # written apart and moved, so readers never see half an entry
+        temp_dir = tempfile.mkdtemp(prefix="." + digest, dir=self.directory)
+        try:
+            for i_sheet, grid in enumerate(grids):
+                for name in ARRAYS:
+                    np.save(self._array_path(temp_dir, i_sheet, name),
+                            grid.arrays[name])
+
+            with open(os.path.join(temp_dir, "workbook.json"), "w") as f:
+                json.dump({"format_version": FORMAT_VERSION,
+                           "created": time.time(),
+                           "sheets": [{"title": grid.title,
+                                       "max_row": grid.max_row,
+                                       "max_column": grid.max_column,
+                                       "cells": len(grid)}
+                                      for grid in grids]}, f, indent=4)
+
+            entry_dir = os.path.join(self.directory, digest)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(temp_dir, entry_dir)
+
+        except OSError:
+            # another process stored the same grids meanwhile
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def clear(self):
+        """Remove every grid stored."""
+        for name in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, name),
+                          ignore_errors=True)
+
+    # PRIVATE
+    @staticmethod
+    def _array_path(entry_dir, i_sheet, name):
+        return os.path.join(entry_dir, "sheet{}_{}.npy".format(i_sheet, name))
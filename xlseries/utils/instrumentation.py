@@ -0,0 +1,484 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+instrumentation
+
+Lightweight timing of the stages of a scraping run (load, workbook copy,
+discovery, attempts, time index cleaning, value extraction, period ranges and
+data frames building).
+
+Strategies mark their stages with `stage(name)`. Timings are only taken while
+a RunStats object is recording in the current thread, otherwise `stage`
+returns a shared context manager that does nothing.
+
+In memory mode, tracemalloc (and the resident set size of the process) are
+also measured around each stage, reporting the peak and retained bytes of the
+stages and the top allocation sites of the coarse ones.
+
+Strategies also report what they decided (attempts tried, strategies chosen
+and why attempts failed) with `trace(event, **fields)`, kept in a RunTrace
+that can be exported to JSON or JSON lines.
+
+Runs can be cancelled from another thread (or process) with a CancelToken:
+while it is active in the thread doing the run, every stage checks it when
+it starts and raises RunCancelled if it was cancelled.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import tracemalloc
+import collections
+
+_local = threading.local()
+
+# stages where allocation sites are compared (snapshots are expensive, so
+# stages called once per series or time index are not compared)
+SNAPSHOT_STAGES = ("run", "load", "workbook_copy", "worksheet_copy",
+                   "discovery", "attempt", "build_data_frames", "sink")
+
+# frames of the profiling itself, not shown as allocation sites
+SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                    tracemalloc.Filter(False, "<unknown>"))
+
+
+class RunCancelled(BaseException):
+    """Raised when a stage starts after its run was cancelled.
+
+    It is not an Exception (like asyncio.CancelledError), so it isn't taken
+    for a failed attempt and goes through the attempts loop.
+    """
+
+    def __init__(self, stage_name=None):
+        self.stage_name = stage_name
+        super(RunCancelled, self).__init__(
+            "Run cancelled before stage {}".format(repr(stage_name)))
+
+
+class CancelToken(object):
+    """Flag set to cancel a run from another thread or process.
+
+    Args:
+        event: Object with set() and is_set() methods, shared with the thread
+            or process doing the run. A threading.Event by default (use a
+            multiprocessing.Manager().Event() to cancel runs in another
+            process).
+        poll_interval (float): Seconds between checks of the event. Checking
+            an event of a manager is a round trip to its process, so it
+            shouldn't be done at the start of every stage.
+    """
+
+    def __init__(self, event=None, poll_interval=0.0):
+        self.event = event if event is not None else threading.Event()
+        self.poll_interval = poll_interval
+        self._cancelled = False
+        self._next_poll = 0.0
+
+    def __repr__(self):
+        return "CancelToken(cancelled={})".format(self._cancelled)
+
+    def cancel(self):
+        """Cancel the run, it stops when its next stage starts."""
+        self._cancelled = True
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        if not self._cancelled:
+            if self.poll_interval:
+                now = time.monotonic()
+                if now < self._next_poll:
+                    return False
+                self._next_poll = now + self.poll_interval
+
+            self._cancelled = self.event.is_set()
+
+        return self._cancelled
+
+    def check(self, stage_name=None):
+        """Raise RunCancelled if the run was cancelled."""
+        if self.cancelled:
+            raise RunCancelled(stage_name)
+
+
+class RunStats(object):
+    """Wall time, cpu time and number of calls of each stage of a run.
+
+    Nested stages are timed independently, so the time of a stage includes the
+    time of the stages inside it (eg. "attempt" includes "clean_time_index").
+
+    Args:
+        callback (function): Called at the end of every stage with
+            (stage_name, wall_time, cpu_time), in seconds.
+        memory (bool): If True, also record the peak and retained bytes
+            allocated (as traced by tracemalloc, that has to be tracing) and
+            the change of resident set size of each stage.
+        top_sites (int): Number of allocation sites reported for each stage
+            in SNAPSHOT_STAGES, in memory mode.
+    """
+
+    def __init__(self, callback=None, memory=False, top_sites=5):
+        self.callback = callback
+        self.memory = memory
+        self.top_sites = top_sites
+        self.stages = collections.OrderedDict()
+
+        # stages being measured in memory mode, the innermost last
+        self._memory_stack = []
+
+    def __repr__(self):
+        return "RunStats({})".format(
+            ", ".join("{}: {:.4f}s".format(name, stats["wall_time"])
+                      for name, stats in self.stages.items()))
+
+    def __getitem__(self, stage_name):
+        return self.stages[stage_name]
+
+    def __contains__(self, stage_name):
+        return stage_name in self.stages
+
+    # PUBLIC
+    def record(self, stage_name, wall_time, cpu_time, memory=None):
+        """Add a call of a stage that took some wall and cpu time.
+
+        Args:
+            memory (dict): Peak, retained and rss bytes of the call and the
+                bytes allocated by each site ({"file:line": bytes}), if any.
+        """
+
+        if stage_name not in self.stages:
+            self.stages[stage_name] = {"calls": 0, "wall_time": 0.0,
+                                       "cpu_time": 0.0}
+
+        stats = self.stages[stage_name]
+        stats["calls"] += 1
+        stats["wall_time"] += wall_time
+        stats["cpu_time"] += cpu_time
+
+        if memory:
+            self._record_memory(stats, memory)
+
+        if self.callback:
+            self.callback(stage_name, wall_time, cpu_time)
+
+    def to_dict(self):
+        """Return {stage_name: {"calls", "wall_time", "cpu_time"}}.
+
+        In memory mode, stages also have "peak_bytes" (highest peak of a call
+        above the memory used when it started), "retained_bytes" and
+        "rss_bytes" (added up through the calls), and "top_sites" with the
+        sites that allocated more bytes, as [("file:line", bytes)]."""
+
+        stages = {}
+        for name, stats in self.stages.items():
+            stages[name] = dict(stats)
+            if "top_sites" in stats:
+                stages[name]["top_sites"] = sorted(
+                    stats["top_sites"].items(), key=lambda site: -site[1]
+                )[:self.top_sites]
+
+        return stages
+
+    # PRIVATE
+    @staticmethod
+    def _record_memory(stats, memory):
+        if "peak_bytes" not in stats:
+            stats.update({"peak_bytes": 0, "retained_bytes": 0,
+                          "rss_bytes": 0})
+
+        stats["peak_bytes"] = max(stats["peak_bytes"], memory["peak_bytes"])
+        stats["retained_bytes"] += memory["retained_bytes"]
+        if memory["rss_bytes"] is not None:
+            stats["rss_bytes"] += memory["rss_bytes"]
+
+        if "top_sites" in memory:
+            sites = stats.setdefault("top_sites", {})
+            for site, size in memory["top_sites"].items():
+                sites[site] = sites.get(site, 0) + size
+
+
+class RunTrace(object):
+    """Structured events of a run, in the order they happened.
+
+    Args:
+        context: Fields describing the run (eg. source_file, worksheet) that
+            are added to every line exported to JSON lines.
+    """
+
+    def __init__(self, **context):
+        self.context = context
+        self.events = []
+
+    def __repr__(self):
+        return "RunTrace({} events)".format(len(self.events))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    # PUBLIC
+    def record(self, event, **fields):
+        """Add an event with its fields."""
+        fields["event"] = event
+        self.events.append(fields)
+
+    def filter(self, event):
+        """Return the events of a kind (eg. "attempt")."""
+        return [fields for fields in self.events if fields["event"] == event]
+
+    def to_dict(self):
+        return {"context": dict(self.context), "events": list(self.events)}
+
+    def to_json(self, path=None):
+        """Return the trace as a JSON string, writing it to path if passed."""
+
+        json_trace = json.dumps(self.to_dict(), default=repr, indent=4)
+        if path:
+            with open(path, "w") as f:
+                f.write(json_trace)
+
+        return json_trace
+
+    def write_jsonl(self, path_or_file):
+        """Append an event per line, with the context of the run, to a JSON
+        lines file (a path or a file object), so many runs can be collected
+        in the same file."""
+
+        if hasattr(path_or_file, "write"):
+            self._write_lines(path_or_file)
+        else:
+            with open(path_or_file, "a") as f:
+                self._write_lines(f)
+
+    # PRIVATE
+    def _write_lines(self, f):
+        for fields in self.events:
+            line = dict(self.context)
+            line.update(fields)
+            f.write(json.dumps(line, default=repr) + "\n")
+
+
+class _Stage(object):
+    """Time a stage, recording it in a RunStats object when it finishes."""
+
+    __slots__ = ("run_stats", "name", "wall_start", "cpu_start",
+                 "memory_start", "max_peak", "rss_start", "snapshot")
+
+    def __init__(self, run_stats, name):
+        self.run_stats = run_stats
+        self.name = name
+
+    def __enter__(self):
+        if self.run_stats.memory and tracemalloc.is_tracing():
+            self._start_memory()
+        else:
+            self.memory_start = None
+
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time.perf_counter() - self.wall_start
+        cpu_time = time.thread_time() - self.cpu_start
+
+        if self.memory_start is not None:
+            memory = self._stop_memory()
+        else:
+            memory = None
+
+        self.run_stats.record(self.name, wall_time, cpu_time, memory)
+        return False
+
+    def _start_memory(self):
+        if self.name in SNAPSHOT_STAGES and self.run_stats.top_sites:
+            self.snapshot = _take_snapshot()
+        else:
+            self.snapshot = None
+
+        current, peak = tracemalloc.get_traced_memory()
+
+        # the peak is reset for this stage, keep it for the outer one
+        stack = self.run_stats._memory_stack
+        if stack:
+            stack[-1].max_peak = max(stack[-1].max_peak, peak)
+        tracemalloc.reset_peak()
+        stack.append(self)
+
+        self.memory_start = current
+        self.max_peak = current
+        self.rss_start = current_rss()
+
+    def _stop_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(self.max_peak, peak)
+
+        stack = self.run_stats._memory_stack
+        stack.pop()
+        if stack:
+            stack[-1].max_peak = max(stack[-1].max_peak, peak)
+
+        rss = current_rss()
+        memory = {
+            "peak_bytes": peak - self.memory_start,
+            "retained_bytes": current - self.memory_start,
+            "rss_bytes": rss - self.rss_start if rss is not None else None
+        }
+
+        if self.snapshot:
+            stats = _take_snapshot().compare_to(self.snapshot, "lineno")
+            memory["top_sites"] = {
+                "{}:{}".format(stat.traceback[0].filename,
+                               stat.traceback[0].lineno): stat.size_diff
+                for stat in stats[:self.run_stats.top_sites]
+                if stat.size_diff > 0
+            }
+
+        return memory
+
+
+class _NoStage(object):
+    """Do nothing, used when no RunStats is recording."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def trace(event, **fields):
+    """Add an event to the RunTrace of the current thread, if any.
+
+    >>> trace("get_data", series=0, strategy="GetSingleFrequencyData")
+    """
+
+    run_trace = getattr(_local, "run_trace", None)
+    if run_trace is not None:
+        run_trace.record(event, **fields)
+
+
+def tracing():
+    """True if a RunTrace is recording in the current thread.
+
+    Useful to skip building the fields of an event that would be discarded.
+    """
+    return getattr(_local, "run_trace", None) is not None
+
+
+def reason_code(exception):
+    """Return a code for the reason of a failure from its exception type.
+
+    >>> from xlseries.strategies.strategies import TimeIndexNotClean
+    >>> reason_code(TimeIndexNotClean())
+    'time_index_not_clean'
+    """
+
+    name = exception.__class__.__name__
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).lower()
+
+
+def stage(name):
+    """Return a context manager that times a stage of the current run.
+
+    >>> run_stats = RunStats()
+    >>> with recording(run_stats):
+    ...     with stage("clean_time_index"):
+    ...         pass
+    >>> run_stats["clean_time_index"]["calls"]
+    1
+
+    Raises:
+        RunCancelled: If the CancelToken of the current thread was cancelled.
+    """
+
+    cancel_token = getattr(_local, "cancel_token", None)
+    if cancel_token is not None:
+        cancel_token.check(name)
+
+    run_stats = getattr(_local, "run_stats", None)
+    if run_stats is None:
+        return _NO_STAGE
+
+    return _Stage(run_stats, name)
+
+
+class recording(object):
+    """Context manager that records the stages of the current thread.
+
+    Args:
+        run_stats (RunStats): Where stages are recorded.
+        run_trace (RunTrace): Where events are recorded, if passed.
+
+    Runs may be nested, the previous recorders record again when the inner
+    run finishes.
+    """
+
+    def __init__(self, run_stats, run_trace=None):
+        self.run_stats = run_stats
+        self.run_trace = run_trace
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = (getattr(_local, "run_stats", None),
+                         getattr(_local, "run_trace", None))
+        _local.run_stats = self.run_stats
+        _local.run_trace = self.run_trace
+        return self.run_stats
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.run_stats, _local.run_trace = self.previous
+        return False
+
+
+class cancelling(object):
+    """Context manager that makes the stages of the current thread check a
+    CancelToken.
+
+    Args:
+        cancel_token (CancelToken): Token checked when every stage starts.
+    """
+
+    def __init__(self, cancel_token):
+        self.cancel_token = cancel_token
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = getattr(_local, "cancel_token", None)
+        _local.cancel_token = self.cancel_token
+        return self.cancel_token
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.cancel_token = self.previous
+        return False
+
+
+def current_rss():
+    """Return the resident set size of the process in bytes, or None if it
+    can't be read (only Linux /proc is supported)."""
+
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def active_run_stats():
+    """Return the RunStats recording in the current thread, or None."""
+    return getattr(_local, "run_stats", None)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+lazy_data_frame
+
+A data frame handle returned by XlSeries.get_data_frames(lazy=True). The
+worksheet is already cleaned and the columns are known, but the values of a
+series are only extracted from the worksheet the first time its column is
+accessed (or when the whole data frame is materialized).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class LazyDataFrame(object):
+    """Series sharing a period range, extracted on first column access.
+
+    Args:
+        columns (list): Names of the series.
+        loaders (list): A function for each column that extracts the values
+            of its series from the worksheet.
+        index_builder (function): Returns the index of the data frame from
+            the number of values of a series.
+        frame_builder (function): Builds a pandas.DataFrame from a list of
+            columns and a list with the values of each one.
+    """
+
+    def __init__(self, columns, loaders, index_builder, frame_builder):
+        self._columns = list(columns)
+        self._loaders = dict(zip(self._columns, loaders))
+        self._index_builder = index_builder
+        self._frame_builder = frame_builder
+
+        self._values = {}
+        self._index = None
+
+    def __repr__(self):
+        return "<{} {} columns, {} loaded>".format(
+            self.__class__.__name__, len(self._columns), len(self._values))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __contains__(self, column):
+        return column in self._loaders
+
+    def __getitem__(self, key):
+        """Return a pandas.Series for a column or a DataFrame for a list."""
+
+        if type(key) == list:
+            return self._frame_builder(key, [self._load(col) for col in key])
+
+        values = self._load(key)
+        return pd.Series(np.asarray(values, dtype=np.float64),
+                         index=self.index, name=key)
+
+    # PUBLIC
+    @property
+    def columns(self):
+        return pd.Index(self._columns)
+
+    @property
+    def index(self):
+        """Index of the data frame.
+
+        It may depend on the number of values of the series (eg. daily series
+        indexed in business days), so the first column is loaded if no column
+        has been loaded yet."""
+
+        if self._index is None and self._columns:
+            self._load(self._columns[0])
+
+        return self._index
+
+    @property
+    def loaded_columns(self):
+        """Columns already extracted from the worksheet."""
+        return [column for column in self._columns if column in self._values]
+
+    def load_all(self):
+        """Extract every column not loaded yet, checking each series has as
+        many values as the index.
+
+        Raises:
+            ValueError: If a series has a different number of values.
+        """
+
+        for column in self._columns:
+            values = self._load(column)
+            if len(values) != len(self._index):
+                msg = "{} has {} values but its period range has {}".format(
+                    repr(column), len(values), len(self._index))
+                raise ValueError(msg)
+
+    def materialize(self):
+        """Extract every column not loaded yet and return a DataFrame."""
+
+        return self._frame_builder(
+            self._columns, [self._load(column) for column in self._columns])
+
+    # PRIVATE
+    def _load(self, column):
+        """Return the values of a column, extracting them the first time."""
+
+        if column not in self._values:
+            if column not in self._loaders:
+                raise KeyError(column)
+
+            values = self._loaders[column]()
+            if self._index is None:
+                self._index = self._index_builder(len(values))
+
+            self._values[column] = values
+
+        return self._values[column]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+lazy_import
+
+Modules imported the first time one of their attributes is used, so heavy
+dependencies (openpyxl, pandas, numpy, xlrd, parsley, arrow...) and the
+strategy modules don't slow down `import xlseries` in processes that may not
+use them (eg. a command line showing its help or a worker waiting for jobs).
+
+Example:
+    openpyxl = lazy_import("openpyxl")
+
+    # openpyxl is imported here
+    wb = openpyxl.Workbook()
+"""
+
+import sys
+import types
+import importlib
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in of a module that imports it on first attribute access.
+
+    Attributes are always looked up in the imported module, so changes made
+    to it later (eg. by mock.patch) are seen through the stand-in.
+    """
+
+    def __init__(self, name):
+        super(LazyModule, self).__init__(name)
+        self.__dict__["_module"] = None
+
+    def __repr__(self):
+        state = "imported" if self._module is not None else "not imported"
+        return "<lazy module '{}' ({})>".format(self.__name__, state)
+
+    def __getattr__(self, attr):
+        # only called for attributes not in the stand-in itself
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    # PRIVATE
+    def _load(self):
+        module = self._module
+        if module is None:
+            # the import system lock makes concurrent first uses safe
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+
+        return module
+
+
+def lazy_import(name):
+    """Return a module, that is imported on first use if it wasn't yet.
+
+    Args:
+        name (str): Absolute name of the module (eg. "xlseries.strategies").
+
+    Returns:
+        module: The module itself if it is already imported, a LazyModule
+            otherwise.
+    """
+
+    try:
+        return sys.modules[name]
+    except KeyError:
+        return LazyModule(name)
+
+
+def is_imported(module):
+    """True if a module returned by lazy_import was already imported."""
+    return not isinstance(module, LazyModule) or module._module is not None
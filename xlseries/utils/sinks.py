@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+sinks
+
+Output sinks that write the data frames scraped by XlSeries straight to
+Apache Arrow based files (Parquet or Arrow IPC), one file per data frame.
+
+Data frames are written as soon as each one is built, and released once
+written, so only one of them is in memory with its Arrow table. If
+parameters are left to be discovered, an attempt of parameters may still
+fail building its last frame, so all the frames of an attempt are kept until
+it succeeds and written after it.
+
+The source file, worksheet and parameters used to scrape the series are kept
+in the metadata of the file schema, under the "xlseries" key. pyarrow is an
+optional dependency, only needed when a sink is used.
+"""
+
+import os
+import re
+import json
+
+METADATA_KEY = b"xlseries"
+
+
+class FileAlreadyWritten(ValueError):
+    """Raised if a data frame would overwrite a file written in the same
+    run."""
+
+    def __init__(self, path):
+        msg = "{} was already written by this run.".format(path)
+        super(FileAlreadyWritten, self).__init__(msg)
+
+
+class BaseSink(object):
+    """Write data frames to files in a directory, one file per data frame.
+
+    Files are named after the source file, the worksheet, the frequency and
+    the start of the period range of the data frame.
+
+    Args:
+        output_dir (str): Directory where files are written. It is created if
+            it doesn't exist.
+        keep_frames (bool): If True, XlSeries.get_data_frames returns the data
+            frames as usual after writing them. If False, frames are released
+            once written and the paths of the files are returned instead.
+    """
+
+    EXTENSION = None
+
+    def __init__(self, output_dir, keep_frames=False):
+        self.pa = _import_pyarrow()
+        self.output_dir = os.path.abspath(os.path.expanduser(output_dir))
+        self.keep_frames = keep_frames
+        self.written = []
+        self._run_written = set()
+
+        if not os.path.isdir(self.output_dir):
+            os.makedirs(self.output_dir)
+
+    def __repr__(self):
+        return "{}({})".format(self.__class__.__name__, repr(self.output_dir))
+
+    # PUBLIC
+    def start_run(self):
+        """Start writing the data frames of a new run. Files written by
+        previous runs may be overwritten."""
+        self._run_written = set()
+
+    def write(self, df, metadata):
+        """Write a data frame with its metadata and return the file path.
+
+        Args:
+            df (DataFrame): Series of one frequency scraped from a worksheet.
+            metadata (dict): Source file, worksheet and parameters used to
+                scrape the data frame.
+
+        Raises:
+            FileAlreadyWritten: If another data frame of the run was written
+                to the same file.
+        """
+        # long data frames don't have a frequency, they have a column of them
+        frequency = getattr(df.index, "freqstr", None)
+        period_start = (df.index[0].strftime("%Y-%m-%d")
+                        if frequency and len(df.index) else None)
+        metadata = dict(metadata, frequency=frequency,
+                        period_start=period_start)
+        path = os.path.join(self.output_dir,
+                            self._file_name(metadata) + self.EXTENSION)
+        if path in self._run_written:
+            raise FileAlreadyWritten(path)
+
+        table = self.pa.Table.from_pandas(df, preserve_index=True)
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[METADATA_KEY] = json.dumps(
+            metadata, sort_keys=True, default=str).encode("utf-8")
+
+        self._write_table(table.replace_schema_metadata(schema_metadata),
+                          path)
+        self.written.append(path)
+        self._run_written.add(path)
+
+        return path
+
+    # PRIVATE
+    def _write_table(self, table, path):
+        raise NotImplementedError(
+            "Writing a table must be implemented in a subclass.")
+
+    @staticmethod
+    def _file_name(metadata):
+        """Return a file name from the source, worksheet, frequency and
+        start of the period range."""
+
+        source = metadata.get("source_file") or "workbook"
+        source = os.path.splitext(os.path.basename(source))[0]
+        parts = [source, metadata["worksheet"],
+                 metadata["frequency"] or "long"]
+        if metadata.get("period_start"):
+            parts.append(metadata["period_start"])
+        name = "_".join(parts)
+
+        return re.sub(r"[^\w\-]+", "_", name)
+
+
+class ParquetSink(BaseSink):
+    """Write each data frame of the scraped series to a Parquet file."""
+
+    EXTENSION = ".parquet"
+
+    def _write_table(self, table, path):
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+
+
+class ArrowIPCSink(BaseSink):
+    """Write each data frame of the scraped series to an Arrow IPC file."""
+
+    EXTENSION = ".arrow"
+
+    def _write_table(self, table, path):
+        import pyarrow.ipc as ipc
+        with self.pa.OSFile(path, "wb") as sink_file:
+            with ipc.new_file(sink_file, table.schema) as writer:
+                writer.write_table(table)
+
+
+def read_metadata(path):
+    """Return the xlseries metadata stored in a file written by a sink."""
+
+    pa = _import_pyarrow()
+
+    if path.endswith(ParquetSink.EXTENSION):
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(path)
+    else:
+        import pyarrow.ipc as ipc
+        with pa.memory_map(path) as source:
+            schema = ipc.open_file(source).schema
+
+    return json.loads(schema.metadata[METADATA_KEY].decode("utf-8"))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required to write Parquet or Arrow " +
+                          "files. Install it with 'pip install pyarrow'.")
+
+    return pyarrow
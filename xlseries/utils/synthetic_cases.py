@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+synthetic_cases
+
+Generate large workbooks with time series for scale testing, scaling the
+layouts of the integration cases: tables of series with a title, a header and
+a footnote, stacked one after the other in a worksheet.
+
+Tables may also have the time values one row (or column) away from the values
+(like the monthly series of case 2), time values split in a year and a
+quarter column (case 6) or a year followed by its quarters in the same time
+index (multifrequency, case 6).
+
+Every case comes with the parameters to scrape it and the data frames that
+XlSeries should return, so benchmarks and stress tests can check results at
+sizes of 10k to 1M rows.
+
+Example:
+    case = SyntheticCase(num_periods=100000, num_series=5, frequency="D",
+                         missings_density=0.01)
+    dfs = XlSeries(case.get_workbook()).get_data_frames(case.params)
+
+    # or write the workbook, parameters and expected data frames to disk
+    case.save("cases_dir", "daily_100k")
+
+    # also from the command line
+    python -m xlseries.utils.synthetic_cases cases_dir daily_100k \\
+        --num-periods 100000 --num-series 5 --frequency D
+"""
+
+import os
+import json
+import datetime
+import argparse
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from xlseries.utils.coordinates import format_coord, MAX_ROW, MAX_COLUMN
+
+# frequencies of the time indexes and their pandas equivalent
+PANDAS_FREQS = {"A": "AS", "Q": "QS", "M": "MS", "D": "D"}
+
+# multifrequency time indexes: a year followed by its quarters
+MULTIFREQUENCIES = ["AQQQQ"]
+ROMAN_QUARTERS = ["I", "II", "III", "IV"]
+
+# separators of dates written as strings, instead of date cells (typos)
+TYPO_SEPARATORS = ["-", "/", "."]
+
+# limits of the old excel format
+XLS_MAX_ROW = 65536
+XLS_MAX_COLUMN = 256
+
+
+class SyntheticCase(object):
+    """A worksheet with time series tables, its parameters and expected data.
+
+    Args:
+        num_periods (int): Number of periods (rows in vertical series) of the
+            time index of each table.
+        num_series (int): Number of series in each table.
+        alignment (str): "vertical" or "horizontal" series.
+        frequency (str or list): Frequency of the time index (A, Q, M or D)
+            or AQQQQ, a multifrequency time index with each year followed by
+            its quarters ("2004", "I", "II", "III", "IV", "2005"...). A list
+            mixes frequencies, each table taking the next one.
+        num_tables (int): Number of tables (sections with their own headers
+            and time index) in the worksheet. By default, one for each
+            frequency.
+        time_composed (bool): If True, time values are strings composed by
+            substrings like "2004    1º trim." followed by "    2º trim."
+            (only for quarterly series, and always for multifrequency ones).
+        time_multicolumn (bool): If True, composed time values are split in
+            a year and a quarter column (rows in horizontal series). Only
+            with a single table, XlSeries allows only one multicolumn time
+            index in a worksheet.
+        time_alignment (int): Position of the time values relative to the
+            values of each period. With -1 (or 1), dates are written one row
+            before (or after) the values, in a row of their own, so tables
+            have blank rows between periods (only for vertical series, with
+            missing values written as missing_value).
+        missings_density (float): Proportion of values that are missing.
+        missing_value (str): String written in missing values. If None, the
+            cells of missing values are left empty.
+        typos_density (float): Proportion of dates written as strings with
+            different separators ("31/01/2004") instead of date cells.
+        start (str): First period of the first table. Next tables start one
+            year after the previous one, so each has its own data frame.
+            Multifrequency tables start in the first quarter of the year.
+        seed (int): Seed of the random values, missings and typos.
+    """
+
+    def __init__(self, num_periods=120, num_series=3, alignment="vertical",
+                 frequency="M", num_tables=None, time_composed=False,
+                 time_multicolumn=False, time_alignment=0,
+                 missings_density=0.0, missing_value=None, typos_density=0.0,
+                 start="2000-01-01", seed=0):
+
+        frequencies = frequency if type(frequency) == list else [frequency]
+        num_tables = num_tables or len(frequencies)
+        self._check_options(alignment, frequencies, num_tables, time_composed,
+                            time_multicolumn, time_alignment,
+                            missings_density, missing_value, typos_density)
+
+        self.num_periods = num_periods
+        self.num_series = num_series
+        self.alignment = alignment
+        self.frequencies = frequencies
+        self.num_tables = num_tables
+        self.time_composed = time_composed
+        self.time_multicolumn = time_multicolumn
+        self.time_alignment = time_alignment
+        self.missings_density = missings_density
+        self.missing_value = missing_value
+        self.typos_density = typos_density
+        self.start = pd.Timestamp(start)
+        self.seed = seed
+
+        self.tables = [self._table_layout(i_table)
+                       for i_table in range(self.num_tables)]
+        self.params = self._get_params()
+
+    def __repr__(self):
+        return "<{} {} {} tables of {} series x {} periods>".format(
+            self.__class__.__name__, self.alignment, self.num_tables,
+            self.num_series, self.num_periods)
+
+    # PUBLIC
+    @property
+    def max_row(self):
+        return self.tables[-1]["last_row"]
+
+    @property
+    def max_column(self):
+        if self.alignment == "vertical":
+            return self._time_columns + self.num_series
+        else:
+            return self._num_lines
+
+    def iter_rows(self):
+        """Yield the values of each row of the worksheet, starting at row 1."""
+
+        for table in self.tables:
+            yield ["Synthetic series table {}".format(table["number"])]
+            yield []
+
+            # horizontal tables are the transposed vertical ones
+            if self.alignment == "vertical":
+                for line in self._table_lines(table):
+                    yield line
+            else:
+                for row in zip(*self._table_lines(table)):
+                    yield list(row)
+
+            yield ["Source: synthetic data, seed {}".format(self.seed)]
+            yield []
+            yield []
+
+    def get_workbook(self):
+        """Return an openpyxl.Workbook with the series in its active sheet."""
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Series"
+        for row in self.iter_rows():
+            ws.append(row)
+
+        return wb
+
+    def get_expected_data_frames(self):
+        """Return the data frames XlSeries should scrape from the worksheet,
+        in the order it returns them."""
+
+        dfs = []
+        for table in self.tables:
+            values, times = self._table_data(table)
+            freqs, index = self._table_periods(table)
+
+            # multifrequency tables have a data frame for each frequency
+            for freq in sorted(set(freqs), key=table["frequency"].index):
+                freq_index = pd.DatetimeIndex(index[freqs == freq],
+                                              freq=PANDAS_FREQS[freq])
+                dfs.append(pd.DataFrame(values[freqs == freq],
+                                        index=freq_index,
+                                        columns=table["names"]))
+
+        return dfs
+
+    def save(self, directory, name, xl_format="xlsx"):
+        """Write the workbook, its parameters and the expected data frames.
+
+        Args:
+            directory (str): Directory where files are written.
+            name (str): Name of the case, used as base name of the files.
+            xl_format (str): "xlsx" or "xls" (needs xlwt).
+
+        Returns:
+            dict: Paths of the "workbook", the "params" JSON file and a list
+                of CSV files with the "expected" data frames.
+        """
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        base_path = os.path.join(directory, name)
+        paths = {"workbook": base_path + "." + xl_format,
+                 "params": base_path + ".json",
+                 "expected": []}
+
+        if xl_format == "xlsx":
+            self._save_xlsx(paths["workbook"])
+        elif xl_format == "xls":
+            self._save_xls(paths["workbook"])
+        else:
+            raise ValueError("Format must be 'xlsx' or 'xls', not " +
+                             repr(xl_format))
+
+        with open(paths["params"], "w") as f:
+            json.dump(self.params, f, indent=4)
+
+        for i_df, df in enumerate(self.get_expected_data_frames()):
+            path = "{}_expected{}.csv".format(base_path, i_df + 1)
+            df.to_csv(path)
+            paths["expected"].append(path)
+
+        return paths
+
+    # PRIVATE
+    @staticmethod
+    def _check_options(alignment, frequencies, num_tables, time_composed,
+                       time_multicolumn, time_alignment, missings_density,
+                       missing_value, typos_density):
+
+        if alignment not in ("vertical", "horizontal"):
+            raise ValueError("Series alignment must be 'vertical' or " +
+                             "'horizontal', not " + repr(alignment))
+
+        for freq in frequencies:
+            if freq not in PANDAS_FREQS and freq not in MULTIFREQUENCIES:
+                raise ValueError("Frequency must be one of {}, not {}".format(
+                    sorted(PANDAS_FREQS) + MULTIFREQUENCIES, repr(freq)))
+
+        if time_composed and not set(frequencies) <= {"Q", "AQQQQ"}:
+            raise ValueError("Composed time strings are only generated for " +
+                             "quarterly and multifrequency series.")
+
+        if not time_composed and set(frequencies) & set(MULTIFREQUENCIES):
+            raise ValueError("Multifrequency time indexes are only " +
+                             "generated with composed time strings.")
+
+        if time_multicolumn and not time_composed:
+            raise ValueError("Only composed time strings are split in many " +
+                             "columns.")
+
+        if time_multicolumn and num_tables > 1:
+            raise ValueError("Multicolumn time indexes are only scraped in " +
+                             "worksheets with a single table.")
+
+        if time_alignment not in (-1, 0, 1):
+            raise ValueError("Time alignment must be -1, 0 or 1, not " +
+                             repr(time_alignment))
+
+        if time_alignment and (alignment != "vertical" or time_composed):
+            raise ValueError("Offset time values are only generated as " +
+                             "dates of vertical series.")
+
+        if time_alignment and missings_density and missing_value is None:
+            raise ValueError("Empty cells are blank rows with offset time " +
+                             "values, missings need a missing_value.")
+
+        if time_composed and typos_density:
+            raise ValueError("Typos are only generated in dates, not in " +
+                             "composed time strings.")
+
+        for density in (missings_density, typos_density):
+            if not 0 <= density < 1:
+                raise ValueError("Densities must be between 0 and 1, not " +
+                                 repr(density))
+
+    @property
+    def _time_columns(self):
+        return 2 if self.time_multicolumn else 1
+
+    @property
+    def _num_lines(self):
+        """Number of lines of a table, as rows of vertical series: the
+        header and the periods (two lines each, if time values are offset)."""
+        return 1 + self.num_periods * (2 if self.time_alignment else 1)
+
+    def _table_layout(self, i_table):
+        """Return the position, frequency and series names of a table."""
+
+        # title, blank line, table lines, footnote and two blank lines
+        if self.alignment == "vertical":
+            num_rows = self._num_lines + 5
+        else:
+            num_rows = self._time_columns + self.num_series + 5
+        first_row = i_table * num_rows + 1
+
+        return {
+            "number": i_table + 1,
+            "header_row": first_row + 2,
+            "last_row": first_row + num_rows - 1,
+            "frequency": self.frequencies[i_table % len(self.frequencies)],
+            "start": self.start + pd.DateOffset(years=i_table),
+            "names": ["Series {}.{}".format(i_table + 1, i_series + 1)
+                      for i_series in range(self.num_series)]
+        }
+
+    def _table_lines(self, table):
+        """Yield the lines of a table as rows of vertical series, with the
+        time values in the first columns."""
+
+        values, times = self._table_data(table)
+
+        if self.time_multicolumn:
+            yield ["Year", "Quarter"] + table["names"]
+        else:
+            yield ["Period"] + table["names"]
+
+        no_time = [None] * self._time_columns
+        no_values = [None] * self.num_series
+        for i_period in range(self.num_periods):
+            cells = self._cells(values[i_period])
+            if self.time_alignment == 0:
+                yield times[i_period] + cells
+            elif self.time_alignment == -1:
+                yield times[i_period] + no_values
+                yield no_time + cells
+            else:
+                yield no_time + cells
+                yield times[i_period] + no_values
+
+    def _table_periods(self, table):
+        """Return the frequency and the period of each time value of a
+        table."""
+
+        frequency = table["frequency"]
+        if len(frequency) == 1:
+            return (np.array([frequency] * self.num_periods),
+                    pd.date_range(table["start"], periods=self.num_periods,
+                                  freq=PANDAS_FREQS[frequency]))
+
+        # a year followed by its quarters
+        freqs, periods = [], []
+        for i_period in range(self.num_periods):
+            year, position = divmod(i_period, len(frequency))
+            freqs.append(frequency[position])
+            month = 1 if position == 0 else 3 * (position - 1) + 1
+            periods.append(pd.Timestamp(table["start"].year + year, month, 1))
+
+        return np.array(freqs), pd.DatetimeIndex(periods)
+
+    def _table_data(self, table):
+        """Return the values (NaN if missing) and the cells with the time
+        value of each period of a table.
+
+        They are generated again from the seed every time, instead of being
+        kept in memory."""
+
+        rng = np.random.RandomState(self.seed + table["number"])
+
+        values = np.round(rng.uniform(1, 1000, (self.num_periods,
+                                                self.num_series)), 2)
+        if self.missings_density:
+            values[rng.random_sample(values.shape) <
+                   self.missings_density] = np.nan
+
+        freqs, index = self._table_periods(table)
+        if self.time_composed:
+            times = [self._composed_time(table["frequency"], freq, period)
+                     for freq, period in zip(freqs, index)]
+        else:
+            times = [[period.to_pydatetime()] for period in index]
+
+        if self.typos_density:
+            typos = rng.random_sample(len(times)) < self.typos_density
+            separators = rng.randint(len(TYPO_SEPARATORS), size=len(times))
+            for i_time in np.flatnonzero(typos):
+                times[i_time] = [times[i_time][0].strftime(
+                    "%d{0}%m{0}%Y".format(
+                        TYPO_SEPARATORS[separators[i_time]]))]
+
+        return values, times
+
+    def _composed_time(self, table_frequency, freq, period):
+        """Return the cells of a composed time value.
+
+        Quarters are like "2004    1º trim.", with the year only in the first
+        quarter, and multifrequency years and quarters are like "2004" and
+        "I". Split in many columns, the year and the quarter take a cell
+        each."""
+
+        quarter = (period.month - 1) // 3
+        if freq == "A":
+            year, sub_period = period.year, None
+        elif table_frequency in MULTIFREQUENCIES:
+            year, sub_period = None, ROMAN_QUARTERS[quarter]
+        else:
+            year = period.year if quarter == 0 else None
+            sub_period = "{}º trim.".format(quarter + 1)
+
+        if self.time_multicolumn:
+            return [year, sub_period]
+        elif table_frequency in MULTIFREQUENCIES:
+            return [sub_period or str(year)]
+        elif year:
+            return ["{}    {}".format(year, sub_period)]
+        else:
+            return ["        " + sub_period]
+
+    def _cells(self, values):
+        """Return the values of the cells, writing the missing ones."""
+        return [self.missing_value if np.isnan(value) else float(value)
+                for value in values]
+
+    def _get_params(self):
+        params = {
+            "alignment": self.alignment,
+            "headers_coord": [],
+            "time_header_coord": [],
+            "data_starts": [],
+            "data_ends": [],
+            "frequency": [],
+            "time_alignment": self.time_alignment,
+            "time_multicolumn": self.time_multicolumn,
+            "time_composed": self.time_composed,
+            "continuity": True,
+            "blank_rows": bool(self.time_alignment),
+            "missings": bool(self.missings_density),
+            "missing_value": self.missing_value,
+            "series_names": None
+        }
+
+        # lines with values, counting the header as the first one
+        step = 2 if self.time_alignment else 1
+        first_line = 3 if self.time_alignment == -1 else 2
+        last_line = first_line + (self.num_periods - 1) * step
+
+        for table in self.tables:
+            header_row = table["header_row"]
+            if self.alignment == "vertical":
+                time_header_coord = [
+                    format_coord(header_row, i_col + 1)
+                    for i_col in range(self._time_columns)]
+                data_starts = header_row + first_line - 1
+                data_ends = header_row + last_line - 1
+            else:
+                time_header_coord = [
+                    format_coord(header_row + i_row, 1)
+                    for i_row in range(self._time_columns)]
+                data_starts = first_line
+                data_ends = last_line
+
+            for i_series in range(self.num_series):
+                if self.alignment == "vertical":
+                    header_coord = format_coord(
+                        header_row, self._time_columns + i_series + 1)
+                else:
+                    header_coord = format_coord(
+                        header_row + self._time_columns + i_series, 1)
+
+                params["headers_coord"].append(header_coord)
+                if self.time_multicolumn:
+                    params["time_header_coord"].append(time_header_coord)
+                else:
+                    params["time_header_coord"].append(time_header_coord[0])
+                params["data_starts"].append(data_starts)
+                params["data_ends"].append(data_ends)
+                params["frequency"].append(table["frequency"])
+
+        return params
+
+    def _check_size(self, max_row, max_column):
+        if self.max_row > max_row or self.max_column > max_column:
+            msg = "The case has {} rows and {} columns, but the format " + \
+                "allows {} and {}."
+            raise ValueError(msg.format(self.max_row, self.max_column,
+                                        max_row, max_column))
+
+    def _save_xlsx(self, path):
+        self._check_size(MAX_ROW, MAX_COLUMN)
+
+        # write only workbooks stream rows to disk, without keeping cells
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Series")
+        for row in self.iter_rows():
+            ws.append(row)
+        wb.save(path)
+
+    def _save_xls(self, path):
+        try:
+            import xlwt
+        except ImportError:
+            raise ImportError("xlwt is required to write xls files. " +
+                              "Install it with 'pip install xlwt'.")
+
+        self._check_size(XLS_MAX_ROW, XLS_MAX_COLUMN)
+
+        date_style = xlwt.easyxf(num_format_str="YYYY-MM-DD")
+        wb = xlwt.Workbook()
+        ws = wb.add_sheet("Series")
+        for i_row, row in enumerate(self.iter_rows()):
+            for i_col, value in enumerate(row):
+                if isinstance(value, datetime.datetime):
+                    ws.write(i_row, i_col, value, date_style)
+                elif value is not None:
+                    ws.write(i_row, i_col, value)
+        wb.save(path)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic workbook with time series, its " +
+        "parameters and expected data frames.")
+    parser.add_argument("directory")
+    parser.add_argument("name")
+    parser.add_argument("--num-periods", type=int, default=120)
+    parser.add_argument("--num-series", type=int, default=3)
+    parser.add_argument("--alignment", default="vertical")
+    parser.add_argument("--frequency", default="M",
+                        help="A frequency or many separated by commas.")
+    parser.add_argument("--num-tables", type=int, default=None)
+    parser.add_argument("--time-composed", action="store_true")
+    parser.add_argument("--time-multicolumn", action="store_true")
+    parser.add_argument("--time-alignment", type=int, default=0)
+    parser.add_argument("--missings-density", type=float, default=0.0)
+    parser.add_argument("--missing-value", default=None)
+    parser.add_argument("--typos-density", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", default="xlsx")
+    args = parser.parse_args(args)
+
+    case = SyntheticCase(
+        num_periods=args.num_periods, num_series=args.num_series,
+        alignment=args.alignment, frequency=args.frequency.split(","),
+        num_tables=args.num_tables, time_composed=args.time_composed,
+        time_multicolumn=args.time_multicolumn,
+        time_alignment=args.time_alignment,
+        missings_density=args.missings_density,
+        missing_value=args.missing_value, typos_density=args.typos_density,
+        seed=args.seed)
+
+    for kind, path in sorted(case.save(args.directory, args.name,
+                                       args.format).items()):
+        print(kind, path)
+
+
+if __name__ == '__main__':
+    main()
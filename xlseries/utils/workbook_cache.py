@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+workbook_cache
+
+Least recently used cache of loaded workbooks, so a process scraping the same
+file many times (once per worksheet or parameters, or a worker of the
+scraping server) parses it only once.
+
+Workbooks are cached by absolute path, size and modification time of the file
+(a file changed since it was loaded is loaded again) and by the loader and
+its arguments. The cache is bounded by number of workbooks and by the memory
+they take, estimated from their number of cells.
+
+The process has a cache shared by XlSeries and the case and data frame
+loaders, disabled until it is configured:
+
+Example:
+    from xlseries.utils import workbook_cache
+    workbook_cache.configure(max_entries=16, max_bytes=2 * 1024 ** 3)
+
+    # the file is only parsed the first time
+    for ws_name, params in jobs:
+        dfs = XlSeries("bulletin.xlsx").get_data_frames(params, ws_name)
+
+    print(workbook_cache.get_cache().stats())
+"""
+
+import os
+import threading
+import collections
+
+DEFAULT_MAX_ENTRIES = 8
+
+# memory taken by a loaded cell (value, style and coordinates), measured with
+# openpyxl 2.5 as 390 bytes
+CELL_BYTES = 400
+WORKSHEET_BYTES = 64 * 1024
+
+
+class WorkbookCache(object):
+    """LRU cache of loaded workbooks.
+
+    Cached workbooks are shared by every caller, so they must not be changed:
+    get a copy instead if the workbook is going to be changed.
+
+    Args:
+        max_entries (int): Workbooks kept at most (0 disables the cache).
+        max_bytes (int): Approximate memory taken by the workbooks kept at
+            most, without limit if None. Workbooks bigger than this are not
+            cached.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+        # {key: (workbook, size in bytes)}
+        self._workbooks = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "WorkbookCache({}/{} workbooks, {} hits, {} misses)".format(
+            len(self), self.max_entries, self.hits, self.misses)
+
+    def __len__(self):
+        return len(self._workbooks)
+
+    @property
+    def enabled(self):
+        return bool(self.max_entries)
+
+    # PUBLIC
+    def get(self, path, loader=None, copy=False, **loader_args):
+        """Return the workbook of a file, loading it if it is not cached.
+
+        Args:
+            path (str): Path to the excel file.
+            loader (function): Called with the path and loader_args to load
+                the workbook, openpyxl.load_workbook by default.
+            copy (bool): If True, return a copy of the cached workbook that
+                can be changed.
+            loader_args: Key word arguments of the loader (eg. data_only).
+        """
+
+        if loader is None:
+            from openpyxl import load_workbook as loader
+
+        if not self.enabled:
+            return loader(path, **loader_args)
+
+        key = self.key(path, loader, loader_args)
+        with self._lock:
+            if key in self._workbooks:
+                self.hits += 1
+                self._workbooks.move_to_end(key)
+                wb = self._workbooks[key][0]
+                return _copy_workbook(wb) if copy else wb
+            self.misses += 1
+
+        # loading takes long, other files can be got meanwhile
+        wb = loader(path, **loader_args)
+        self._add(key, wb, approximate_size(wb, path))
+
+        return _copy_workbook(wb) if copy else wb
+
+    @staticmethod
+    def key(path, loader=None, loader_args=None):
+        """Return the key of the workbook of a file in the cache."""
+
+        abs_path = os.path.abspath(path)
+        stat = os.stat(abs_path)
+        loader_name = ("{}.{}".format(loader.__module__, loader.__qualname__)
+                       if loader else None)
+
+        return (abs_path, stat.st_size, stat.st_mtime_ns, loader_name,
+                tuple(sorted((loader_args or {}).items())))
+
+    def discard(self, path):
+        """Remove the workbooks of a file, loaded with any loader."""
+
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._workbooks if key[0] == abs_path]:
+                self.bytes -= self._workbooks.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._workbooks.clear()
+            self.bytes = 0
+
+    def resize(self, max_entries=None, max_bytes=None):
+        """Change the limits of the cache, evicting workbooks over them."""
+
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self):
+        """Return the "hits", "misses", "evictions", the "entries" and
+        approximate "bytes" kept and the limits of the cache."""
+
+        with self._lock:
+            return {"entries": len(self), "max_entries": self.max_entries,
+                    "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    # PRIVATE
+    def _add(self, key, wb, size):
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._workbooks:
+                self.bytes -= self._workbooks[key][1]
+            self._workbooks[key] = (wb, size)
+            self._workbooks.move_to_end(key)
+            self.bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._workbooks and (
+                len(self._workbooks) > (self.max_entries or 0) or
+                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self.bytes -= self._workbooks.popitem(last=False)[1][1]
+            self.evictions += 1
+
+
+def approximate_size(wb, path=None):
+    """Return the approximate memory taken by a loaded workbook, in bytes.
+
+    Read only workbooks keep only the file open, so their size is the size of
+    the file.
+    """
+
+    if getattr(wb, "read_only", False):
+        return os.path.getsize(path) if path else 0
+
+    return sum(WORKSHEET_BYTES + len(getattr(ws, "_cells", ())) * CELL_BYTES
+               for ws in wb.worksheets)
+
+
+def _copy_workbook(wb):
+    from xlseries.utils.xl_methods import make_wb_copy
+    return make_wb_copy(wb)
+
+
+# cache of the process, disabled until configured
+_cache = WorkbookCache(max_entries=0)
+
+
+def get_cache():
+    """Return the workbook cache shared by the process."""
+    return _cache
+
+
+def configure(max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None):
+    """Enable the workbook cache of the process (or disable it, with
+    max_entries=0) and set its limits."""
+    _cache.resize(max_entries, max_bytes)
+
+
+def load_workbook(path, loader=None, copy=False, **loader_args):
+    """Return the workbook of a file from the cache of the process, loading
+    it if it is not cached (or the cache is disabled).
+
+    Args: Like WorkbookCache.get.
+    """
+    return _cache.get(path, loader, copy, **loader_args)
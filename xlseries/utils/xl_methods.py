@@ -6,13 +6,15 @@ xl_methods
 Useful methods for excel operations and related manipulations.
 """
 
-from openpyxl import Workbook
-from openpyxl.utils import column_index_from_string
-import xlrd
 import datetime
-import pytz
-import pandas
 from .comparing import approx_equal
+from .coordinates import parse_coord, coords_range
+from .lazy_import import lazy_import
+
+openpyxl = lazy_import("openpyxl")
+pandas = lazy_import("pandas")
+# only needed to open xls files
+xlrd = lazy_import("xlrd")
 
 
 def common_row_or_column(coords_list):
@@ -26,17 +28,13 @@ def common_row_or_column(coords_list):
         """
     assert len(coords_list) >= 2, "There are less than 2 coords in the list."
 
-    wb = Workbook()
-    ws = wb.active
-
-    row = ws[coords_list[0]].row
-    col = ws[coords_list[0]].column
+    row, col = parse_coord(coords_list[0])
 
-    if all([ws[coord].row == row for coord in coords_list]):
+    if all([parse_coord(coord)[0] == row for coord in coords_list]):
         return row
 
-    elif all([ws[coord].column == col for coord in coords_list]):
-        return column_index_from_string(col)
+    elif all([parse_coord(coord)[1] == col for coord in coords_list]):
+        return col
 
     else:
         raise Exception(
@@ -58,21 +56,18 @@ def coord_in_scope(coord, coords):
     """
     assert len(coords) >= 2, "There are less than 2 coords in the list."
 
-    wb = Workbook()
-    ws = wb.active
-
-    row = ws[coords[0]].row
-    col = ws[coords[0]].column
+    row, col = parse_coord(coords[0])
+    coord_row, coord_col = parse_coord(coord)
 
-    if all([ws[scope_coord].row == row for scope_coord in coords]):
-        return (ws[coord].row >= row and any([
-            ws[scope_coord].column == ws[coord].column
-            for scope_coord in coords
+    if all([parse_coord(scope_coord)[0] == row for scope_coord in coords]):
+        return (coord_row >= row and any([
+            parse_coord(scope_coord)[1] == coord_col for scope_coord in coords
         ]))
 
-    elif all([ws[scope_coord].column == col for scope_coord in coords]):
-        return (ws[coord].column >= col and any(
-            [ws[scope_coord].row == ws[coord].row for scope_coord in coords]))
+    elif all([parse_coord(scope_coord)[1] == col for scope_coord in coords]):
+        return (coord_col >= col and any(
+            [parse_coord(scope_coord)[0] == coord_row
+             for scope_coord in coords]))
 
     else:
         raise Exception("There is no common row or column in " + repr(coords))
@@ -94,46 +89,43 @@ def consecutive_cells(cell_list):
         >>> consecutive_cells(["A1", "B1", "B2"])
         False
     """
-    wb = Workbook()
-    ws = wb.active
-
     row = None
     col = None
     alignment = None
 
     for cell in cell_list:
+        cell_row, cell_col = parse_coord(cell)
 
         if not row and not col:
-            row = ws[cell].row
-            col = column_index_from_string(ws[cell].column)
+            row, col = cell_row, cell_col
 
         elif not alignment:
-            if ws[cell].row == row:
+            if cell_row == row:
                 alignment = "vertical"
-                if col + 1 == column_index_from_string(ws[cell].column):
+                if col + 1 == cell_col:
                     col += 1
                 else:
                     return False
 
-            elif column_index_from_string(ws[cell].column) == col:
+            elif cell_col == col:
                 alignment = "horizontal"
-                if row + 1 == ws[cell].row:
+                if row + 1 == cell_row:
                     row += 1
                 else:
                     return False
 
         else:
             if alignment == "vertical":
-                if not ws[cell].row == row:
+                if not cell_row == row:
                     return False
-                if not col + 1 == column_index_from_string(ws[cell].column):
+                if not col + 1 == cell_col:
                     return False
                 col += 1
 
             else:
-                if not column_index_from_string(ws[cell].column) == col:
+                if not cell_col == col:
                     return False
-                if not row + 1 == ws[cell].row:
+                if not row + 1 == cell_row:
                     return False
                 row += 1
 
@@ -143,6 +135,8 @@ def consecutive_cells(cell_list):
 def open_xls_as_xlsx(filename, data_only=True):
     """Open a xls file and return a openpyxl.Workbook.
 
+    Date cells are converted to datetime (xls files store them as numbers).
+
     Args:
         filename: Path to an .xls file.
 
@@ -154,7 +148,7 @@ def open_xls_as_xlsx(filename, data_only=True):
     wb_old = xlrd.open_workbook(filename)
     # TODO: data_only attribute must be changed because is deprecated
     # wb = Workbook(data_only=data_only)
-    wb = Workbook()
+    wb = openpyxl.Workbook()
 
     ws = wb.active
     wb.remove(ws)
@@ -171,9 +165,14 @@ def open_xls_as_xlsx(filename, data_only=True):
 
         for row in range(0, nrows):
             for col in range(0, ncols):
-                ws.cell(
-                    row=row + 1, column=col + 1).value = ws_old.cell_value(
-                        row, col)
+                value = ws_old.cell_value(row, col)
+
+                # dates are stored as numbers in xls files
+                if ws_old.cell_type(row, col) == xlrd.XL_CELL_DATE:
+                    value = xlrd.xldate.xldate_as_datetime(value,
+                                                           wb_old.datemode)
+
+                ws.cell(row=row + 1, column=col + 1).value = value
 
     return wb
 
@@ -190,7 +189,7 @@ def make_wb_copy(wb):
     Returns:
         Workbook: A copy made from wb.
     """
-    wb_copy = Workbook()
+    wb_copy = openpyxl.Workbook()
     wb_copy.remove(wb_copy["Sheet"])
 
     for ws in wb:
@@ -215,7 +214,7 @@ def make_ws_copy(ws):
     Returns:
         worksheet: A copy made from ws.
     """
-    wb_copy = Workbook()
+    wb_copy = openpyxl.Workbook()
     wb_copy.remove(wb_copy["Sheet"])
 
     ws_copy = wb_copy.create_sheet(title=ws.title)
@@ -246,12 +245,9 @@ def xl_coordinates_range(start, end=None):
     B2
     """
 
-    ws = Workbook().active
-
     if end:
-        for row in ws[start + ":" + end]:
-            for cell in row:
-                yield cell.coordinate
+        for coord in coords_range(start, end):
+            yield coord
     else:
         yield start
 
@@ -8,19 +8,25 @@ DataFrames. This is the only module that the user should use in the normal use
 case.
 """
 
-from openpyxl import load_workbook, Workbook
-import imp
 import os
 import platform
-from unidecode import unidecode
-
-from .strategies import strategies
-from .utils.xl_methods import make_wb_copy
-from .strategies.discover.parameters import Parameters
-from .utils.xl_methods import open_xls_as_xlsx
-from .utils.path_finders import get_package_dir
-
 import warnings
+import contextlib
+import tracemalloc
+
+from .utils import instrumentation
+from .utils import workbook_cache
+from .utils.lazy_import import lazy_import
+
+# imported on first use, to keep "import xlseries" fast
+openpyxl = lazy_import("openpyxl")
+unidecode = lazy_import("unidecode")
+strategies = lazy_import("xlseries.strategies.strategies")
+parameters = lazy_import("xlseries.strategies.discover.parameters")
+plan_caches = lazy_import("xlseries.strategies.discover.plan_cache")
+grid = lazy_import("xlseries.utils.grid")
+xl_methods = lazy_import("xlseries.utils.xl_methods")
+
 warnings.filterwarnings("ignore")
 
 
@@ -30,43 +36,103 @@ class XlSeries(object):
     Attributes:
         wb: Workbook object. The user can either pass the path where the excel
             file is located or the Workbook object with the xl already loaded.
+            If the workbook cache of the process is enabled, workbooks loaded
+            from a path are shared and must not be changed (they are always
+            copied before scraping them).
+        last_run_stats (RunStats): Wall time, cpu time and number of calls of
+            each stage of the last run (loading the file is a run itself), if
+            runs are recorded.
+        last_run_trace (RunTrace): Attempts tried in the last run, why they
+            failed and the strategies chosen for each time index and series,
+            if runs are recorded. It can be exported with to_json() or
+            write_jsonl().
+        last_ws_name (str): Name of the worksheet scraped in the last run.
     """
 
-    def __init__(self, xl_path_or_wb):
+    def __init__(self, xl_path_or_wb, stats_callback=None,
+                 profile_memory=False, grid_cache=None, record_runs=False):
         """Args:
-            xl_path_or_wb (str or Workbook): Path to an excel file or a
-                Workbook object.
+            xl_path_or_wb (str or Workbook): Path to an excel (or CSV or TSV)
+                file or a Workbook object.
+            stats_callback (function): Called at the end of every stage of a
+                run with (stage_name, wall_time, cpu_time), in seconds.
+            profile_memory (bool): If True, the memory allocated by each
+                stage of a run is traced with tracemalloc and reported in
+                last_run_stats (peak, retained and rss bytes and the top
+                allocation sites). Runs are much slower in this mode.
+            grid_cache (str or GridCache): Directory (or GridCache object)
+                where the cell values of the files loaded are stored in a
+                compact binary format. Later loads of an unchanged file build
+                the workbook from them instead of parsing the file.
+            record_runs (bool): If True, the stages of each run are timed in
+                last_run_stats and its events kept in last_run_trace. Runs
+                are always recorded with a stats_callback or profile_memory,
+                otherwise stages are not timed at all.
         """
         self.xl_path_or_wb = xl_path_or_wb
-        if type(xl_path_or_wb) == Workbook:
+        self.stats_callback = stats_callback
+        self.profile_memory = profile_memory
+        self.record_runs = record_runs or bool(stats_callback) or \
+            profile_memory
+        self.last_run_stats = None
+        self.last_run_trace = None
+        self.last_ws_name = None
+
+        if type(xl_path_or_wb) == openpyxl.Workbook:
             self.wb = xl_path_or_wb
+            self._shared_wb = False
         else:
-            self.wb = self._load_wb(xl_path_or_wb)
+            if grid_cache and not isinstance(grid_cache, grid.GridCache):
+                grid_cache = grid.GridCache(grid_cache)
+
+            with self._recording_run():
+                with instrumentation.stage("load"):
+                    self.wb = self._load_wb(xl_path_or_wb, grid_cache)
+            self._shared_wb = workbook_cache.get_cache().enabled
         self.params = {}
 
     @staticmethod
-    def _load_wb(xl_path):
-        """Load an xls or xlsx excel file.
+    def _load_wb(xl_path, grid_cache=None):
+        """Load an xls or xlsx excel file (or a csv or tsv file, in a
+        workbook with a single worksheet), from the workbook cache of the
+        process if it is enabled.
 
         Args:
-            xl_path (str): Path to an xls or xlsx file.
+            xl_path (str): Path to an xls, xlsx, csv or tsv file.
+            grid_cache (GridCache): Where the cell values of the file are
+                looked for before parsing it, if passed.
 
         Returns:
             Workbook: Loaded xl file in an openpyxl.Workbook object.
         """
         if xl_path[-5:] == ".xlsx":
-            return load_workbook(xl_path, data_only=True)
+            loader = openpyxl.load_workbook
         elif xl_path[-4:] == ".xls":
-            return open_xls_as_xlsx(xl_path, data_only=True)
+            loader = xl_methods.open_xls_as_xlsx
+        elif xl_path[-4:] in (".csv", ".tsv"):
+            loader = grid.load_csv_workbook
         else:
-            raise ValueError(xl_path + " is not an .xls or .xlsx file.")
+            raise ValueError(xl_path +
+                             " is not an .xls, .xlsx, .csv or .tsv file.")
+
+        if grid_cache:
+            return workbook_cache.load_workbook(
+                xl_path, grid_cache.load_workbook, parser=loader,
+                data_only=True)
+
+        return workbook_cache.load_workbook(xl_path, loader, data_only=True)
 
     # PUBLIC
     def get_data_frames(self,
                         params_path_or_obj,
                         ws_name=None,
                         safe_mode=False,
-                        preserve_wb_obj=True):
+                        preserve_wb_obj=True,
+                        plan_cache=None,
+                        sink=None,
+                        output="wide",
+                        select=None,
+                        lazy=False):
         """Scrape time series from an excel file into a pandas.DataFrame.
 
         Args:
@@ -87,10 +153,51 @@ class XlSeries(object):
                 preserve the original object without changes. Only use False if
                 changes to the workbook object are not a problem.
 
+            plan_cache (str or PlanCache): Directory (or PlanCache object)
+                where parse plans are stored. If the layout of the worksheet
+                matches a plan stored in a previous run, discovery and
+                strategy selection are skipped. If the plan doesn't work any
+                more, it is discarded and the file is scraped from scratch.
+                Plans are not used with preserve_wb_obj=False, as there is
+                no untouched copy to scrape from scratch.
+
+            sink (ParquetSink or ArrowIPCSink): If passed, every DataFrame is
+                written to its own file in the sink as soon as it is built
+                (and released once written), with the source file, worksheet
+                and parameters in the file schema metadata. If parameters are
+                left to be discovered, the data frames are written once an
+                attempt succeeds. Can't be used with safe_mode.
+
+            output (str): "wide" (default) returns a DataFrame for each
+                frequency with a column for each series. "long" returns only
+                one DataFrame with a record for each observed value, with
+                series_name, frequency, period and value columns. The source
+                file and worksheet are kept in its attrs.
+
+            select (str, regex, function or list): Scrape only some series.
+                str: Name of a series or coordinate of its header.
+                regex: Compiled regular expression searched in the names.
+                function: Called with (name, header_coord), returns True for
+                the series wanted.
+                list: Series matching any of the selectors are scraped.
+                Other series are discarded before cleaning or extracting any
+                value, so only the time indexes of the series selected are
+                cleaned.
+
+            lazy (bool): If True, parameters are discovered and time indexes
+                are cleaned straight away, but the values of a series are only
+                extracted when its column is accessed. LazyDataFrame objects
+                are returned instead of DataFrames, call materialize() on them
+                to get a DataFrame with all the columns. Only wide output
+                without safe_mode nor sink is supported. If parameters are
+                left to be discovered, the values decide which attempt
+                works, so they are extracted while choosing it (and kept).
+
         Returns:
             list: A list of pandas.DataFrame objects with time series scraped
                 from the excel file. Every DataFrame in the list corresponds to
-                a different frequency.
+                a different frequency. If a sink that doesn't keep the frames
+                is passed, the paths of the files written are returned instead.
 
         Example:
             params = {"headers_coord": ["B1","C1"],
@@ -100,12 +207,241 @@ class XlSeries(object):
             dfs = XlSeries(wb).get_data_frames(params)
 
         """
+        if output not in ("wide", "long"):
+            raise ValueError("output must be 'wide' or 'long', not " +
+                             repr(output))
+
+        if lazy:
+            if output != "wide" or safe_mode or sink:
+                raise ValueError("Lazy data frames can only be returned " +
+                                 "with wide output, without safe_mode " +
+                                 "nor sink.")
+            output = "lazy"
+
+        if sink and safe_mode:
+            raise ValueError("A sink writes a single result, but safe_mode " +
+                             "may return many. Use safe_mode=False.")
+
+        with self._recording_run():
+            return self._get_data_frames(params_path_or_obj, ws_name,
+                                         safe_mode, preserve_wb_obj,
+                                         plan_cache, sink, output, select)
+
+    def update_data_frames(self,
+                           previous_dfs,
+                           previous_params,
+                           ws_name=None,
+                           overlap=3,
+                           merge=True,
+                           preserve_wb_obj=True):
+        """Scrape only the observations appended since a previous scraping.
+
+        Useful with files that grow adding new periods at the end of the time
+        index, like monthly bulletins. Only the new rows (or columns) and a
+        small overlapping tail are cleaned and scraped. The tail is checked
+        against the previous data frames before appending the new periods.
+
+        Args:
+            previous_dfs (DataFrame or list): Result of the previous scraping.
+            previous_params (Parameters): Parameters resolved by the previous
+                scraping, as stored in XlSeries.params[ws_name].
+            ws_name (str): Name of the worksheet that will be scraped.
+            overlap (int): Number of previous observations of each time index
+                scraped again to check they still match (at least 2).
+            merge (bool): If True, return the previous data frames with the
+                new periods appended. If False, return only the new periods.
+            preserve_wb_obj (bool): If True makes a safe copy of a workbook to
+                preserve the original object without changes.
+
+        Returns:
+            list: Data frames like the ones returned by get_data_frames. The
+                parameters with the new data ends are stored in
+                XlSeries.params[ws_name] for the next update.
+
+        Raises:
+            IncrementalUpdateError: If the previous result doesn't match the
+                worksheet. A complete scraping should be done instead.
+
+        Example:
+            xl = XlSeries("bulletin_january.xlsx")
+            dfs = xl.get_data_frames(params)
+            new_xl = XlSeries("bulletin_february.xlsx")
+            dfs = new_xl.update_data_frames(dfs, xl.params[ws_name], ws_name)
+        """
+        with self._recording_run():
+            return self._update_data_frames(previous_dfs, previous_params,
+                                            ws_name, overlap, merge,
+                                            preserve_wb_obj)
+
+    # PRIVATE
+    def _get_data_frames(self, params_path_or_obj, ws_name, safe_mode,
+                         preserve_wb_obj, plan_cache, sink, output, select):
         # wb will be changed, so it has to be a copy to preserve the original
+        preserve_wb_obj = preserve_wb_obj or self._shared_wb
         if preserve_wb_obj:
-            wb_copy = make_wb_copy(self.wb)
+            with instrumentation.stage("workbook_copy"):
+                wb_copy = xl_methods.make_wb_copy(self.wb)
         else:
             wb_copy = self.wb
-        ws_names = wb_copy.sheetnames
+        ws_name = self._get_ws_name(ws_name, wb_copy.sheetnames)
+        self.last_ws_name = ws_name
+        if self.last_run_trace is not None:
+            self.last_run_trace.context["worksheet"] = ws_name
+
+        # a plan that fails leaves the worksheet partly cleaned, it can only
+        # be scraped again from scratch with an untouched copy of it
+        if not preserve_wb_obj:
+            plan_cache = None
+        elif plan_cache and not isinstance(plan_cache,
+                                           plan_caches.PlanCache):
+            plan_cache = plan_caches.PlanCache(plan_cache)
+
+        for scraper in strategies.get_strategies():
+            if scraper.accepts(wb_copy):
+                scraper_obj = scraper(wb_copy, params_path_or_obj, ws_name)
+                try:
+                    dfs, params = scraper_obj.get_data_frames(
+                        safe_mode, plan_cache, output, select,
+                        self._sink_writer(sink, ws_name, output))
+
+                # the plan was discarded, scrape again from a fresh copy
+                except strategies.PlanNotApplicable:
+                    with instrumentation.stage("workbook_copy"):
+                        wb_copy = xl_methods.make_wb_copy(self.wb)
+                    scraper_obj = scraper(wb_copy, params_path_or_obj,
+                                          ws_name)
+                    dfs, params = scraper_obj.get_data_frames(
+                        safe_mode, plan_cache, output, select,
+                        self._sink_writer(sink, ws_name, output))
+
+                self.params[ws_name] = params
+
+                if output == "long" and not safe_mode and not sink:
+                    dfs[0].attrs.update(self._source_metadata(ws_name))
+
+                if type(dfs) == list and len(dfs) == 1:
+                    return dfs[0]
+                else:
+                    return dfs
+
+    def _update_data_frames(self, previous_dfs, previous_params, ws_name,
+                            overlap, merge, preserve_wb_obj):
+        if preserve_wb_obj or self._shared_wb:
+            with instrumentation.stage("workbook_copy"):
+                wb_copy = xl_methods.make_wb_copy(self.wb)
+        else:
+            wb_copy = self.wb
+
+        ws_name = self._get_ws_name(ws_name, wb_copy.sheetnames)
+        self.last_ws_name = ws_name
+        if self.last_run_trace is not None:
+            self.last_run_trace.context["worksheet"] = ws_name
+
+        for scraper in strategies.get_strategies():
+            if scraper.accepts(wb_copy):
+                scraper_obj = scraper(wb_copy, previous_params, ws_name)
+                dfs, params = scraper_obj.update_data_frames(
+                    previous_dfs, overlap, merge)
+                self.params[ws_name] = params
+
+                if type(dfs) == list and len(dfs) == 1:
+                    return dfs[0]
+                else:
+                    return dfs
+
+    @contextlib.contextmanager
+    def _recording_run(self):
+        """Record the stages of a run in last_run_stats and its events in
+        last_run_trace, if runs are recorded."""
+
+        if not self.record_runs:
+            self.last_run_stats = None
+            self.last_run_trace = None
+            yield None
+            return
+
+        run_stats = instrumentation.RunStats(self.stats_callback,
+                                             memory=self.profile_memory)
+        run_trace = instrumentation.RunTrace(
+            source_file=self._source_metadata(None)["source_file"])
+        self.last_run_stats = run_stats
+        self.last_run_trace = run_trace
+
+        # trace allocations only during the run, if nobody else is tracing
+        start_tracing = self.profile_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+
+        with instrumentation.recording(run_stats, run_trace):
+            try:
+                with instrumentation.stage("run"):
+                    yield run_stats
+
+            except instrumentation.RunCancelled as inst:
+                instrumentation.trace(
+                    "run", status="cancelled", stage=inst.stage_name,
+                    wall_time=(run_stats["run"]["wall_time"]
+                               if "run" in run_stats else 0.0))
+                raise
+
+            except Exception as inst:
+                instrumentation.trace(
+                    "run", status="failed",
+                    reason=instrumentation.reason_code(inst),
+                    error=str(inst).strip()[:500],
+                    wall_time=run_stats["run"]["wall_time"])
+                raise
+
+            finally:
+                if start_tracing:
+                    tracemalloc.stop()
+
+            instrumentation.trace("run", status="ok",
+                                  wall_time=run_stats["run"]["wall_time"])
+
+    def _sink_writer(self, sink, ws_name, output):
+        """Return a function that writes a data frame to a sink as soon as
+        it is built, or None if there is no sink.
+
+        The function is called by the strategies with (df, params) and
+        returns the data frame, if the sink keeps them, or the path of the
+        file written, so the frame is released once written. Each writer
+        starts a new run of the sink.
+        """
+
+        if not sink:
+            return None
+
+        source_metadata = self._source_metadata(ws_name)
+        sink.start_run()
+
+        def write_frame(df, params):
+            if output == "long":
+                df.attrs.update(source_metadata)
+
+            metadata = dict(source_metadata, params=params.__dict__)
+            with instrumentation.stage("sink"):
+                path = sink.write(df, metadata)
+
+            return df if sink.keep_frames else path
+
+        return write_frame
+
+    def _source_metadata(self, ws_name):
+        """Return the source file (if any) and worksheet of the series."""
+
+        if isinstance(self.xl_path_or_wb, str):
+            source_file = os.path.abspath(self.xl_path_or_wb)
+        else:
+            source_file = None
+
+        return {"source_file": source_file, "worksheet": ws_name}
+
+    @classmethod
+    def _get_ws_name(cls, ws_name, ws_names):
+        """Return the name of the worksheet to scrape.
+
+        If no name is passed, the first worksheet will be scraped."""
 
         if not ws_name:
             ws_name = ws_names[0]
@@ -120,18 +456,9 @@ class XlSeries(object):
                 print("Remember you can choose a different one passing a " + \
                     "ws_name keyword argument.")
         else:
-            ws_name = self._sanitize_ws_name(ws_name, ws_names)
-
-        for scraper in strategies.get_strategies():
-            if scraper.accepts(wb_copy):
-                scraper_obj = scraper(wb_copy, params_path_or_obj, ws_name)
-                dfs, params = scraper_obj.get_data_frames(safe_mode)
-                self.params[ws_name] = params
+            ws_name = cls._sanitize_ws_name(ws_name, ws_names)
 
-                if type(dfs) == list and len(dfs) == 1:
-                    return dfs[0]
-                else:
-                    return dfs
+        return ws_name
 
     @staticmethod
     def _sanitize_ws_name(ws_name_orig, ws_names):
@@ -150,8 +477,8 @@ class XlSeries(object):
                     return ws_name
 
             for ws_name in ws_names:
-                if unidecode(ws_name_orig).strip() == unidecode(
-                        ws_name).strip():
+                if unidecode.unidecode(ws_name_orig).strip() == \
+                        unidecode.unidecode(ws_name).strip():
                     return ws_name
 
         return ws_name_orig
@@ -163,7 +490,7 @@ class XlSeries(object):
         Returns:
             dict: A dictionary to fill with values.
         """
-        return Parameters.get_critical_params_template()
+        return parameters.Parameters.get_critical_params_template()
 
     @staticmethod
     def complete_params_template():
@@ -172,13 +499,13 @@ class XlSeries(object):
         Returns:
             dict: A dictionary to fill with values.
         """
-        return Parameters.get_complete_params_template()
+        return parameters.Parameters.get_complete_params_template()
 
     def open(self):
         """Open excel file with system's default program."""
 
         # save workbook if no path to excel file was given
-        if type(self.xl_path_or_wb) == Workbook:
+        if type(self.xl_path_or_wb) == openpyxl.Workbook:
             filename = "temp_xl_file.xlsx"
             self.xl_path_or_wb.save(filename)
             path = filename